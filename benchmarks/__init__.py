@@ -0,0 +1 @@
+"""Micro-benchmarks for the pipeline's Python hot paths."""
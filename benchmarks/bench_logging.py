@@ -0,0 +1,78 @@
+"""Per-event logging cost in the producer hot path.
+
+Run with: uv run python -m benchmarks.bench_logging [--events N]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from collections.abc import Callable
+
+from src.common.logging import RateLimitedLogger, level_enabled, setup_logging
+
+
+def per_event_ns(log_event: Callable[[int], None], events: int) -> float:
+    """Time `log_event` over `events` calls and return nanoseconds per call."""
+    start = time.perf_counter_ns()
+    for i in range(events):
+        log_event(i)
+    return (time.perf_counter_ns() - start) / events
+
+
+def run(events: int) -> dict[str, float]:
+    """Run every scenario with stdout redirected to /dev/null.
+
+    Returns:
+        Mapping of scenario name to nanoseconds per event
+    """
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        logger = setup_logging("bench", "INFO")
+        results["debug call, level INFO (unguarded)"] = per_event_ns(
+            lambda i: logger.debug("Event published", user_id=i, partition=0, offset=i), events
+        )
+
+        enabled = level_enabled("INFO", "DEBUG")
+
+        def guarded(i: int) -> None:
+            if enabled:
+                logger.debug("Event published", user_id=i, partition=0, offset=i)
+
+        results["debug call, level INFO (guarded)"] = per_event_ns(guarded, events)
+
+        for name, enqueue, serialize in [
+            ("level DEBUG, sync", False, False),
+            ("level DEBUG, sync JSON", False, True),
+            ("level DEBUG, enqueued", True, False),
+            ("level DEBUG, enqueued JSON", True, True),
+        ]:
+            logger = setup_logging("bench", "DEBUG", enqueue=enqueue, serialize=serialize)
+            results[name] = per_event_ns(
+                lambda i, lg=logger: lg.debug("Event published", user_id=i, partition=0, offset=i),
+                events,
+            )
+
+        sampled = RateLimitedLogger(setup_logging("bench", "DEBUG"), max_per_interval=10)
+        results["level DEBUG, sampled 10/s"] = per_event_ns(
+            lambda i: sampled.log("DEBUG", "Event published", user_id=i, partition=0, offset=i),
+            events,
+        )
+
+    setup_logging("bench", "INFO")
+    return results
+
+
+def main() -> None:
+    """Print per-event logging cost for each scenario."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50000, help="Log calls per scenario")
+    args = parser.parse_args()
+
+    for name, ns in run(args.events).items():
+        print(f"{name:<40} {ns / 1000:>8.2f} us/event", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Publish throughput of each producer delivery mode against a running broker.
+
+Run with: uv run python -m benchmarks.bench_producer_modes [--bootstrap HOST:PORT] [--events N]
+(start Kafka first with `make infra-up`)
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+from src.common.config import PipelineConfig
+from src.data_generator.generator import PageviewGenerator
+from src.data_generator.producer import PageviewProducer
+
+
+def events_per_second(config: PipelineConfig, events: list[dict]) -> float:
+    """Publish `events` with one producer and return acknowledged events per second."""
+    producer = PageviewProducer(config)
+    start = time.perf_counter()
+    for event in events:
+        producer.publish(event)
+    producer.commit_transaction()
+    producer.producer.flush()
+    elapsed = time.perf_counter() - start
+    producer.producer.close()
+    return len(events) / elapsed
+
+
+def main() -> None:
+    """Print throughput per producer mode."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bootstrap", default="localhost:9092", help="Kafka bootstrap servers")
+    parser.add_argument("--topic", default="pageview-events-bench", help="Topic to publish to")
+    parser.add_argument("--events", type=int, default=20000, help="Events per mode")
+    args = parser.parse_args()
+
+    generator = PageviewGenerator()
+    events = [generator.generate_event() for _ in range(args.events)]
+
+    for mode in ("ordered", "idempotent", "transactional"):
+        config = PipelineConfig(
+            kafka_bootstrap_servers=args.bootstrap,
+            kafka_topic=args.topic,
+            producer_mode=mode,
+            log_level="WARNING",
+        )
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            rate = events_per_second(config, events)
+        print(f"{mode:<15} {rate:>12,.0f} events/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Memory per simulated user and event throughput of SessionSimulator.
+
+Run with: uv run python -m benchmarks.bench_sessions [--users N] [--events N]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from src.data_generator.generator import PageviewGenerator
+from src.data_generator.sessions import SessionSimulator
+
+
+def main() -> None:
+    """Build a user population and report memory per user and events per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000, help="Simulated users")
+    parser.add_argument("--events", type=int, default=500_000, help="Events to draw")
+    args = parser.parse_args()
+
+    defaults = PageviewGenerator()
+    postcode_weights = defaults._zipf_weights(len(defaults.postcodes))
+    page_weights = defaults._url_weights()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    simulator = SessionSimulator(args.users, postcode_weights, page_weights, seed=42)
+    build_seconds = time.perf_counter() - start
+    traced, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(args.events):
+        simulator.next_event()
+    event_seconds = time.perf_counter() - start
+
+    print(f"users                  {args.users:>12,}", file=sys.stderr)
+    print(f"build time             {build_seconds:>12.2f} s (tracemalloc on)", file=sys.stderr)
+    print(f"state bytes/user       {simulator.memory_bytes() / args.users:>12.2f}", file=sys.stderr)
+    print(f"traced bytes/user      {traced / args.users:>12.2f}", file=sys.stderr)
+    print(f"peak bytes/user        {peak / args.users:>12.2f} (during build)", file=sys.stderr)
+    print(f"events/s               {args.events / event_seconds:>12,.0f}", file=sys.stderr)
+    print(f"simulated seconds      {simulator.now_ms / 1000:>12.1f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
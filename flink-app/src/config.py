@@ -1,8 +1,14 @@
 """Flink job configuration using Pydantic."""
 
-from pydantic import Field
+import re
+from typing import Literal
+
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Backfill bounds use the raw_sink partition layout: "<dt> <event_hour>"
+PARTITION_HOUR_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}$")
+
 
 class FlinkConfig(BaseSettings):
     """Flink-specific configuration with environment variable support.
@@ -16,6 +22,56 @@ class FlinkConfig(BaseSettings):
     )
     kafka_topic: str = Field(default="pageview-events", description="Kafka topic name")
     kafka_group_id: str = Field(default="flink-pageview-processor", description="Consumer group ID")
+    kafka_isolation_level: str = Field(
+        default="read_committed",
+        description="Consumer isolation level (read_committed hides aborted transactions)",
+    )
+
+    # Kafka source startup and fetching
+    kafka_startup_mode: Literal[
+        "group-offsets", "latest-offset", "earliest-offset", "timestamp"
+    ] = Field(
+        default="group-offsets",
+        description="Where a job started without a savepoint begins reading",
+    )
+    kafka_startup_timestamp_ms: int = Field(
+        default=0, description="Epoch millis to start from in timestamp startup mode"
+    )
+    kafka_auto_offset_reset: Literal["earliest", "latest"] = Field(
+        default="earliest",
+        description="Start point for partitions without committed group offsets",
+    )
+    kafka_fetch_min_bytes: int = Field(
+        default=65536, description="Bytes a fetch waits for (bounded by fetch max wait)"
+    )
+    kafka_fetch_max_wait_ms: int = Field(
+        default=100, description="Longest a fetch waits for fetch min bytes"
+    )
+    kafka_fetch_max_bytes: int = Field(default=52428800, description="Max bytes per fetch response")
+    kafka_max_poll_records: int = Field(default=2000, description="Max records per consumer poll")
+    kafka_partition_discovery_interval_seconds: int = Field(
+        default=60, description="How often new topic partitions are picked up (0 = never)"
+    )
+
+    # Event time
+    watermark_delay_seconds: int = Field(
+        default=5, description="Bounded out-of-orderness of event timestamps"
+    )
+    allowed_lateness_seconds: int = Field(
+        default=0, description="Extra delay before windows close, to admit late events"
+    )
+    source_idle_timeout_seconds: int = Field(
+        default=30, description="Exclude partitions idle this long from the watermark (0 = never)"
+    )
+    watermark_alignment_group: str = Field(
+        default="", description="Watermark alignment group (empty = no alignment)"
+    )
+    watermark_alignment_max_drift_seconds: int = Field(
+        default=20, description="Max watermark lead of a split over its alignment group"
+    )
+    watermark_alignment_update_interval_seconds: int = Field(
+        default=1, description="How often aligned splits report their watermark"
+    )
 
     # S3
     s3_endpoint: str = Field(
@@ -28,6 +84,132 @@ class FlinkConfig(BaseSettings):
         default="s3://pageview-pipeline-local-aggregated/",
         description="S3 bucket for aggregated data",
     )
+    dlq_bucket: str = Field(
+        default="s3://pageview-pipeline-local-dlq/",
+        description="S3 bucket for rejected events and rejection counts",
+    )
+
+    # Enrichment
+    postcode_dim_path: str = Field(
+        default="file:///opt/project/flink-app/data/postcode_dim/",
+        description="Postcode-to-region dimension CSV directory (file:// or s3://)",
+    )
+
+    # Execution mode
+    job_mode: Literal["streaming", "backfill"] = Field(
+        default="streaming",
+        description="streaming reads Kafka; backfill recomputes agg partitions from raw Parquet",
+    )
+    backfill_start: str = Field(
+        default="", description='First raw partition hour to backfill ("YYYY-MM-DD HH")'
+    )
+    backfill_end: str = Field(
+        default="", description='Last raw partition hour to backfill, inclusive ("YYYY-MM-DD HH")'
+    )
+
+    # Windowing
+    window_size_seconds: int = Field(default=60, description="Tumbling window size")
+
+    # Low-latency aggregates (upsert-Kafka alongside the S3 agg sink)
+    agg_upsert_enabled: bool = Field(
+        default=False, description="Also emit early window counts to an upsert-Kafka topic"
+    )
+    agg_upsert_topic: str = Field(
+        default="pageview-counts", description="Upsert-Kafka topic keyed by window and postcode"
+    )
+    early_fire_interval_seconds: int = Field(
+        default=10, description="Emit partial counts for open windows this often"
+    )
+
+    @model_validator(mode="after")
+    def check_window_size(self) -> "FlinkConfig":
+        """Ensure windows tile the hour, so none straddles an event_hour partition."""
+        if self.window_size_seconds <= 0 or 3600 % self.window_size_seconds:
+            raise ValueError(f"window_size_seconds ({self.window_size_seconds}) must divide 3600")
+        return self
+
+    @model_validator(mode="after")
+    def check_early_fire_interval(self) -> "FlinkConfig":
+        """Ensure the early-fire interval evenly divides the window size when it is used."""
+        if not self.agg_upsert_enabled:
+            return self
+        if (
+            self.early_fire_interval_seconds <= 0
+            or self.window_size_seconds % self.early_fire_interval_seconds
+        ):
+            raise ValueError(
+                f"early_fire_interval_seconds ({self.early_fire_interval_seconds}) must divide "
+                f"window_size_seconds ({self.window_size_seconds})"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def check_kafka_startup(self) -> "FlinkConfig":
+        """Ensure timestamp startup mode has a timestamp to start from."""
+        if self.kafka_startup_mode == "timestamp" and self.kafka_startup_timestamp_ms <= 0:
+            raise ValueError("kafka_startup_timestamp_ms must be set in timestamp startup mode")
+        return self
+
+    @model_validator(mode="after")
+    def check_backfill_range(self) -> "FlinkConfig":
+        """Ensure backfill mode has a well-formed, ordered partition hour range."""
+        if self.job_mode != "backfill":
+            return self
+        for name in ("backfill_start", "backfill_end"):
+            if not PARTITION_HOUR_PATTERN.match(getattr(self, name)):
+                raise ValueError(f'{name} must be set as "YYYY-MM-DD HH" in backfill mode')
+        if self.backfill_start > self.backfill_end:
+            raise ValueError(
+                f"backfill_start ({self.backfill_start}) is after backfill_end ({self.backfill_end})"
+            )
+        return self
+
+    @property
+    def watermark_bound_seconds(self) -> int:
+        """Watermark delay including allowed lateness.
+
+        Window TVFs drop any event behind the watermark and have no separate
+        allowed-lateness setting, so lateness widens the watermark bound.
+        """
+        return self.watermark_delay_seconds + self.allowed_lateness_seconds
+
+    def kafka_source_options(self) -> dict[str, str]:
+        """Kafka source table options for the startup position and fetching.
+
+        `kafka_startup_mode` itself is passed to `create_kafka_source`. Startup
+        settings only apply when the job starts without a savepoint or
+        checkpoint: group-offsets resumes from the offsets committed on the last
+        checkpoint, so a fresh restart begins close to where the old job stopped,
+        and partitions the group never committed start at `kafka_auto_offset_reset`.
+        """
+        options = {
+            "properties.auto.offset.reset": self.kafka_auto_offset_reset,
+            "properties.fetch.min.bytes": str(self.kafka_fetch_min_bytes),
+            "properties.fetch.max.wait.ms": str(self.kafka_fetch_max_wait_ms),
+            "properties.fetch.max.bytes": str(self.kafka_fetch_max_bytes),
+            "properties.max.poll.records": str(self.kafka_max_poll_records),
+            "scan.topic-partition-discovery.interval": (
+                f"{self.kafka_partition_discovery_interval_seconds}s"
+            ),
+        }
+        if self.kafka_startup_mode == "timestamp":
+            options["scan.startup.timestamp-millis"] = str(self.kafka_startup_timestamp_ms)
+        return options
+
+    def source_watermark_options(self) -> dict[str, str]:
+        """Kafka source table options for idle partitions and watermark alignment."""
+        options = {}
+        if self.source_idle_timeout_seconds > 0:
+            options["scan.watermark.idle-timeout"] = f"{self.source_idle_timeout_seconds}s"
+        if self.watermark_alignment_group:
+            options["scan.watermark.alignment.group"] = self.watermark_alignment_group
+            options["scan.watermark.alignment.max-drift"] = (
+                f"{self.watermark_alignment_max_drift_seconds}s"
+            )
+            options["scan.watermark.alignment.update-interval"] = (
+                f"{self.watermark_alignment_update_interval_seconds}s"
+            )
+        return options
 
     model_config = SettingsConfigDict(
         env_file=".env",
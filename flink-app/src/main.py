@@ -1,42 +1,51 @@
 """Pageview Flink Processor - Optimized Table API with View Pattern.
 
 Uses a single source view to eliminate redundant reads.
-DLQ is conditional via WHERE clause (only invalid records).
+Validation runs once; invalid records go to the DLQ with a reason code.
+
+JOB_MODE=backfill runs the same SQL as a bounded batch job over archived raw
+partitions (BACKFILL_START..BACKFILL_END) and overwrites the matching
+aggregate partitions.
 """
 
 import os
 import sys
 
 from pyflink.datastream import StreamExecutionEnvironment
-from pyflink.table import EnvironmentSettings, StreamTableEnvironment
+from pyflink.table import (
+    EnvironmentSettings,
+    StatementSet,
+    StreamTableEnvironment,
+    TableEnvironment,
+)
 
 # Add parent src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 
 from config import FlinkConfig
-from sql import (
-    create_agg_sink,
-    create_kafka_source,
-    create_raw_sink,
-    create_validated_view_sql,
-    insert_aggregated_sql,
-    insert_raw_events_sql,
-)
+from pipeline import create_backfill_statement_set, create_streaming_statement_set
 
 from src.common.logging import setup_logging
 
 logger = setup_logging("flink-pageview-processor")
 
 
-def main() -> None:
-    """Run the Flink pageview processing pipeline."""
-    # Load configuration
-    config = FlinkConfig()
-    logger.info("Starting Pageview Flink Processor (Optimized Table API)")
-    logger.info(f"Kafka: {config.kafka_bootstrap_servers}, Topic: {config.kafka_topic}")
-    logger.info(f"S3 Endpoint: {config.s3_endpoint}")
-    logger.info(f"Buckets - Raw: {config.raw_bucket}, Agg: {config.agg_bucket}")
+def configure_s3(t_env: TableEnvironment, config: FlinkConfig) -> None:
+    """Configure S3 access for LocalStack."""
+    cfg = t_env.get_config().get_configuration()
+    cfg.set_string("fs.s3.endpoint", config.s3_endpoint)
+    cfg.set_string("fs.s3a.endpoint", config.s3_endpoint)
+    cfg.set_string("fs.s3a.path.style.access", "true")
+    cfg.set_string(
+        "fs.s3a.aws.credentials.provider", "org.apache.hadoop.fs.s3a.SimpleAWSCredentialsProvider"
+    )
+    cfg.set_string("fs.s3a.access.key", "test")
+    cfg.set_string("fs.s3a.secret.key", "test")
+    cfg.set_string("fs.s3.impl", "org.apache.hadoop.fs.s3a.S3AFileSystem")
+
 
+def build_streaming_pipeline(config: FlinkConfig) -> StatementSet:
+    """Build the continuous Kafka -> S3 (and optional upsert-Kafka) pipeline."""
     # Initialize Flink environment
     env = StreamExecutionEnvironment.get_execution_environment()
     env.set_parallelism(2)
@@ -46,41 +55,49 @@ def main() -> None:
     settings = EnvironmentSettings.in_streaming_mode()
     t_env = StreamTableEnvironment.create(env, environment_settings=settings)
 
-    # Configure S3 access for LocalStack
     logger.info("Configuring S3 access...")
-    cfg = t_env.get_config().get_configuration()
-    cfg.set_string("fs.s3.endpoint", config.s3_endpoint)
-    cfg.set_string("fs.s3a.endpoint", config.s3_endpoint)
-    cfg.set_string("fs.s3a.path.style.access", "true")
-    cfg.set_string(
-        "fs.s3a.aws.credentials.provider", "org.apache.hadoop.fs.s3a.SimpleAWSCredentialsProvider"
-    )
-    cfg.set_string("fs.s3a.access.key", "test")
-    cfg.set_string("fs.s3a.secret.key", "test")
-    cfg.set_string("fs.s3.impl", "org.apache.hadoop.fs.s3a.S3AFileSystem")
+    configure_s3(t_env, config)
 
-    # Create Kafka source table
-    logger.info("Creating Kafka source table...")
-    create_kafka_source(
-        t_env, config.kafka_bootstrap_servers, config.kafka_topic, config.kafka_group_id
-    )
+    if config.agg_upsert_enabled:
+        logger.info(
+            f"Early window counts every {config.early_fire_interval_seconds}s "
+            f"to topic {config.agg_upsert_topic}"
+        )
+    logger.info(f"Building pipeline (postcode dimension: {config.postcode_dim_path})...")
+    return create_streaming_statement_set(t_env, config)
 
-    # Create sink tables
-    logger.info("Creating sink tables...")
-    create_raw_sink(t_env, config.raw_bucket)
-    create_agg_sink(t_env, config.agg_bucket)
 
-    # Create validated events view (filters invalid postcodes)
-    logger.info("Creating validated events view...")
-    t_env.execute_sql(create_validated_view_sql())
+def build_backfill_pipeline(config: FlinkConfig) -> StatementSet:
+    """Build a bounded batch job recomputing agg_sink partitions from the raw archive.
 
-    # Build pipeline with statement set
-    logger.info("Building pipeline...")
-    statement_set = t_env.create_statement_set()
+    Batch execution needs no checkpoints or window state, and parallelism is
+    left to the cluster's batch scheduler.
+    """
+    settings = EnvironmentSettings.in_batch_mode()
+    t_env = TableEnvironment.create(settings)
+
+    logger.info("Configuring S3 access...")
+    configure_s3(t_env, config)
+
+    logger.info(f"Backfilling raw partitions {config.backfill_start} to {config.backfill_end}")
+    return create_backfill_statement_set(t_env, config)
+
+
+def main() -> None:
+    """Run the Flink pageview processing pipeline."""
+    # Load configuration
+    config = FlinkConfig()
+    logger.info(f"Starting Pageview Flink Processor (Optimized Table API, {config.job_mode})")
+    logger.info(f"Kafka: {config.kafka_bootstrap_servers}, Topic: {config.kafka_topic}")
+    logger.info(f"S3 Endpoint: {config.s3_endpoint}")
+    logger.info(
+        f"Buckets - Raw: {config.raw_bucket}, Agg: {config.agg_bucket}, DLQ: {config.dlq_bucket}"
+    )
 
-    # Add INSERT statements
-    statement_set.add_insert_sql(insert_raw_events_sql())  # Archive valid raw events
-    statement_set.add_insert_sql(insert_aggregated_sql())  # Aggregate valid events
+    if config.job_mode == "backfill":
+        statement_set = build_backfill_pipeline(config)
+    else:
+        statement_set = build_streaming_pipeline(config)
 
     # Execute all statements atomically
     logger.info("Submitting job...")
@@ -0,0 +1,120 @@
+"""Statement set assembly shared by the job entrypoint and the plan tests.
+
+Registers every table and view from the `sql` package on a table environment
+and collects the INSERTs into one statement set, so the plan submitted by
+`main.py` is the plan the tests explain.
+"""
+
+from config import FlinkConfig
+from pyflink.table import StatementSet, TableEnvironment
+from sql import (
+    create_agg_sink,
+    create_agg_upsert_sink,
+    create_backfill_source_view_sql,
+    create_checked_view_sql,
+    create_dlq_sink,
+    create_enriched_view_sql,
+    create_enrichment_match_rate_function,
+    create_enrichment_stats_sink,
+    create_kafka_source,
+    create_postcode_dim_source,
+    create_postcode_dim_view_sql,
+    create_raw_archive_source,
+    create_raw_sink,
+    create_rejected_view_sql,
+    create_rejection_count_function,
+    create_rejection_counts_sink,
+    create_validated_view_sql,
+    insert_aggregated_sql,
+    insert_early_aggregated_sql,
+    insert_enrichment_stats_sql,
+    insert_raw_events_sql,
+    insert_rejected_events_sql,
+    insert_rejection_counts_sql,
+)
+
+
+def create_streaming_statement_set(t_env: TableEnvironment, config: FlinkConfig) -> StatementSet:
+    """Build the continuous Kafka -> S3 (and optional upsert-Kafka) statement set.
+
+    Args:
+        t_env: Streaming table environment
+        config: Job configuration
+
+    Returns:
+        Statement set with every streaming INSERT
+    """
+    # Source and sink tables
+    create_kafka_source(
+        t_env,
+        config.kafka_bootstrap_servers,
+        config.kafka_topic,
+        config.kafka_group_id,
+        config.kafka_isolation_level,
+        config.watermark_bound_seconds,
+        {**config.kafka_source_options(), **config.source_watermark_options()},
+        config.kafka_startup_mode,
+    )
+    create_raw_sink(t_env, config.raw_bucket)
+    create_agg_sink(t_env, config.agg_bucket)
+    create_dlq_sink(t_env, config.dlq_bucket)
+    create_rejection_counts_sink(t_env, config.dlq_bucket)
+    create_enrichment_stats_sink(t_env)
+    create_enrichment_match_rate_function(t_env)
+    create_rejection_count_function(t_env)
+    if config.agg_upsert_enabled:
+        create_agg_upsert_sink(t_env, config.kafka_bootstrap_servers, config.agg_upsert_topic)
+
+    # One validation pass over the source, split into valid and rejected events
+    t_env.execute_sql(create_checked_view_sql())
+    t_env.execute_sql(create_validated_view_sql())
+    t_env.execute_sql(create_rejected_view_sql())
+    # Valid events enriched with postcode regions
+    create_postcode_dim_source(t_env, config.postcode_dim_path)
+    t_env.execute_sql(create_postcode_dim_view_sql())
+    t_env.execute_sql(create_enriched_view_sql())
+
+    statement_set = t_env.create_statement_set()
+    statement_set.add_insert_sql(insert_raw_events_sql())  # Archive valid raw events
+    # Dead-letter invalid events and count them per reason
+    statement_set.add_insert_sql(insert_rejected_events_sql())
+    statement_set.add_insert_sql(insert_rejection_counts_sql(config.window_size_seconds))
+    # Aggregate valid events
+    statement_set.add_insert_sql(insert_aggregated_sql(config.window_size_seconds))
+    # Dimension match rate per window
+    statement_set.add_insert_sql(insert_enrichment_stats_sql(config.window_size_seconds))
+    if config.agg_upsert_enabled:
+        statement_set.add_insert_sql(
+            insert_early_aggregated_sql(
+                config.window_size_seconds, config.early_fire_interval_seconds
+            )
+        )
+    return statement_set
+
+
+def create_backfill_statement_set(t_env: TableEnvironment, config: FlinkConfig) -> StatementSet:
+    """Build the batch statement set recomputing agg_sink partitions from the raw archive.
+
+    Runs the same validated view and aggregation SQL as streaming mode, with
+    the Kafka source replaced by a view over the archived raw partitions in
+    [backfill_start, backfill_end].
+
+    Args:
+        t_env: Batch table environment
+        config: Job configuration (backfill mode)
+
+    Returns:
+        Statement set overwriting the recomputed agg_sink partitions
+    """
+    create_raw_archive_source(t_env, config.raw_bucket)
+    create_agg_sink(t_env, config.agg_bucket)
+    t_env.execute_sql(create_backfill_source_view_sql(config.backfill_start, config.backfill_end))
+    t_env.execute_sql(create_checked_view_sql())
+    t_env.execute_sql(create_validated_view_sql())
+    create_postcode_dim_source(t_env, config.postcode_dim_path)
+    t_env.execute_sql(create_enriched_view_sql(batch=True))
+
+    statement_set = t_env.create_statement_set()
+    # Replace only the agg partitions recomputed from the selected range
+    statement_set.add_insert_sql(insert_aggregated_sql(config.window_size_seconds, overwrite=True))
+    return statement_set
@@ -2,22 +2,66 @@
 
 Organized into:
 - tables: Table DDL (CREATE TABLE)
+- functions: User-defined functions
 - views: View definitions (CREATE VIEW)
 - inserts: Data queries (INSERT)
 """
 
-from .inserts import insert_aggregated_sql, insert_raw_events_sql
-from .tables import create_agg_sink, create_kafka_source, create_raw_sink
-from .views import create_validated_view_sql
+from .functions import create_enrichment_match_rate_function, create_rejection_count_function
+from .inserts import (
+    insert_aggregated_sql,
+    insert_early_aggregated_sql,
+    insert_enrichment_stats_sql,
+    insert_raw_events_sql,
+    insert_rejected_events_sql,
+    insert_rejection_counts_sql,
+)
+from .tables import (
+    create_agg_sink,
+    create_agg_upsert_sink,
+    create_dlq_sink,
+    create_enrichment_stats_sink,
+    create_kafka_source,
+    create_postcode_dim_source,
+    create_raw_archive_source,
+    create_raw_sink,
+    create_rejection_counts_sink,
+)
+from .views import (
+    create_backfill_source_view_sql,
+    create_checked_view_sql,
+    create_enriched_view_sql,
+    create_postcode_dim_view_sql,
+    create_rejected_view_sql,
+    create_validated_view_sql,
+)
 
 __all__ = [
     # Tables
     "create_kafka_source",
     "create_raw_sink",
+    "create_raw_archive_source",
+    "create_postcode_dim_source",
     "create_agg_sink",
+    "create_dlq_sink",
+    "create_rejection_counts_sink",
+    "create_agg_upsert_sink",
+    "create_enrichment_stats_sink",
+    # Functions
+    "create_enrichment_match_rate_function",
+    "create_rejection_count_function",
     # Views
+    "create_checked_view_sql",
     "create_validated_view_sql",
+    "create_rejected_view_sql",
+    "create_backfill_source_view_sql",
+    "create_postcode_dim_view_sql",
+    "create_enriched_view_sql",
     # Inserts
     "insert_raw_events_sql",
+    "insert_rejected_events_sql",
+    "insert_rejection_counts_sql",
     "insert_aggregated_sql",
+    "insert_early_aggregated_sql",
+    "insert_enrichment_stats_sql",
 ]
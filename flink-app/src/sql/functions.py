@@ -0,0 +1,66 @@
+"""User-defined functions registered with the Flink pipeline."""
+
+from typing import Any
+
+from pyflink.table import DataTypes, TableEnvironment
+from pyflink.table.udf import FunctionContext, ScalarFunction, udf
+
+
+class EnrichmentMatchRate(ScalarFunction):
+    """Report a window's dimension matches as Flink metrics and return its match rate.
+
+    Called once per window on the aggregated stats row, never per event, so
+    the Python worker stays off the hot path. The counters are exported by the
+    Prometheus reporter as `flink_taskmanager_job_task_operator_enrichment_events`
+    and `..._enrichment_matched`.
+    """
+
+    def open(self, function_context: FunctionContext) -> None:
+        """Register the enrichment counters on the operator's metric group."""
+        group = function_context.get_metric_group().add_group("enrichment")
+        self.events = group.counter("events")
+        self.matched = group.counter("matched")
+
+    def eval(self, events: int, matched: int) -> float:
+        """Count the window's events and matches and return their ratio."""
+        self.events.inc(events)
+        self.matched.inc(matched)
+        return matched / events
+
+
+class RejectionCount(ScalarFunction):
+    """Report a window's rejections for one reason as a Flink metric and return the count.
+
+    Called once per (window, reason) row of the rejection counts query, never
+    per event. Counters are created on the first window with each reason and
+    exported by the Prometheus reporter as
+    `flink_taskmanager_job_task_operator_rejected_reason_events{reason="..."}`.
+    """
+
+    def open(self, function_context: FunctionContext) -> None:
+        """Keep the operator's metric group for the per-reason counters."""
+        self.group = function_context.get_metric_group().add_group("rejected")
+        self.counters: dict[str, Any] = {}
+
+    def eval(self, reject_reason: str, rejected: int) -> int:
+        """Add the window's rejections to the reason's counter and return them."""
+        counter = self.counters.get(reject_reason)
+        if counter is None:
+            counter = self.group.add_group("reason", reject_reason).counter("events")
+            self.counters[reject_reason] = counter
+        counter.inc(rejected)
+        return rejected
+
+
+def create_enrichment_match_rate_function(t_env: TableEnvironment) -> None:
+    """Register `enrichment_match_rate(events, matched)` for the enrichment stats query."""
+    t_env.create_temporary_system_function(
+        "enrichment_match_rate", udf(EnrichmentMatchRate(), result_type=DataTypes.DOUBLE())
+    )
+
+
+def create_rejection_count_function(t_env: TableEnvironment) -> None:
+    """Register `rejection_count(reject_reason, rejected)` for the rejection counts query."""
+    t_env.create_temporary_system_function(
+        "rejection_count", udf(RejectionCount(), result_type=DataTypes.BIGINT())
+    )
@@ -14,17 +14,158 @@ def insert_raw_events_sql() -> str:
     """
 
 
-def insert_aggregated_sql() -> str:
-    """Create SQL to aggregate valid events by postcode.
+def insert_rejected_events_sql() -> str:
+    """Create SQL to route invalid events to the DLQ.
 
     Returns:
-        SQL INSERT statement for aggregated results
+        SQL INSERT statement for the DLQ sink
     """
     return """
-        INSERT INTO agg_sink
-        SELECT window_start, window_end, postcode, COUNT(*) AS pageview_count
+        INSERT INTO dlq_sink
+        SELECT
+            user_id,
+            postcode,
+            webpage,
+            `timestamp`,
+            reject_reason,
+            DATE_FORMAT(proc_time, 'yyyy-MM-dd') AS dt,
+            DATE_FORMAT(proc_time, 'HH') AS event_hour
+        FROM rejected_events
+    """
+
+
+def insert_rejection_counts_sql(window_size_seconds: int = 60) -> str:
+    """Create SQL counting rejected events per reason in processing-time windows.
+
+    Each window's count per reason is passed through `rejection_count`, which
+    also exports it as a per-reason Flink metric.
+
+    Args:
+        window_size_seconds: Tumbling window size
+
+    Returns:
+        SQL INSERT statement for the rejection counts sink
+    """
+    return f"""
+        INSERT INTO rejection_counts_sink
+        SELECT
+            window_start,
+            window_end,
+            reject_reason,
+            rejection_count(reject_reason, rejected) AS rejected_count,
+            DATE_FORMAT(window_start, 'yyyy-MM-dd') AS dt
+        FROM (
+            SELECT window_start, window_end, reject_reason, COUNT(*) AS rejected
+            FROM TABLE(
+                TUMBLE(
+                    TABLE rejected_events,
+                    DESCRIPTOR(proc_time),
+                    INTERVAL '{window_size_seconds}' SECOND
+                )
+            )
+            GROUP BY window_start, window_end, reject_reason
+        )
+    """
+
+
+def insert_aggregated_sql(window_size_seconds: int = 60, overwrite: bool = False) -> str:
+    """Create SQL to aggregate enriched events by postcode.
+
+    Region and area type are functionally dependent on the postcode, so
+    grouping by them adds the dimension columns without changing the counts.
+
+    Args:
+        window_size_seconds: Tumbling window size
+        overwrite: Replace the agg_sink partitions written by this query
+            (batch backfill); other partitions are left untouched
+
+    Returns:
+        SQL INSERT statement for aggregated results
+    """
+    mode = "OVERWRITE" if overwrite else "INTO"
+    return f"""
+        INSERT {mode} agg_sink
+        SELECT
+            window_start,
+            window_end,
+            postcode,
+            region,
+            area_type,
+            COUNT(*) AS pageview_count,
+            DATE_FORMAT(window_start, 'yyyy-MM-dd') AS dt,
+            DATE_FORMAT(window_start, 'HH') AS event_hour
+        FROM TABLE(
+            TUMBLE(TABLE enriched_events, DESCRIPTOR(ts), INTERVAL '{window_size_seconds}' SECOND)
+        )
+        GROUP BY window_start, window_end, postcode, region, area_type
+    """
+
+
+def insert_enrichment_stats_sql(window_size_seconds: int = 60) -> str:
+    """Create SQL reporting the share of events matched to a dimension row.
+
+    The dimension is held in join state, so the useful hit rate is how many
+    events found their postcode in it. One row per window is passed through
+    `enrichment_match_rate`, which also exports the counts as Flink metrics.
+    Matches test both enriched columns so the query reads the same join
+    output as `insert_aggregated_sql`, and the planner reuses that temporal
+    join instead of building a second one with its own dimension state.
+
+    Args:
+        window_size_seconds: Tumbling window size
+
+    Returns:
+        SQL INSERT statement for the enrichment stats sink
+    """
+    return f"""
+        INSERT INTO enrichment_stats_sink
+        SELECT window_start, events, matched, enrichment_match_rate(events, matched) AS match_rate
+        FROM (
+            SELECT
+                window_start,
+                COUNT(*) AS events,
+                SUM(CASE WHEN region <> 'UNKNOWN' OR area_type <> 'UNKNOWN' THEN 1 ELSE 0 END) AS matched
+            FROM TABLE(
+                TUMBLE(
+                    TABLE enriched_events, DESCRIPTOR(ts), INTERVAL '{window_size_seconds}' SECOND
+                )
+            )
+            GROUP BY window_start, window_end
+        )
+    """
+
+
+def insert_early_aggregated_sql(window_size_seconds: int = 60, early_fire_seconds: int = 10) -> str:
+    """Create SQL to emit partial per-postcode counts while a window is open.
+
+    Window TVF aggregations do not support the early-fire emit options, so this
+    uses a CUMULATE window: every `early_fire_seconds` it emits the count so
+    far for the enclosing tumbling window. Rows are upserted on
+    (window_start, postcode); the row where `counted_until` equals
+    `window_end` carries the final count, matching agg_sink.
+
+    Args:
+        window_size_seconds: Tumbling window size
+        early_fire_seconds: Early-fire interval (must divide the window size)
+
+    Returns:
+        SQL INSERT statement for the upsert sink
+    """
+    return f"""
+        INSERT INTO agg_upsert_sink
+        SELECT
+            window_start,
+            window_start + INTERVAL '{window_size_seconds}' SECOND AS window_end,
+            postcode,
+            COUNT(*) AS pageview_count,
+            window_end AS counted_until
         FROM TABLE(
-            TUMBLE(TABLE validated_events, DESCRIPTOR(ts), INTERVAL '1' MINUTE)
+            CUMULATE(
+                TABLE validated_events,
+                DESCRIPTOR(ts),
+                INTERVAL '{early_fire_seconds}' SECOND,
+                INTERVAL '{window_size_seconds}' SECOND
+            )
         )
         GROUP BY window_start, window_end, postcode
     """
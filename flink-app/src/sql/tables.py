@@ -4,7 +4,14 @@ from pyflink.table import TableEnvironment
 
 
 def create_kafka_source(
-    t_env: TableEnvironment, bootstrap_servers: str, topic: str, group_id: str
+    t_env: TableEnvironment,
+    bootstrap_servers: str,
+    topic: str,
+    group_id: str,
+    isolation_level: str = "read_committed",
+    watermark_delay_seconds: int = 5,
+    options: dict[str, str] | None = None,
+    startup_mode: str = "earliest-offset",
 ) -> None:
     """Create Kafka source table for pageview events.
 
@@ -13,7 +20,14 @@ def create_kafka_source(
         bootstrap_servers: Kafka bootstrap servers
         topic: Kafka topic name
         group_id: Consumer group ID
+        isolation_level: read_committed skips events from aborted producer
+            transactions; read_uncommitted reads everything
+        watermark_delay_seconds: Bounded out-of-orderness of `ts`
+        options: Extra connector options (e.g. `scan.watermark.idle-timeout`)
+        startup_mode: Where to start without a savepoint (earliest-offset,
+            latest-offset, group-offsets or timestamp)
     """
+    extra = "".join(f",\n            '{key}' = '{value}'" for key, value in (options or {}).items())
     ddl = f"""
         CREATE TABLE pageviews (
             user_id INT,
@@ -21,14 +35,45 @@ def create_kafka_source(
             webpage STRING,
             `timestamp` BIGINT,
             ts AS TO_TIMESTAMP_LTZ(`timestamp`, 3),
-            WATERMARK FOR ts AS ts - INTERVAL '5' SECOND
+            WATERMARK FOR ts AS ts - INTERVAL '{watermark_delay_seconds}' SECOND
         ) WITH (
             'connector' = 'kafka',
             'topic' = '{topic}',
             'properties.bootstrap.servers' = '{bootstrap_servers}',
             'properties.group.id' = '{group_id}',
-            'scan.startup.mode' = 'earliest-offset',
-            'format' = 'json'
+            'properties.isolation.level' = '{isolation_level}',
+            'scan.startup.mode' = '{startup_mode}',
+            'format' = 'json',
+            'json.ignore-parse-errors' = 'true'{extra}
+        )
+    """
+    t_env.execute_sql(ddl)
+
+
+def create_postcode_dim_source(t_env: TableEnvironment, path: str) -> None:
+    """Create bounded source for the postcode-to-region dimension.
+
+    Headerless CSV rows of `postcode,region,area_type,valid_from_ms`. A
+    postcode may appear several times; the row with the latest `valid_from`
+    at or before an event's time applies to that event. The table is read
+    once at job start, so edits take effect on the next (re)submission.
+
+    Args:
+        t_env: Flink table environment
+        path: Dimension directory (local `file://` or `s3://`)
+    """
+    ddl = f"""
+        CREATE TABLE postcode_dim (
+            postcode STRING,
+            region STRING,
+            area_type STRING,
+            valid_from_ms BIGINT,
+            valid_from AS TO_TIMESTAMP_LTZ(valid_from_ms, 3),
+            WATERMARK FOR valid_from AS valid_from
+        ) WITH (
+            'connector' = 'filesystem',
+            'path' = '{path}',
+            'format' = 'csv'
         )
     """
     t_env.execute_sql(ddl)
@@ -54,18 +99,139 @@ def create_raw_sink(t_env: TableEnvironment, bucket: str) -> None:
     t_env.execute_sql(ddl)
 
 
+def create_raw_archive_source(t_env: TableEnvironment, bucket: str) -> None:
+    """Create bounded source over the raw event archive written by raw_sink.
+
+    Args:
+        t_env: Flink table environment (batch mode)
+        bucket: Raw events bucket (same path as raw_sink)
+    """
+    ddl = f"""
+        CREATE TABLE raw_archive (
+            user_id INT,
+            postcode STRING,
+            webpage STRING,
+            `timestamp` BIGINT,
+            dt STRING,
+            event_hour STRING
+        ) PARTITIONED BY (dt, event_hour) WITH (
+            'connector' = 'filesystem',
+            'path' = '{bucket}',
+            'format' = 'parquet'
+        )
+    """
+    t_env.execute_sql(ddl)
+
+
+def create_dlq_sink(t_env: TableEnvironment, bucket: str) -> None:
+    """Create S3 sink for rejected events and their reason codes.
+
+    Partitioned by processing date/hour under `<bucket>/events`.
+    """
+    ddl = f"""
+        CREATE TABLE dlq_sink (
+            user_id INT,
+            postcode STRING,
+            webpage STRING,
+            `timestamp` BIGINT,
+            reject_reason STRING,
+            dt STRING,
+            event_hour STRING
+        ) PARTITIONED BY (dt, event_hour) WITH (
+            'connector' = 'filesystem',
+            'path' = '{bucket.rstrip("/")}/events',
+            'format' = 'parquet',
+            'sink.partition-commit.policy.kind' = 'success-file'
+        )
+    """
+    t_env.execute_sql(ddl)
+
+
+def create_rejection_counts_sink(t_env: TableEnvironment, bucket: str) -> None:
+    """Create S3 sink for per-window rejection counts by reason under `<bucket>/counts`."""
+    ddl = f"""
+        CREATE TABLE rejection_counts_sink (
+            window_start TIMESTAMP(3),
+            window_end TIMESTAMP(3),
+            reject_reason STRING,
+            rejected_count BIGINT,
+            dt STRING
+        ) PARTITIONED BY (dt) WITH (
+            'connector' = 'filesystem',
+            'path' = '{bucket.rstrip("/")}/counts',
+            'format' = 'parquet',
+            'sink.partition-commit.policy.kind' = 'success-file'
+        )
+    """
+    t_env.execute_sql(ddl)
+
+
 def create_agg_sink(t_env: TableEnvironment, bucket: str) -> None:
-    """Create S3 sink for aggregated results."""
+    """Create S3 sink for aggregated results (partitioned by window date/hour)."""
     ddl = f"""
         CREATE TABLE agg_sink (
             window_start TIMESTAMP(3),
             window_end TIMESTAMP(3),
             postcode STRING,
-            pageview_count BIGINT
-        ) WITH (
+            region STRING,
+            area_type STRING,
+            pageview_count BIGINT,
+            dt STRING,
+            event_hour STRING
+        ) PARTITIONED BY (dt, event_hour) WITH (
             'connector' = 'filesystem',
             'path' = '{bucket}',
-            'format' = 'parquet'
+            'format' = 'parquet',
+            'sink.partition-commit.policy.kind' = 'success-file'
+        )
+    """
+    t_env.execute_sql(ddl)
+
+
+def create_agg_upsert_sink(t_env: TableEnvironment, bootstrap_servers: str, topic: str) -> None:
+    """Create upsert-Kafka sink for early (partial) window counts.
+
+    Keyed by (window_start, postcode), so each update replaces the previous
+    count for the window and a compacted topic keeps only the latest value.
+
+    Args:
+        t_env: Flink table environment
+        bootstrap_servers: Kafka bootstrap servers
+        topic: Kafka topic name
+    """
+    ddl = f"""
+        CREATE TABLE agg_upsert_sink (
+            window_start TIMESTAMP(3),
+            window_end TIMESTAMP(3),
+            postcode STRING,
+            pageview_count BIGINT,
+            counted_until TIMESTAMP(3),
+            PRIMARY KEY (window_start, postcode) NOT ENFORCED
+        ) WITH (
+            'connector' = 'upsert-kafka',
+            'topic' = '{topic}',
+            'properties.bootstrap.servers' = '{bootstrap_servers}',
+            'key.format' = 'json',
+            'value.format' = 'json'
+        )
+    """
+    t_env.execute_sql(ddl)
+
+
+def create_enrichment_stats_sink(t_env: TableEnvironment) -> None:
+    """Create print sink for per-window dimension match rates (TaskManager stdout).
+
+    The same counts are exported as Flink metrics by `enrichment_match_rate`.
+    """
+    ddl = """
+        CREATE TABLE enrichment_stats_sink (
+            window_start TIMESTAMP(3),
+            events BIGINT,
+            matched BIGINT,
+            match_rate DOUBLE
+        ) WITH (
+            'connector' = 'print',
+            'print-identifier' = 'enrichment'
         )
     """
     t_env.execute_sql(ddl)
@@ -1,10 +1,48 @@
 """SQL view definitions for data transformation."""
 
 
+def create_checked_view_sql() -> str:
+    """Create SQL for source events tagged with the first validation rule they fail.
+
+    Applies the `PageviewEvent` rules: positive user_id, postcode matching
+    `^[A-Z0-9]{2,10}$`, http(s) webpage and a millisecond timestamp between
+    2000-01-01 and 2100-01-01. The postcode rule checks length and
+    characters separately because a Java regex `$` also matches before a
+    trailing newline. `reject_reason` is NULL for valid events.
+    Both `validated_events` and `rejected_events` read this view, so the
+    planner shares one source scan between them.
+
+    Returns:
+        SQL CREATE VIEW statement
+    """
+    return """
+        CREATE VIEW checked_events AS
+        SELECT
+            user_id,
+            postcode,
+            webpage,
+            `timestamp`,
+            ts,
+            CASE
+                WHEN user_id IS NULL THEN 'MISSING_USER_ID'
+                WHEN user_id <= 0 THEN 'INVALID_USER_ID'
+                WHEN postcode IS NULL THEN 'MISSING_POSTCODE'
+                WHEN CHAR_LENGTH(postcode) NOT BETWEEN 2 AND 10
+                    OR REGEXP(postcode, '[^A-Z0-9]') THEN 'INVALID_POSTCODE'
+                WHEN webpage IS NULL THEN 'MISSING_WEBPAGE'
+                WHEN NOT REGEXP(webpage, '^https?://.+') THEN 'INVALID_WEBPAGE'
+                WHEN `timestamp` IS NULL THEN 'MISSING_TIMESTAMP'
+                WHEN `timestamp` < 946684800000 OR `timestamp` > 4102444800000
+                    THEN 'INVALID_TIMESTAMP'
+            END AS reject_reason
+        FROM pageviews
+    """
+
+
 def create_validated_view_sql() -> str:
     """Create SQL for validated events view.
 
-    Filters out invalid postcodes (NULL or length not in 2-10 range).
+    Keeps events that pass every rule in `create_checked_view_sql`.
 
     Returns:
         SQL CREATE VIEW statement
@@ -19,8 +57,136 @@ def create_validated_view_sql() -> str:
             ts,
             DATE_FORMAT(ts, 'yyyy-MM-dd') AS dt,
             DATE_FORMAT(ts, 'HH') AS event_hour
-        FROM pageviews
-        WHERE postcode IS NOT NULL
-          AND CHAR_LENGTH(postcode) >= 2
-          AND CHAR_LENGTH(postcode) <= 10
+        FROM checked_events
+        WHERE reject_reason IS NULL
+    """
+
+
+def create_rejected_view_sql() -> str:
+    """Create SQL for rejected events view.
+
+    Invalid events with their reason code, partitioned by processing time
+    since their own timestamp may be missing or out of range.
+
+    Returns:
+        SQL CREATE VIEW statement
+    """
+    return """
+        CREATE VIEW rejected_events AS
+        SELECT
+            user_id,
+            postcode,
+            webpage,
+            `timestamp`,
+            reject_reason,
+            PROCTIME() AS proc_time
+        FROM checked_events
+        WHERE reject_reason IS NOT NULL
+    """
+
+
+def create_postcode_dim_view_sql() -> str:
+    """Create SQL for the versioned postcode dimension view.
+
+    Deduplicating on the latest `valid_from` per postcode makes Flink treat
+    the view as a versioned table keyed by postcode, which the event-time
+    temporal join in `create_enriched_view_sql` requires.
+
+    Returns:
+        SQL CREATE VIEW statement
+    """
+    return """
+        CREATE VIEW postcode_regions AS
+        SELECT postcode, region, area_type, valid_from
+        FROM (
+            SELECT
+                *,
+                ROW_NUMBER() OVER (PARTITION BY postcode ORDER BY valid_from DESC) AS row_num
+            FROM postcode_dim
+        )
+        WHERE row_num = 1
+    """
+
+
+def create_enriched_view_sql(batch: bool = False) -> str:
+    """Create SQL for validated events enriched with region and area type.
+
+    Streaming mode uses an event-time temporal join: events and dimension
+    rows are both hash-partitioned by postcode, and each join task keeps its
+    share of the dimension in keyed state. Events are resolved from that state
+    with no external lookups or per-record Python UDF calls, and event time is
+    preserved for windowing, at the cost of one shuffle of the event stream.
+    Batch (backfill) mode, where temporal joins are unsupported, gives each
+    dimension row the validity range up to the postcode's next `valid_from`
+    and joins events to the row whose range holds their time, so a backfill
+    picks the same version the streaming job did. Postcodes without a
+    dimension row valid at the event's time get region and area type 'UNKNOWN'.
+
+    Args:
+        batch: Build the batch-mode variant
+
+    Returns:
+        SQL CREATE VIEW statement
+    """
+    join = (
+        """LEFT JOIN (
+            SELECT
+                postcode,
+                region,
+                area_type,
+                valid_from_ms,
+                -- LEAD does not support TIMESTAMP_LTZ, so ranges are in epoch ms
+                LEAD(valid_from_ms) OVER (PARTITION BY postcode ORDER BY valid_from_ms)
+                    AS valid_to_ms
+            FROM postcode_dim
+        ) AS d
+            ON e.postcode = d.postcode
+            AND e.`timestamp` >= d.valid_from_ms
+            AND (d.valid_to_ms IS NULL OR e.`timestamp` < d.valid_to_ms)"""
+        if batch
+        else """LEFT JOIN postcode_regions FOR SYSTEM_TIME AS OF e.ts AS d
+            ON e.postcode = d.postcode"""
+    )
+    return f"""
+        CREATE VIEW enriched_events AS
+        SELECT
+            e.user_id,
+            e.postcode,
+            e.webpage,
+            e.`timestamp`,
+            e.ts,
+            e.dt,
+            e.event_hour,
+            COALESCE(d.region, 'UNKNOWN') AS region,
+            COALESCE(d.area_type, 'UNKNOWN') AS area_type
+        FROM validated_events AS e
+        {join}
+    """
+
+
+def create_backfill_source_view_sql(start: str, end: str) -> str:
+    """Create SQL for the pageviews view over a range of archived raw partitions.
+
+    Stands in for the Kafka `pageviews` table in backfill mode, so the
+    validated view and aggregations run unchanged. The filter only touches
+    partition columns, so Flink prunes partitions outside the range instead
+    of scanning them.
+
+    Args:
+        start: First partition hour, inclusive ("YYYY-MM-DD HH")
+        end: Last partition hour, inclusive ("YYYY-MM-DD HH")
+
+    Returns:
+        SQL CREATE VIEW statement
+    """
+    return f"""
+        CREATE VIEW pageviews AS
+        SELECT
+            user_id,
+            postcode,
+            webpage,
+            `timestamp`,
+            TO_TIMESTAMP_LTZ(`timestamp`, 3) AS ts
+        FROM raw_archive
+        WHERE CONCAT(dt, ' ', event_hour) BETWEEN '{start}' AND '{end}'
     """
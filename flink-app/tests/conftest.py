@@ -0,0 +1,8 @@
+"""Shared fixtures for Flink app tests."""
+
+import os
+import sys
+
+# pipeline.py and main.py import the sql package and config as top-level
+# modules, as they do when submitted with `flink run -py`
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
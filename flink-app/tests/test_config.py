@@ -0,0 +1,94 @@
+"""Tests for FlinkConfig."""
+
+import pytest
+from pydantic import ValidationError
+from src.config import FlinkConfig
+
+
+def test_watermark_bound_includes_lateness() -> None:
+    """Test that allowed lateness widens the watermark bound."""
+    config = FlinkConfig(watermark_delay_seconds=5, allowed_lateness_seconds=25)
+
+    assert config.watermark_bound_seconds == 30
+
+
+def test_source_watermark_options() -> None:
+    """Test idle timeout and alignment options, and disabling them."""
+    config = FlinkConfig(
+        source_idle_timeout_seconds=15,
+        watermark_alignment_group="pageviews",
+        watermark_alignment_max_drift_seconds=30,
+    )
+
+    assert config.source_watermark_options() == {
+        "scan.watermark.idle-timeout": "15s",
+        "scan.watermark.alignment.group": "pageviews",
+        "scan.watermark.alignment.max-drift": "30s",
+        "scan.watermark.alignment.update-interval": "1s",
+    }
+    assert FlinkConfig(source_idle_timeout_seconds=0).source_watermark_options() == {}
+
+
+def test_kafka_source_options() -> None:
+    """Test fetch and discovery options and the timestamp start position."""
+    options = FlinkConfig(
+        kafka_startup_mode="timestamp",
+        kafka_startup_timestamp_ms=1735732800000,
+        kafka_max_poll_records=5000,
+    ).kafka_source_options()
+
+    assert options["scan.startup.timestamp-millis"] == "1735732800000"
+    assert options["properties.max.poll.records"] == "5000"
+    assert options["properties.fetch.min.bytes"] == "65536"
+    assert options["scan.topic-partition-discovery.interval"] == "60s"
+    assert "scan.startup.mode" not in options
+
+    defaults = FlinkConfig().kafka_source_options()
+    assert "scan.startup.timestamp-millis" not in defaults
+    assert defaults["properties.auto.offset.reset"] == "earliest"
+
+
+def test_timestamp_startup_needs_timestamp() -> None:
+    """Test that timestamp startup mode requires a start timestamp."""
+    assert FlinkConfig().kafka_startup_mode == "group-offsets"
+    with pytest.raises(ValidationError):
+        FlinkConfig(kafka_startup_mode="timestamp")
+
+
+def test_window_size_must_divide_hour() -> None:
+    """Test that FlinkConfig rejects windows that would straddle hourly partitions."""
+    assert FlinkConfig(window_size_seconds=900)
+    for size in (0, 7, 5400):
+        with pytest.raises(ValidationError):
+            FlinkConfig(window_size_seconds=size)
+
+
+def test_early_fire_interval_must_divide_window() -> None:
+    """Test that FlinkConfig rejects an early-fire interval that splits windows unevenly."""
+    assert FlinkConfig(
+        agg_upsert_enabled=True, window_size_seconds=60, early_fire_interval_seconds=15
+    )
+    with pytest.raises(ValidationError):
+        FlinkConfig(agg_upsert_enabled=True, window_size_seconds=60, early_fire_interval_seconds=25)
+
+
+def test_early_fire_interval_ignored_without_upsert() -> None:
+    """Test that the early-fire interval is not validated while the upsert sink is off."""
+    assert FlinkConfig(window_size_seconds=60, early_fire_interval_seconds=25)
+
+
+def test_backfill_range_validation() -> None:
+    """Test that backfill mode requires an ordered "YYYY-MM-DD HH" range."""
+    config = FlinkConfig(
+        job_mode="backfill", backfill_start="2026-01-01 00", backfill_end="2026-01-01 23"
+    )
+    assert config.backfill_end == "2026-01-01 23"
+
+    with pytest.raises(ValidationError):
+        FlinkConfig(job_mode="backfill")
+    with pytest.raises(ValidationError):
+        FlinkConfig(job_mode="backfill", backfill_start="2026-01-01", backfill_end="2026-01-02")
+    with pytest.raises(ValidationError):
+        FlinkConfig(
+            job_mode="backfill", backfill_start="2026-01-02 00", backfill_end="2026-01-01 00"
+        )
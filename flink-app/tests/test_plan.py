@@ -0,0 +1,270 @@
+"""Execution-plan regression tests for the full Flink statement sets.
+
+The statement sets are built by `pipeline.py` exactly as the job builds
+them, with connectors swapped for datagen sources and blackhole sinks so the
+planner runs in a local environment without Kafka, S3 or connector jars.
+
+The optimized execution plan is reduced to an operator outline (operator
+names, scanned/written tables and exchange distributions) and compared with
+the snapshot in `tests/snapshots/`. A missing or different snapshot fails
+the test; set UPDATE_PLAN_SNAPSHOTS=1 to record it after an intended plan
+change and commit the result. Shuffle counts are also asserted directly, so
+an added Exchange fails with a readable message even while re-recording.
+"""
+
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import pytest
+from config import FlinkConfig
+from pipeline import create_backfill_statement_set, create_streaming_statement_set
+from pyflink.table import EnvironmentSettings, TableEnvironment
+
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+EXECUTION_PLAN_HEADER = "== Optimized Execution Plan =="
+
+SOURCE_OPTIONS = {
+    # Bounded so the dimension finishes and releases its watermark, as in the job
+    "postcode_dim": "'connector' = 'datagen', 'number-of-rows' = '10'",
+    # Batch mode only accepts bounded sources
+    "raw_archive": "'connector' = 'datagen', 'number-of-rows' = '10'",
+}
+DEFAULT_SOURCE_OPTIONS = "'connector' = 'datagen'"
+SINK_OPTIONS = {
+    # The backfill's INSERT OVERWRITE needs a sink that supports overwrites;
+    # explaining the plan writes nothing to the path
+    "agg_sink": "'connector' = 'filesystem', 'path' = 'file:///tmp/agg_sink', 'format' = 'csv'",
+}
+DEFAULT_SINK_OPTIONS = "'connector' = 'blackhole'"
+
+
+class LocalConnectorTableEnv:
+    """Table environment proxy that swaps connector options in CREATE TABLE DDL."""
+
+    def __init__(self, t_env: TableEnvironment):
+        """Wrap a real table environment."""
+        self._t_env = t_env
+
+    def execute_sql(self, sql: str) -> Any:
+        """Execute `sql`, replacing the WITH clause of CREATE TABLE statements."""
+        match = re.search(r"CREATE TABLE (\w+)", sql)
+        if match:
+            table = match.group(1)
+            if table.endswith("_sink"):
+                options = SINK_OPTIONS.get(table, DEFAULT_SINK_OPTIONS)
+            else:
+                options = SOURCE_OPTIONS.get(table, DEFAULT_SOURCE_OPTIONS)
+            sql = re.sub(r"WITH \(.*\)", f"WITH ({options})", sql, flags=re.S)
+        return self._t_env.execute_sql(sql)
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the wrapped environment."""
+        return getattr(self._t_env, name)
+
+
+def explain(streaming: bool, config: FlinkConfig) -> str:
+    """Build the job's statement set and return its optimized execution plan."""
+    settings = (
+        EnvironmentSettings.in_streaming_mode()
+        if streaming
+        else EnvironmentSettings.in_batch_mode()
+    )
+    t_env = TableEnvironment.create(settings)
+    t_env.get_config().set("parallelism.default", "2")
+    proxy: Any = LocalConnectorTableEnv(t_env)
+    build = create_streaming_statement_set if streaming else create_backfill_statement_set
+    plan = build(proxy, config).explain()
+    return plan.split(EXECUTION_PLAN_HEADER, 1)[1].strip()
+
+
+def outline(plan: str) -> list[str]:
+    """Reduce a plan to indented operator names, tables and exchange distributions.
+
+    Field lists, expressions and node ids vary across Flink versions and
+    trivial SQL edits; the outline keeps what the regression checks care
+    about: which tables are read, where data is shuffled, how operators
+    nest, and which subtree (`#n`) each `Reused` node shares.
+    """
+    lines = []
+    for line in plan.splitlines():
+        node = line.lstrip(" :+-")
+        if not node:
+            continue
+        depth = (len(line) - len(node)) // 3
+        name = re.match(r"\w+", node)
+        if name is None:
+            continue
+        # Scans print table=[[catalog, database, name, ...]], sinks table=[catalog.database.name]
+        table = re.search(r"table=\[\[?default_catalog[., ]+default_database[., ]+(\w+)", node)
+        distribution = re.search(r"distribution=\[(\w+(?:\[[^\]]*\])?)", node)
+        detail = table or distribution
+        label = f"{name.group(0)}({detail.group(1)})" if detail else name.group(0)
+        # Keep reuse ids so the outline shows which branches share a subtree
+        reuse = re.search(r"\((?:reuse|reference)_id=\[(\d+)\]\)$", node)
+        if reuse and name.group(0) == "Reused":
+            label = f"Reused(#{reuse.group(1)})"
+        elif reuse:
+            label += f" #{reuse.group(1)}"
+        lines.append("  " * depth + label)
+    return lines
+
+
+def inline_reused(plan: str) -> str:
+    """Replace each `Reused(reference_id=[n])` with the subtree it refers to.
+
+    Flink prints a shared subtree once, as its own block tagged `reuse_id`,
+    and refers to it elsewhere. Inlining gives every sink its full input chain.
+    """
+    blocks = {}
+    for block in plan.split("\n\n"):
+        match = re.search(r"\(reuse_id=\[(\d+)\]\)$", block.splitlines()[0])
+        if match:
+            blocks[match.group(1)] = block.splitlines()
+
+    def expand(lines: list[str]) -> list[str]:
+        expanded = []
+        for line in lines:
+            match = re.fullmatch(r"(.*)Reused\(reference_id=\[(\d+)\]\)", line)
+            if match is None:
+                expanded.append(line)
+                continue
+            prefix, indent = match.group(1), " " * len(match.group(1))
+            subtree = expand(blocks[match.group(2)])
+            expanded.append(prefix + subtree[0])
+            expanded.extend(indent + child for child in subtree[1:])
+        return expanded
+
+    return "\n".join(expand(plan.splitlines()))
+
+
+def shuffles(plan: str) -> Counter[str]:
+    """Count Exchange nodes by distribution; shared (reused) exchanges count once."""
+    return Counter(
+        line.strip()[len("Exchange(") : -1]
+        for line in outline(plan)
+        if line.strip().startswith("Exchange(")
+    )
+
+
+def parents(plan_lines: list[str], index: int) -> list[str]:
+    """Ancestors of the node at `index`, nearest first, following plan indentation."""
+    ancestors = []
+    depth = len(plan_lines[index]) - len(plan_lines[index].lstrip(" :+-"))
+    for line in reversed(plan_lines[:index]):
+        line_depth = len(line) - len(line.lstrip(" :+-"))
+        if line.strip() and line_depth < depth:
+            ancestors.append(line.lstrip(" :+-"))
+            depth = line_depth
+    return ancestors
+
+
+def check_snapshot(name: str, plan: str) -> None:
+    """Compare the plan outline with its snapshot, recording it when asked to."""
+    path = SNAPSHOT_DIR / f"{name}.txt"
+    actual = "\n".join(outline(plan)) + "\n"
+    if os.environ.get("UPDATE_PLAN_SNAPSHOTS") == "1":
+        SNAPSHOT_DIR.mkdir(exist_ok=True)
+        path.write_text(actual)
+        pytest.skip(f"Recorded plan snapshot {path.name}; commit it")
+    if not path.exists():
+        pytest.fail(f"Missing plan snapshot {path.name}; record it with UPDATE_PLAN_SNAPSHOTS=1")
+    assert actual == path.read_text(), (
+        f"Plan changed from {path.name}; re-run with UPDATE_PLAN_SNAPSHOTS=1 if intended"
+    )
+
+
+def scans(plan: str, table: str) -> list[int]:
+    """Line numbers of source scans of `table`."""
+    pattern = f"TableSourceScan(table=[[default_catalog, default_database, {table}"
+    return [i for i, line in enumerate(plan.splitlines()) if pattern in line]
+
+
+@pytest.fixture(scope="module")
+def streaming_plan() -> str:
+    """Optimized plan of the streaming job with every optional output enabled."""
+    return explain(streaming=True, config=FlinkConfig(agg_upsert_enabled=True))
+
+
+@pytest.fixture(scope="module")
+def backfill_plan() -> str:
+    """Optimized plan of the backfill job."""
+    config = FlinkConfig(
+        job_mode="backfill", backfill_start="2026-01-01 00", backfill_end="2026-01-01 23"
+    )
+    return explain(streaming=False, config=config)
+
+
+def test_single_kafka_scan(streaming_plan: str) -> None:
+    """Test that all INSERTs, valid and dead-lettered, share one read of the Kafka source."""
+    assert len(scans(streaming_plan, "pageviews")) == 1
+    assert len(scans(streaming_plan, "postcode_dim")) == 1
+
+
+def test_validation_runs_before_any_shuffle(streaming_plan: str) -> None:
+    """Test that the validation filter and projection sit directly on the source.
+
+    On every path from the source to a postcode shuffle (enrichment and
+    aggregation), the validation filter must be fused into a Calc below the
+    Exchange, so rejected rows and unused columns are never shuffled.
+    """
+    plan = inline_reused(streaming_plan)
+    lines = plan.splitlines()
+    checked = 0
+    for index in scans(plan, "pageviews"):
+        chain = []
+        for node in parents(lines, index):
+            if node.startswith(("Exchange", "Sink")):
+                break
+            chain.append(node)
+        else:
+            continue
+        if not node.startswith("Exchange(distribution=[hash[postcode]]"):
+            continue
+        calcs = [node for node in chain if node.startswith("Calc(") and "where=" in node]
+        assert calcs, f"No filtering Calc between the source and the shuffle: {chain}"
+        assert "REGEXP(postcode" in calcs[0]
+        checked += 1
+    assert checked, "No postcode shuffle fed by the Kafka source"
+
+
+def test_streaming_shuffles(streaming_plan: str) -> None:
+    """Test the number of shuffles per distribution in the streaming job.
+
+    Validated events are shuffled by postcode into the temporal join, and
+    separately into the early-fire aggregate, which reads them before the
+    join. The dimension is shuffled into its deduplication and again into the
+    join, rejections by reason, aggregates by their group key, and the
+    match-rate partials to a single task.
+    """
+    assert shuffles(streaming_plan) == {
+        "hash[postcode]": 4,
+        "hash[postcode, region, area_type]": 1,
+        "hash[reject_reason]": 1,
+        "single": 1,
+    }
+
+
+def test_streaming_plan_snapshot(streaming_plan: str) -> None:
+    """Test that sources, shuffles and operator nesting match the snapshot."""
+    check_snapshot("streaming_plan", streaming_plan)
+
+
+def test_backfill_single_archive_scan(backfill_plan: str) -> None:
+    """Test that the backfill reads the raw archive once."""
+    assert len(scans(backfill_plan, "raw_archive")) == 1
+
+
+def test_backfill_shuffles(backfill_plan: str) -> None:
+    """Test that the backfill shuffles both join inputs by postcode and aggregates once."""
+    assert shuffles(backfill_plan) == {
+        "hash[postcode]": 2,
+        "hash[window_start, window_end, postcode, region, area_type]": 1,
+    }
+
+
+def test_backfill_plan_snapshot(backfill_plan: str) -> None:
+    """Test that the backfill plan matches the snapshot."""
+    check_snapshot("backfill_plan", backfill_plan)
@@ -0,0 +1,42 @@
+"""Unit tests for the pipeline's user-defined functions."""
+
+from unittest.mock import MagicMock
+
+from src.sql.functions import EnrichmentMatchRate, RejectionCount
+
+
+def test_enrichment_match_rate_counts_windows() -> None:
+    """Test that each window's events and matches feed the metric counters."""
+    context = MagicMock()
+    group = context.get_metric_group.return_value.add_group.return_value
+    counters = {"events": MagicMock(), "matched": MagicMock()}
+    group.counter.side_effect = counters.get
+    function = EnrichmentMatchRate()
+    function.open(context)
+
+    assert function.eval(200, 150) == 0.75
+
+    context.get_metric_group.return_value.add_group.assert_called_once_with("enrichment")
+    counters["events"].inc.assert_called_once_with(200)
+    counters["matched"].inc.assert_called_once_with(150)
+
+
+def test_rejection_count_counts_per_reason() -> None:
+    """Test that each reason's window counts feed its own counter."""
+    context = MagicMock()
+    group = context.get_metric_group.return_value.add_group.return_value
+    counters = {"INVALID_POSTCODE": MagicMock(), "MISSING_USER_ID": MagicMock()}
+    group.add_group.side_effect = lambda key, reason: MagicMock(
+        counter=lambda name: counters[reason]
+    )
+    function = RejectionCount()
+    function.open(context)
+
+    assert function.eval("INVALID_POSTCODE", 3) == 3
+    assert function.eval("MISSING_USER_ID", 1) == 1
+    assert function.eval("INVALID_POSTCODE", 2) == 2
+
+    context.get_metric_group.return_value.add_group.assert_called_once_with("rejected")
+    assert group.add_group.call_count == 2
+    assert [c.args for c in counters["INVALID_POSTCODE"].inc.call_args_list] == [(3,), (2,)]
+    counters["MISSING_USER_ID"].inc.assert_called_once_with(1)
@@ -0,0 +1,63 @@
+"""Tests for SQL INSERT query generation."""
+
+from src.sql.inserts import (
+    insert_aggregated_sql,
+    insert_early_aggregated_sql,
+    insert_enrichment_stats_sql,
+    insert_rejected_events_sql,
+    insert_rejection_counts_sql,
+)
+
+
+def test_insert_aggregated_sql_window_size() -> None:
+    """Test that the tumbling window size is configurable."""
+    sql = insert_aggregated_sql(300)
+
+    assert "INSERT INTO agg_sink" in sql
+    assert "TUMBLE(TABLE enriched_events, DESCRIPTOR(ts), INTERVAL '300' SECOND)" in sql
+    assert "DATE_FORMAT(window_start, 'HH') AS event_hour" in sql
+    assert "GROUP BY window_start, window_end, postcode, region, area_type" in sql
+
+
+def test_insert_aggregated_sql_overwrite() -> None:
+    """Test that backfill mode overwrites agg_sink partitions."""
+    assert "INSERT OVERWRITE agg_sink" in insert_aggregated_sql(overwrite=True)
+
+
+def test_insert_early_aggregated_sql() -> None:
+    """Test that early counts use a cumulative window stepping at the fire interval."""
+    sql = insert_early_aggregated_sql(60, 10)
+
+    assert "INSERT INTO agg_upsert_sink" in sql
+    assert "CUMULATE(" in sql
+    assert "INTERVAL '10' SECOND,\n                INTERVAL '60' SECOND" in sql
+    assert "window_end AS counted_until" in sql
+
+
+def test_insert_enrichment_stats_sql() -> None:
+    """Test the per-window dimension match rate query."""
+    sql = insert_enrichment_stats_sql()
+
+    assert "INSERT INTO enrichment_stats_sink" in sql
+    assert "enrichment_match_rate(events, matched) AS match_rate" in sql
+    assert "region <> 'UNKNOWN' OR area_type <> 'UNKNOWN'" in sql
+    assert "GROUP BY window_start, window_end" in sql
+
+
+def test_insert_rejected_events_sql() -> None:
+    """Test that rejected events go to the DLQ with their reason."""
+    sql = insert_rejected_events_sql()
+
+    assert "INSERT INTO dlq_sink" in sql
+    assert "reject_reason" in sql
+    assert "FROM rejected_events" in sql
+
+
+def test_insert_rejection_counts_sql() -> None:
+    """Test per-reason counts over processing-time windows."""
+    sql = insert_rejection_counts_sql(60)
+
+    assert "INSERT INTO rejection_counts_sink" in sql
+    assert "DESCRIPTOR(proc_time),\n                    INTERVAL '60' SECOND" in sql
+    assert "GROUP BY window_start, window_end, reject_reason" in sql
+    assert "rejection_count(reject_reason, rejected) AS rejected_count" in sql
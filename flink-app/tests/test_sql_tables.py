@@ -2,7 +2,16 @@
 
 from unittest.mock import MagicMock
 
-from src.sql.tables import create_agg_sink, create_kafka_source, create_raw_sink
+from src.sql.tables import (
+    create_agg_sink,
+    create_agg_upsert_sink,
+    create_dlq_sink,
+    create_kafka_source,
+    create_postcode_dim_source,
+    create_raw_archive_source,
+    create_raw_sink,
+    create_rejection_counts_sink,
+)
 
 
 def test_create_kafka_source() -> None:
@@ -20,6 +29,44 @@ def test_create_kafka_source() -> None:
     assert "'connector' = 'kafka'" in call_args
     assert "'topic' = 'test-topic'" in call_args
     assert "'properties.bootstrap.servers' = 'localhost:9092'" in call_args
+    assert "'properties.isolation.level' = 'read_committed'" in call_args
+    assert "WATERMARK FOR ts AS ts - INTERVAL '5' SECOND" in call_args
+    assert "'json.ignore-parse-errors' = 'true'" in call_args
+    assert "'scan.startup.mode' = 'earliest-offset'" in call_args
+
+
+def test_create_kafka_source_startup_mode() -> None:
+    """Test that the startup mode parameter replaces the earliest-offset default."""
+    mock_t_env = MagicMock()
+
+    create_kafka_source(
+        mock_t_env, "localhost:9092", "test-topic", "test-group", startup_mode="group-offsets"
+    )
+
+    call_args = mock_t_env.execute_sql.call_args[0][0]
+    assert "'scan.startup.mode' = 'group-offsets'" in call_args
+    assert "earliest-offset" not in call_args
+
+
+def test_create_kafka_source_watermark_options() -> None:
+    """Test that watermark delay and extra source options reach the DDL."""
+    mock_t_env = MagicMock()
+
+    create_kafka_source(
+        mock_t_env,
+        "localhost:9092",
+        "test-topic",
+        "test-group",
+        watermark_delay_seconds=12,
+        options={"scan.watermark.idle-timeout": "30s"},
+    )
+
+    call_args = mock_t_env.execute_sql.call_args[0][0]
+    assert "WATERMARK FOR ts AS ts - INTERVAL '12' SECOND" in call_args
+    assert (
+        "'json.ignore-parse-errors' = 'true',\n            'scan.watermark.idle-timeout' = '30s'"
+        in call_args
+    )
 
 
 def test_create_raw_sink() -> None:
@@ -47,3 +94,58 @@ def test_create_agg_sink() -> None:
     assert "CREATE TABLE agg_sink" in call_args
     assert "'path' = 's3://agg-bucket'" in call_args
     assert "window_start TIMESTAMP(3)" in call_args
+    assert "region STRING" in call_args
+    assert "PARTITIONED BY (dt, event_hour)" in call_args
+
+
+def test_create_raw_archive_source() -> None:
+    """Test bounded raw archive source DDL generation."""
+    mock_t_env = MagicMock()
+
+    create_raw_archive_source(mock_t_env, "s3://raw-bucket")
+
+    call_args = mock_t_env.execute_sql.call_args[0][0]
+    assert "CREATE TABLE raw_archive" in call_args
+    assert "'path' = 's3://raw-bucket'" in call_args
+    assert "PARTITIONED BY (dt, event_hour)" in call_args
+
+
+def test_create_agg_upsert_sink() -> None:
+    """Test upsert-Kafka sink DDL generation."""
+    mock_t_env = MagicMock()
+
+    create_agg_upsert_sink(mock_t_env, "localhost:9092", "counts")
+
+    call_args = mock_t_env.execute_sql.call_args[0][0]
+    assert "CREATE TABLE agg_upsert_sink" in call_args
+    assert "'connector' = 'upsert-kafka'" in call_args
+    assert "'topic' = 'counts'" in call_args
+    assert "PRIMARY KEY (window_start, postcode) NOT ENFORCED" in call_args
+
+
+def test_create_postcode_dim_source() -> None:
+    """Test postcode dimension source DDL generation."""
+    mock_t_env = MagicMock()
+
+    create_postcode_dim_source(mock_t_env, "file:///dim/")
+
+    call_args = mock_t_env.execute_sql.call_args[0][0]
+    assert "CREATE TABLE postcode_dim" in call_args
+    assert "'path' = 'file:///dim/'" in call_args
+    assert "'format' = 'csv'" in call_args
+    assert "WATERMARK FOR valid_from AS valid_from" in call_args
+
+
+def test_create_dlq_sinks() -> None:
+    """Test DLQ and rejection count sink DDL generation."""
+    mock_t_env = MagicMock()
+
+    create_dlq_sink(mock_t_env, "s3://dlq-bucket/")
+    create_rejection_counts_sink(mock_t_env, "s3://dlq-bucket/")
+
+    dlq_ddl, counts_ddl = (call[0][0] for call in mock_t_env.execute_sql.call_args_list)
+    assert "CREATE TABLE dlq_sink" in dlq_ddl
+    assert "reject_reason STRING" in dlq_ddl
+    assert "'path' = 's3://dlq-bucket/events'" in dlq_ddl
+    assert "CREATE TABLE rejection_counts_sink" in counts_ddl
+    assert "'path' = 's3://dlq-bucket/counts'" in counts_ddl
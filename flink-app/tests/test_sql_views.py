@@ -0,0 +1,144 @@
+"""Tests for SQL view generation."""
+
+from pyflink.table import EnvironmentSettings, TableEnvironment
+from src.sql.views import (
+    create_backfill_source_view_sql,
+    create_checked_view_sql,
+    create_enriched_view_sql,
+    create_postcode_dim_view_sql,
+    create_rejected_view_sql,
+    create_validated_view_sql,
+)
+
+
+def test_create_backfill_source_view_sql() -> None:
+    """Test that the backfill view filters on partition columns only."""
+    sql = create_backfill_source_view_sql("2026-01-01 00", "2026-01-01 05")
+
+    assert "CREATE VIEW pageviews AS" in sql
+    assert "FROM raw_archive" in sql
+    assert "CONCAT(dt, ' ', event_hour) BETWEEN '2026-01-01 00' AND '2026-01-01 05'" in sql
+    assert "TO_TIMESTAMP_LTZ(`timestamp`, 3) AS ts" in sql
+
+
+def test_postcode_dim_view_is_versioned() -> None:
+    """Test that the dimension view keeps the latest row per postcode."""
+    sql = create_postcode_dim_view_sql()
+
+    assert "CREATE VIEW postcode_regions AS" in sql
+    assert "PARTITION BY postcode ORDER BY valid_from DESC" in sql
+    assert "WHERE row_num = 1" in sql
+
+
+def test_enriched_view_uses_temporal_join_when_streaming() -> None:
+    """Test the event-time temporal join and the UNKNOWN fallback."""
+    sql = create_enriched_view_sql()
+
+    assert "FROM validated_events AS e" in sql
+    assert "FOR SYSTEM_TIME AS OF e.ts" in sql
+    assert "COALESCE(d.region, 'UNKNOWN') AS region" in sql
+
+
+def test_enriched_view_uses_validity_ranges_in_batch() -> None:
+    """Test that backfill mode avoids the streaming-only temporal join."""
+    sql = create_enriched_view_sql(batch=True)
+
+    assert "LEAD(valid_from_ms) OVER (PARTITION BY postcode ORDER BY valid_from_ms)" in sql
+    assert "AND (d.valid_to_ms IS NULL OR e.`timestamp` < d.valid_to_ms)" in sql
+    assert "FOR SYSTEM_TIME" not in sql
+
+
+def test_batch_enrichment_uses_version_valid_at_event_time() -> None:
+    """Test that a backfill joins each event to the dimension version of its time."""
+    t_env = TableEnvironment.create(EnvironmentSettings.in_batch_mode())
+    t_env.execute_sql("""
+        CREATE TEMPORARY VIEW postcode_dim AS
+        SELECT * FROM (VALUES
+            ('SW19', 'London', 'Suburban', CAST(1000 AS BIGINT)),
+            ('SW19', 'Greater London', 'Urban', CAST(5000 AS BIGINT))
+        ) AS t(postcode, region, area_type, valid_from_ms)
+    """)
+    t_env.execute_sql("""
+        CREATE TEMPORARY VIEW validated_events AS
+        SELECT
+            1 AS user_id,
+            postcode,
+            'https://www.website.com/index.html' AS webpage,
+            ms AS `timestamp`,
+            TO_TIMESTAMP_LTZ(ms, 3) AS ts,
+            '1970-01-01' AS dt,
+            '00' AS event_hour
+        FROM (VALUES
+            ('SW19', CAST(0 AS BIGINT)),
+            ('SW19', CAST(1000 AS BIGINT)),
+            ('SW19', CAST(4999 AS BIGINT)),
+            ('SW19', CAST(5000 AS BIGINT)),
+            ('N1', CAST(6000 AS BIGINT))
+        ) AS t(postcode, ms)
+    """)
+    t_env.execute_sql(create_enriched_view_sql(batch=True))
+
+    with t_env.execute_sql(
+        "SELECT postcode, `timestamp`, region, area_type FROM enriched_events"
+    ).collect() as results:
+        rows = sorted((row[0], row[1], row[2], row[3]) for row in results)
+
+    assert rows == [
+        ("N1", 6000, "UNKNOWN", "UNKNOWN"),
+        ("SW19", 0, "UNKNOWN", "UNKNOWN"),
+        ("SW19", 1000, "London", "Suburban"),
+        ("SW19", 4999, "London", "Suburban"),
+        ("SW19", 5000, "Greater London", "Urban"),
+    ]
+
+
+def test_checked_view_applies_pageview_event_rules() -> None:
+    """Test that every PageviewEvent rule has a reason code."""
+    sql = create_checked_view_sql()
+
+    assert "FROM pageviews" in sql
+    assert "CHAR_LENGTH(postcode) NOT BETWEEN 2 AND 10" in sql
+    assert "REGEXP(postcode, '[^A-Z0-9]')" in sql
+    assert "REGEXP(webpage, '^https?://.+')" in sql
+    assert "`timestamp` < 946684800000 OR `timestamp` > 4102444800000" in sql
+    for reason in ("USER_ID", "POSTCODE", "WEBPAGE", "TIMESTAMP"):
+        assert f"'MISSING_{reason}'" in sql
+        assert f"'INVALID_{reason}'" in sql
+
+
+def test_checked_view_rejects_postcode_with_trailing_newline() -> None:
+    """Test that postcodes are validated like PageviewEvent, newline included."""
+    t_env = TableEnvironment.create(EnvironmentSettings.in_batch_mode())
+    t_env.execute_sql("""
+        CREATE TEMPORARY VIEW pageviews AS
+        SELECT
+            1 AS user_id,
+            postcode,
+            'https://www.website.com/index.html' AS webpage,
+            CAST(1735732800000 AS BIGINT) AS `timestamp`,
+            TO_TIMESTAMP_LTZ(1735732800000, 3) AS ts
+        FROM (VALUES ('SW19'), ('SW19' || CHR(10)), ('E'), ('sw19'), ('ABCDEFGHIJK'))
+            AS t(postcode)
+    """)
+    t_env.execute_sql(create_checked_view_sql())
+
+    with t_env.execute_sql("SELECT postcode, reject_reason FROM checked_events").collect() as rows:
+        reasons = {row[0]: row[1] for row in rows}
+
+    assert reasons == {
+        "SW19": None,
+        "SW19\n": "INVALID_POSTCODE",
+        "E": "INVALID_POSTCODE",
+        "sw19": "INVALID_POSTCODE",
+        "ABCDEFGHIJK": "INVALID_POSTCODE",
+    }
+
+
+def test_validated_and_rejected_views_split_checked_events() -> None:
+    """Test that both views read the checked view with complementary filters."""
+    validated = create_validated_view_sql()
+    rejected = create_rejected_view_sql()
+
+    assert "FROM checked_events\n        WHERE reject_reason IS NULL" in validated
+    assert "FROM checked_events\n        WHERE reject_reason IS NOT NULL" in rejected
+    assert "PROCTIME() AS proc_time" in rejected
@@ -44,14 +44,14 @@ MAIN_DEPS = get_main_deps()
 def lint(session: nox.Session) -> None:
     """Run ruff linter and fix safe issues."""
     session.install("ruff")
-    session.run("ruff", "check", "--fix", "src/", "tests/", "flink-app/")
+    session.run("ruff", "check", "--fix", "src/", "tests/", "benchmarks/", "flink-app/")
 
 
 @nox.session(python=python_versions)
 def format(session: nox.Session) -> None:
     """Format code with ruff."""
     session.install("ruff")
-    session.run("ruff", "format", "src/", "tests/", "flink-app/")
+    session.run("ruff", "format", "src/", "tests/", "benchmarks/", "flink-app/")
 
 
 @nox.session(python=python_versions)
@@ -1,7 +1,27 @@
-"""Common utilities package."""
+"""Common utilities package.
 
-from src.common.config import PipelineConfig
-from src.common.logging import setup_logging
-from src.common.schemas import AggregatedResult, PageviewEvent
+Exports are resolved lazily so that importing one submodule (e.g. metrics) does
+not pull in pydantic, pydantic-settings and loguru at process start.
+"""
+
+from typing import TYPE_CHECKING
+
+from src.common.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.common.config import PipelineConfig
+    from src.common.logging import setup_logging
+    from src.common.schemas import AggregatedResult, PageviewEvent
+
+_EXPORTS = {
+    "PipelineConfig": "src.common.config",
+    "setup_logging": "src.common.logging",
+    "PageviewEvent": "src.common.schemas",
+    "AggregatedResult": "src.common.schemas",
+}
 
 __all__ = ["PipelineConfig", "setup_logging", "PageviewEvent", "AggregatedResult"]
+
+
+# Exported names are imported on first access
+__getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -1,5 +1,7 @@
 """Configuration management using Pydantic settings."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -28,12 +30,64 @@ class PipelineConfig(BaseSettings):
     window_size_seconds: int = 60
     checkpoint_interval_ms: int = 60000
     parallelism: int = 2
+    watermark_delay_seconds: int = 5
+    allowed_lateness_seconds: int = 0  # Added to the watermark delay, as in the Flink job
 
     # Data Generator
     event_rate: float = 1.16  # Events per second (~100K/day)
+    load_profile: str = "constant"  # constant, sine, spike or ramp
+    control_enabled: bool = False  # Serve unauthenticated /control on the metrics port
+    session_users: int = 0  # Simulated users browsing in sessions (0 = stateless)
+    session_mean_think_seconds: float = 10.0
+
+    # Producer delivery: ordered (blocking), idempotent or transactional
+    producer_mode: Literal["ordered", "idempotent", "transactional"] = "ordered"
+    producer_linger_ms: int = 5  # Batching delay for idempotent/transactional sends
+    transactional_id: str | None = None  # Defaults to pageview-producer-<hostname>
+    transaction_batch_size: int = 500  # Events per transaction
+    transaction_max_ms: int = 1000  # Commit at least this often
+
+    # Adaptive rate control (AIMD) below the target rate
+    adaptive_rate_enabled: bool = False
+    aimd_increase_fraction: float = 0.05  # Additive step, as a fraction of the target
+    aimd_decrease_factor: float = 0.5  # Multiplicative cut under pressure
+    aimd_latency_threshold_ms: float = 500.0
+    aimd_queue_time_threshold_ms: float = 100.0
+    aimd_error_threshold: float = 0.01  # Error ratio per interval
+    aimd_interval_seconds: float = 1.0
+
+    # Reference Engine (local, Flink-free mode)
+    reference_output_dir: str = "./reference-output"
+    reference_metrics_port: int = 9092  # Rejection counters (generator uses metrics_port)
+    reference_postcode_dim_path: str = "./flink-app/data/postcode_dim/"  # Same CSVs as Flink
+
+    # Reconciliation of raw_sink rows against agg_sink counts
+    reconcile_raw_path: str = ""  # Defaults to s3://<raw_events_bucket>
+    reconcile_aggregated_path: str = ""  # Defaults to s3://<aggregated_bucket>
+    reconcile_state_dir: str = "./reconciliation-state"  # Manifest and per-partition counts
+    reconcile_require_success: bool = True  # Only read partitions with a _SUCCESS file
+    reconcile_commit_delay_seconds: int = 300  # Otherwise, commit this long after the hour
+    reconcile_seal_after_seconds: int = 7200  # Stop listing partitions committed this long ago
+
+    # Continuous profiling of the producer loop (SIGUSR1 dumps full profiles to profile_dir)
+    profiling_enabled: bool = False
+    profile_dir: str = "./profiles"
+    profile_sample_interval_ms: int = 20  # Stack sampling period
+    profile_summary_interval_seconds: float = 60.0  # Hot function metric refresh
+    # tracemalloc slows the loop 6-10x, so it only runs for a capture after each dump
+    profile_tracemalloc_frames: int = 0  # Frames per allocation (0 = no memory capture)
+    profile_memory_capture_seconds: float = 10.0  # Tracing time before the memory snapshot
 
     # Monitoring
     metrics_port: int = 9090
     log_level: str = "INFO"
+    log_enqueue: bool = False  # Write logs from a background thread
+    log_json: bool = False  # One JSON object per record
+    log_sample_per_second: int = 10  # Cap for sampled hot-path messages
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+
+    @property
+    def watermark_bound_seconds(self) -> int:
+        """Watermark delay including allowed lateness, the bound the Flink job uses."""
+        return self.watermark_delay_seconds + self.allowed_lateness_seconds
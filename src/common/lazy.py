@@ -0,0 +1,27 @@
+"""Lazy package exports, so importing a package does not import its heavy submodules."""
+
+import sys
+from collections.abc import Callable
+from importlib import import_module
+from typing import Any
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> Callable[[str], Any]:
+    """Build a module `__getattr__` that imports exported names on first access.
+
+    Args:
+        package: `__name__` of the package defining the exports
+        exports: Exported name -> module that defines it
+
+    Returns:
+        Function to assign to the package's `__getattr__`
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(exports[name]), name)
+        setattr(sys.modules[package], name, value)  # Later lookups skip __getattr__
+        return value
+
+    return __getattr__
@@ -1,17 +1,27 @@
 """Structured logging configuration using loguru."""
 
+import atexit
+import queue
 import sys
-from typing import Any
+import threading
+import time
+from typing import Any, TextIO
 
 from loguru import logger
 
 
-def setup_logging(service_name: str, level: str = "INFO") -> Any:
+def setup_logging(
+    service_name: str, level: str = "INFO", enqueue: bool = False, serialize: bool = False
+) -> Any:
     """Configure structured logging with JSON output for CloudWatch compatibility.
 
     Args:
         service_name: Name of the service for log context
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        enqueue: Format records on the calling thread but write them to stdout
+            from a background thread, so a slow log consumer never blocks the caller
+            (records are dropped and counted while the writer's queue is full)
+        serialize: Emit one JSON object per record
 
     Returns:
         Configured loguru logger instance
@@ -20,16 +30,155 @@ def setup_logging(service_name: str, level: str = "INFO") -> Any:
     logger.remove()
 
     # Add JSON-formatted handler for production
+    writer = BackgroundWriter(sys.stdout) if enqueue else None
     logger.add(
-        sys.stdout,
+        writer or sys.stdout,
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}",
+        filter=writer.report_dropped if writer else None,
         level=level.upper(),
-        serialize=False,  # Set to True for JSON output in production
+        serialize=serialize,
         backtrace=True,
-        diagnose=True,
+        diagnose=not serialize,  # Variable dumps bloat JSON records and may leak values
     )
 
     # Add service context to all logs
     configured_logger = logger.bind(service=service_name)
 
     return configured_logger
+
+
+class BackgroundWriter:
+    """File-like loguru sink that hands formatted records to a daemon writer thread.
+
+    Unlike loguru's own `enqueue=True`, records are not pickled (the queue is
+    in-process), so the caller pays only for formatting and a queue put.
+    The queue is bounded: while it is full, records are dropped and counted
+    rather than held in memory, and with `report_dropped` installed as the
+    sink's filter the next record carries the number dropped since the
+    previous report as `dropped`. Pending records are drained when the sink
+    is removed or at interpreter exit.
+
+    Attributes:
+        dropped: Records dropped because the queue was full
+    """
+
+    def __init__(self, stream: TextIO, max_pending: int = 10000):
+        """Start the writer thread.
+
+        Args:
+            stream: Stream the writer thread writes to
+            max_pending: Records queued before further ones are dropped
+        """
+        self._stream = stream
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self._unreported = 0
+        self._thread = threading.Thread(target=self._drain, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def write(self, message: str) -> None:
+        """Queue a formatted record, or drop it if the queue is full."""
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # A dropped record also loses the count it was carrying
+            record = getattr(message, "record", None)
+            carried = record["extra"].get("dropped", 0) if record else 0
+            with self._lock:
+                self.dropped += 1
+                self._unreported += 1 + carried
+
+    def report_dropped(self, record: dict[str, Any]) -> bool:
+        """Loguru filter adding the records dropped since the last report as `dropped`."""
+        with self._lock:
+            unreported, self._unreported = self._unreported, 0
+        if unreported:
+            record["extra"]["dropped"] = unreported
+        return True
+
+    def stop(self) -> None:
+        """Flush pending records and stop the writer thread (idempotent)."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        atexit.unregister(self.stop)
+
+    def _drain(self) -> None:
+        while (message := self._queue.get()) is not None:
+            self._stream.write(message)
+            if self._queue.empty():
+                self._stream.flush()
+        self._stream.flush()
+
+
+def level_enabled(configured_level: str, level: str) -> bool:
+    """Check whether records at `level` pass a sink configured at `configured_level`.
+
+    Hot paths should check this once and skip the log call entirely, since
+    loguru still builds the record (frame lookup, kwargs) before filtering it.
+
+    Args:
+        configured_level: Level the sink was configured with
+        level: Level of the prospective log call
+
+    Returns:
+        True if the record would be emitted
+    """
+    return logger.level(level.upper()).no >= logger.level(configured_level.upper()).no
+
+
+class RateLimitedLogger:
+    """Sample hot-path log messages down to a fixed number per interval (thread-safe).
+
+    Messages over the limit are dropped and counted; the next emitted message
+    carries the number suppressed since the previous one as `suppressed`.
+
+    Attributes:
+        logger: Underlying loguru logger
+        max_per_interval: Messages allowed per interval
+        interval_seconds: Length of the sampling interval
+    """
+
+    def __init__(self, logger: Any, max_per_interval: int = 1, interval_seconds: float = 1.0):
+        """Initialize the rate-limited logger.
+
+        Args:
+            logger: Loguru logger to forward to
+            max_per_interval: Messages allowed per interval (default: 1)
+            interval_seconds: Interval length in seconds (default: 1.0)
+        """
+        self.logger = logger
+        self.max_per_interval = max_per_interval
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()  # Also called from kafka-python's sender thread
+        self._window_start = float("-inf")
+        self._emitted = 0
+        self._suppressed = 0
+
+    def log(self, level: str, message: str, **kwargs: Any) -> bool:
+        """Log `message` unless this interval's budget is spent.
+
+        Args:
+            level: Loguru level name
+            message: Log message
+            **kwargs: Structured context forwarded to loguru
+
+        Returns:
+            True if the message was emitted
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.interval_seconds:
+                self._window_start = now
+                self._emitted = 0
+
+            if self._emitted >= self.max_per_interval:
+                self._suppressed += 1
+                return False
+
+            self._emitted += 1
+            suppressed, self._suppressed = self._suppressed, 0
+        self.logger.opt(depth=1).log(level, message, suppressed=suppressed, **kwargs)
+        return True
@@ -1,6 +1,9 @@
 """Prometheus metrics definitions for pipeline monitoring."""
 
-from prometheus_client import Counter, start_http_server
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
 # Producer metrics
 events_generated = Counter("pageview_events_generated_total", "Total pageview events generated")
@@ -8,12 +11,67 @@ events_published = Counter(
     "pageview_events_published_total", "Events successfully published to Kafka"
 )
 publish_errors = Counter("pageview_publish_errors_total", "Kafka publish errors")
+transactions_committed = Counter(
+    "pageview_transactions_committed_total", "Kafka transactions committed (transactional mode)"
+)
+transactions_aborted = Counter(
+    "pageview_transactions_aborted_total", "Kafka transactions aborted (transactional mode)"
+)
+target_event_rate = Gauge(
+    "pageview_target_event_rate", "Target events per second (0 while paused, after load profile)"
+)
+effective_event_rate = Gauge(
+    "pageview_effective_event_rate", "Send rate chosen by adaptive (AIMD) rate control"
+)
+publish_latency = Histogram(
+    "pageview_publish_latency_seconds",
+    "Time from send to broker acknowledgement",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# Reference engine metrics
+rejected_events = Counter(
+    "pageview_rejected_events_total", "Events rejected by validation", ["reason"]
+)
+
+# Profiling metrics (only updated while profiling is enabled)
+profile_samples = Counter("pageview_profile_samples_total", "Stack samples taken by the profiler")
+profile_overhead = Counter(
+    "pageview_profile_overhead_seconds_total", "Time spent sampling stacks and snapshotting memory"
+)
+profile_hot_functions = Gauge(
+    "pageview_profile_hot_function_ratio",
+    "Share of recent stack samples with this function on top (top functions only)",
+    ["function"],
+)
+traced_memory = Gauge("pageview_traced_memory_bytes", "Python heap traced by tracemalloc", ["kind"])
+memory_growth = Gauge(
+    "pageview_memory_growth_bytes",
+    "Allocations made during the last memory capture and still alive (top sites only)",
+    ["location"],
+)
+gc_pause = Histogram(
+    "pageview_gc_pause_seconds",
+    "Garbage collection pause time",
+    ["generation"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
 
 
-def start_metrics_server(port: int = 9090) -> None:
+def start_metrics_server(
+    port: int = 9090, handler: type[BaseHTTPRequestHandler] | None = None
+) -> None:
     """Start Prometheus metrics HTTP server.
 
     Args:
         port: Port number for metrics endpoint (default: 9090)
+        handler: Optional handler class extending `prometheus_client.MetricsHandler`
+            with extra endpoints (e.g. generator rate control)
     """
-    start_http_server(port)
+    if handler is None:
+        start_http_server(port)
+        return
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
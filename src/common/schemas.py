@@ -51,12 +51,16 @@ class AggregatedResult(BaseModel):
 
     Attributes:
         postcode: Postcode for this aggregation
+        region: Region of the postcode ('UNKNOWN' if not in the dimension)
+        area_type: Area type of the postcode ('UNKNOWN' if not in the dimension)
         window_start: Start datetime of the 1-minute window
         window_end: End datetime of the 1-minute window
         pageview_count: Total number of pageviews in this window
     """
 
     postcode: str
+    region: str = "UNKNOWN"
+    area_type: str = "UNKNOWN"
     window_start: datetime
     window_end: datetime
     pageview_count: int = Field(..., ge=0)
@@ -1,6 +1,20 @@
 """Data generator package."""
 
-from src.data_generator.generator import PageviewGenerator
-from src.data_generator.producer import PageviewProducer
+from typing import TYPE_CHECKING
+
+from src.common.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.data_generator.generator import PageviewGenerator
+    from src.data_generator.producer import PageviewProducer
+
+_EXPORTS = {
+    "PageviewGenerator": "src.data_generator.generator",
+    "PageviewProducer": "src.data_generator.producer",
+}
 
 __all__ = ["PageviewGenerator", "PageviewProducer"]
+
+
+# Exported names are imported on first access (the producer pulls in kafka-python)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,109 @@
+"""Adaptive (AIMD) send-rate control driven by Kafka publish feedback."""
+
+import threading
+import time
+from collections.abc import Callable
+
+from src.common.metrics import effective_event_rate
+
+
+class AimdRateLimiter:
+    """Additive-increase / multiplicative-decrease send rate, capped by a target.
+
+    Publish outcomes are accumulated over an adjustment interval. At the end of
+    each interval with at least one completed publish, the rate is cut by `decrease_factor` if any pressure signal
+    crossed its threshold (mean publish latency, producer queue time or error
+    ratio), otherwise raised by `increase_fraction` of the ceiling.
+
+    Attributes:
+        ceiling: Callable returning the configured target rate (0 while paused)
+        rate: Current adaptive rate before the ceiling is applied
+    """
+
+    def __init__(
+        self,
+        ceiling: Callable[[], float],
+        queue_time_ms: Callable[[], float] | None = None,
+        increase_fraction: float = 0.05,
+        decrease_factor: float = 0.5,
+        latency_threshold_ms: float = 500.0,
+        queue_time_threshold_ms: float = 100.0,
+        error_threshold: float = 0.01,
+        interval_seconds: float = 1.0,
+        min_rate: float = 0.1,
+    ):
+        """Initialize the limiter at the ceiling rate.
+
+        Args:
+            ceiling: Target rate source (e.g. `RateController.current_rate`)
+            queue_time_ms: Optional source of mean time records wait in the
+                producer's accumulator before being sent
+            increase_fraction: Additive step as a fraction of the ceiling
+            decrease_factor: Multiplier applied under pressure
+            latency_threshold_ms: Mean publish latency that counts as pressure
+            queue_time_threshold_ms: Accumulator queue time that counts as pressure
+            error_threshold: Error ratio that counts as pressure
+            interval_seconds: Adjustment interval
+            min_rate: Floor so the producer keeps probing the broker
+        """
+        self.ceiling = ceiling
+        self.queue_time_ms = queue_time_ms
+        self.increase_fraction = increase_fraction
+        self.decrease_factor = decrease_factor
+        self.latency_threshold_ms = latency_threshold_ms
+        self.queue_time_threshold_ms = queue_time_threshold_ms
+        self.error_threshold = error_threshold
+        self.interval_seconds = interval_seconds
+        self.min_rate = min_rate
+
+        self._lock = threading.Lock()
+        self.rate = max(ceiling(), min_rate)
+        self._interval_start = time.monotonic()
+        self._successes = 0
+        self._errors = 0
+        self._latency_total_ms = 0.0
+
+    def record_success(self, latency_seconds: float) -> None:
+        """Record an acknowledged publish and its latency."""
+        with self._lock:
+            self._successes += 1
+            self._latency_total_ms += latency_seconds * 1000
+
+    def record_error(self) -> None:
+        """Record a failed or timed-out publish."""
+        with self._lock:
+            self._errors += 1
+
+    def current_rate(self) -> float:
+        """Effective send rate, adjusting first if an interval has elapsed."""
+        ceiling = self.ceiling()
+        with self._lock:
+            if ceiling > 0:
+                # At low rates an interval stays open until at least one publish completes
+                elapsed = time.monotonic() - self._interval_start
+                if elapsed >= self.interval_seconds and (self._successes or self._errors):
+                    self._adjust(ceiling)
+                # A lowered target caps the rate immediately; a pause keeps it
+                self.rate = min(self.rate, ceiling)
+            rate = min(self.rate, ceiling)
+        effective_event_rate.set(rate)
+        return rate
+
+    def _pressure(self) -> bool:
+        total = self._successes + self._errors
+        if total and self._errors / total > self.error_threshold:
+            return True
+        if self._successes and self._latency_total_ms / self._successes > self.latency_threshold_ms:
+            return True
+        return bool(self.queue_time_ms and self.queue_time_ms() > self.queue_time_threshold_ms)
+
+    def _adjust(self, ceiling: float) -> None:
+        if self._pressure():
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        else:
+            self.rate = min(ceiling, self.rate + self.increase_fraction * ceiling)
+
+        self._interval_start = time.monotonic()
+        self._successes = 0
+        self._errors = 0
+        self._latency_total_ms = 0.0
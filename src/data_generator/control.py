@@ -0,0 +1,177 @@
+"""Runtime rate control for the data generator, served next to Prometheus metrics."""
+
+import json
+import math
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from prometheus_client import MetricsHandler
+
+from src.common.metrics import target_event_rate
+
+# Load profiles map seconds since the profile was selected to a rate multiplier
+LOAD_PROFILES: dict[str, Callable[[float], float]] = {
+    "constant": lambda t: 1.0,
+    # +/-50% around the target over a 5 minute period
+    "sine": lambda t: 1.0 + 0.5 * math.sin(2 * math.pi * t / 300),
+    # 5x the target for 10 seconds of every minute
+    "spike": lambda t: 5.0 if t % 60 < 10 else 1.0,
+    # Linear ramp from 0 to the target over 5 minutes, then hold
+    "ramp": lambda t: min(1.0, t / 300),
+}
+
+
+class RateController:
+    """Thread-safe target rate, pause state and load profile for the generator.
+
+    The HTTP control handler mutates it; `PageviewGenerator.generate_stream`
+    reads `current_rate` on every scheduling tick.
+
+    Attributes:
+        target_rate: Base events per second before the load profile is applied
+        paused: Whether event generation is paused
+        profile: Name of the active load profile
+    """
+
+    def __init__(self, target_rate: float, profile: str = "constant"):
+        """Initialize the controller.
+
+        Args:
+            target_rate: Base events per second
+            profile: Initial load profile (see LOAD_PROFILES)
+
+        Raises:
+            ValueError: If the rate is negative or the profile is unknown
+        """
+        self._lock = threading.Lock()
+        self.target_rate = 0.0
+        self.paused = False
+        self.profile = "constant"
+        self._profile_started = time.monotonic()
+        self.set_rate(target_rate)
+        self.set_profile(profile)
+
+    def set_rate(self, rate: float) -> None:
+        """Set the base target rate in events per second."""
+        if rate < 0 or not math.isfinite(rate):
+            raise ValueError(f"Invalid event rate: {rate}")
+        with self._lock:
+            self.target_rate = rate
+        self.current_rate()  # Refresh the target rate gauge
+
+    def set_profile(self, name: str) -> None:
+        """Switch load profile; the profile clock restarts at zero."""
+        if name not in LOAD_PROFILES:
+            raise ValueError(f"Unknown load profile: {name} (choose from {sorted(LOAD_PROFILES)})")
+        with self._lock:
+            self.profile = name
+            self._profile_started = time.monotonic()
+        self.current_rate()  # Refresh the target rate gauge
+
+    def pause(self) -> None:
+        """Stop generating events until resumed."""
+        with self._lock:
+            self.paused = True
+        self.current_rate()  # Refresh the target rate gauge
+
+    def resume(self) -> None:
+        """Resume event generation."""
+        with self._lock:
+            self.paused = False
+        self.current_rate()  # Refresh the target rate gauge
+
+    def current_rate(self) -> float:
+        """Effective events per second right now (0 while paused).
+
+        Also refreshes the target rate gauge, since profiles vary over time.
+        """
+        with self._lock:
+            if self.paused:
+                rate = 0.0
+            else:
+                elapsed = time.monotonic() - self._profile_started
+                rate = self.target_rate * LOAD_PROFILES[self.profile](elapsed)
+        target_event_rate.set(rate)
+        return rate
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current control state as a JSON-serializable dict."""
+        current = self.current_rate()
+        with self._lock:
+            return {
+                "target_rate": self.target_rate,
+                "current_rate": current,
+                "paused": self.paused,
+                "profile": self.profile,
+                "profiles": sorted(LOAD_PROFILES),
+            }
+
+
+class ControlHandler(MetricsHandler):
+    """Prometheus metrics handler extended with `/control` endpoints.
+
+    Endpoints:
+        GET  /control                    Current state
+        POST /control/rate?value=<eps>   Set target events per second
+        POST /control/pause              Pause generation
+        POST /control/resume             Resume generation
+        POST /control/profile?name=<p>   Switch load profile
+        GET  anything else               Prometheus metrics
+    """
+
+    controller: RateController
+
+    def do_GET(self) -> None:
+        """Serve control state on `/control`, metrics everywhere else."""
+        if urlparse(self.path).path == "/control":
+            self._reply(200, self.controller.snapshot())
+        else:
+            super().do_GET()
+
+    def do_POST(self) -> None:
+        """Apply a control action and reply with the new state."""
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        actions: dict[str, Callable[[], None]] = {
+            "/control/rate": lambda: self.controller.set_rate(float(params["value"])),
+            "/control/pause": self.controller.pause,
+            "/control/resume": self.controller.resume,
+            "/control/profile": lambda: self.controller.set_profile(params["name"]),
+        }
+
+        action = actions.get(url.path)
+        if action is None:
+            self._reply(404, {"error": f"Unknown endpoint: {url.path}"})
+            return
+        try:
+            action()
+        except KeyError as e:
+            self._reply(400, {"error": f"Missing query parameter: {e.args[0]}"})
+            return
+        except ValueError as e:
+            self._reply(400, {"error": str(e)})
+            return
+        self._reply(200, self.controller.snapshot())
+
+    def _reply(self, status: int, body: dict[str, Any]) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def make_control_handler(controller: RateController) -> type[ControlHandler]:
+    """Build a `ControlHandler` class bound to `controller`.
+
+    Args:
+        controller: Controller shared with the running producer
+
+    Returns:
+        Handler class for `start_metrics_server`
+    """
+    return type("ControlHandler", (ControlHandler,), {"controller": controller})
@@ -2,13 +2,17 @@
 
 import random
 import time
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from datetime import datetime
-from typing import Any
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
 
-from faker import Faker
+from src.data_generator.sessions import SessionSimulator
 
-from src.common.schemas import PageviewEvent
+if TYPE_CHECKING:
+    from faker import Faker
+
+    from src.common.schemas import PageviewEvent
 
 
 class PageviewGenerator:
@@ -17,18 +21,27 @@ class PageviewGenerator:
     Attributes:
         postcodes: List of possible postcodes
         urls: List of possible webpage URLs
-        faker: Faker instance for generating realistic data
+        faker: Faker instance for generating realistic data (created on first use)
+        sessions: Session simulator, or None for stateless uniform users
+        session_start_ms: Wall-clock time (epoch ms) of simulated time zero
     """
 
-    def __init__(self, postcodes: list[str] | None = None, urls: list[str] | None = None):
+    def __init__(
+        self,
+        postcodes: list[str] | None = None,
+        urls: list[str] | None = None,
+        session_users: int | None = None,
+        mean_think_seconds: float = 10.0,
+    ):
         """Initialize the pageview generator.
 
         Args:
             postcodes: List of postcodes to use (defaults to UK postcodes)
             urls: List of URLs to use (defaults to sample website pages)
+            session_users: Simulate this many stateful users browsing in sessions
+                (None = draw user_id uniformly from 1-100000 per event)
+            mean_think_seconds: Mean gap between pageviews within a session
         """
-        self.faker = Faker()
-
         # Default UK postcodes with realistic distribution
         self.postcodes = postcodes or [
             "SW19",
@@ -57,6 +70,25 @@ class PageviewGenerator:
             "https://www.website.com/blog.html",
         ]
 
+        self.sessions = (
+            SessionSimulator(
+                session_users,
+                self._zipf_weights(len(self.postcodes)),
+                self._url_weights(),
+                mean_think_seconds=mean_think_seconds,
+            )
+            if session_users
+            else None
+        )
+        self.session_start_ms = int(time.time() * 1000)
+
+    @cached_property
+    def faker(self) -> "Faker":
+        """Faker instance, built lazily since importing Faker is expensive."""
+        from faker import Faker
+
+        return Faker()
+
     def _zipf_weights(self, n: int, alpha: float = 1.5) -> list[float]:
         """Generate Zipf distribution weights.
 
@@ -82,9 +114,22 @@ class PageviewGenerator:
     def generate_event(self) -> dict[str, Any]:
         """Generate a single pageview event.
 
+        In session mode the timestamp follows the simulated clock from
+        `session_start_ms`, so think and idle gaps show up in event time at
+        their simulated length whatever the send rate.
+
         Returns:
             Dictionary containing pageview event data
         """
+        if self.sessions:
+            user_id, postcode, page = self.sessions.next_event()
+            return {
+                "user_id": user_id,
+                "postcode": self.postcodes[postcode],
+                "webpage": self.urls[page],
+                "timestamp": self.session_start_ms + self.sessions.now_ms,
+            }
+
         return {
             "user_id": random.randint(1, 100000),
             "postcode": random.choices(
@@ -94,33 +139,64 @@ class PageviewGenerator:
             "timestamp": int(datetime.now().timestamp() * 1000),
         }
 
-    def generate_validated_event(self) -> PageviewEvent:
+    def generate_validated_event(self) -> "PageviewEvent":
         """Generate and validate a pageview event.
 
         Returns:
             Validated PageviewEvent instance
         """
+        from src.common.schemas import PageviewEvent
+
         event_data = self.generate_event()
         return PageviewEvent(**event_data)
 
     def generate_stream(
-        self, rate: float = 1.16, duration_seconds: int | None = None
+        self,
+        rate: float = 1.16,
+        duration_seconds: float | None = None,
+        rate_source: Callable[[], float] | None = None,
+        tick_seconds: float = 0.1,
+        on_idle: Callable[[], None] | None = None,
     ) -> Iterator[dict[str, Any]]:
         """Generate continuous stream of events at specified rate.
 
+        Sleeps in slices of at most `tick_seconds` and re-reads the rate on every
+        slice, so runtime rate changes apply within one tick even at low rates.
+
         Args:
             rate: Events per second (default: 1.16 for ~100K/day)
             duration_seconds: Duration to generate events (None = infinite)
+            rate_source: Optional callable returning the current rate; overrides
+                `rate`, and a value <= 0 pauses generation
+            tick_seconds: Scheduling tick (default: 100ms)
+            on_idle: Optional callable run on every tick without an event (while
+                paused or waiting for the next send time), e.g. to flush batches
         """
-        interval = 1.0 / rate
-        start_time = time.time()
+        start_time = time.monotonic()
+        last_sent: float | None = None
 
         while True:
-            if duration_seconds and (time.time() - start_time) > duration_seconds:
+            now = time.monotonic()
+            if duration_seconds and (now - start_time) > duration_seconds:
                 break
 
-            event = self.generate_event()
-            yield event
-
-            # Sleep to maintain rate
-            time.sleep(interval)
+            current_rate = rate_source() if rate_source else rate
+            if current_rate <= 0:
+                if on_idle:
+                    on_idle()
+                time.sleep(tick_seconds)
+                continue
+
+            if last_sent is not None:
+                wait = last_sent + 1.0 / current_rate - now
+                if wait > 0:
+                    if on_idle:
+                        on_idle()
+                    time.sleep(min(wait, tick_seconds))
+                    continue
+
+            yield self.generate_event()
+
+            # Keep a fixed cadence, but never build up more than a tick of catch-up burst
+            scheduled = now if last_sent is None else last_sent + 1.0 / current_rate
+            last_sent = max(scheduled, now - tick_seconds)
@@ -1,6 +1,10 @@
 """Kafka producer for publishing pageview events to Kafka."""
 
+import contextlib
 import json
+import math
+import socket
+import threading
 import time
 from typing import Any
 
@@ -8,34 +12,86 @@ from kafka import KafkaProducer
 from kafka.errors import KafkaError, NoBrokersAvailable
 
 from src.common.config import PipelineConfig
-from src.common.logging import setup_logging
-from src.common.metrics import events_published, publish_errors, start_metrics_server
+from src.common.logging import RateLimitedLogger, level_enabled, setup_logging
+from src.common.metrics import (
+    events_published,
+    publish_errors,
+    publish_latency,
+    start_metrics_server,
+    transactions_aborted,
+    transactions_committed,
+)
+from src.common.profiling import ContinuousProfiler
+from src.data_generator.adaptive import AimdRateLimiter
+from src.data_generator.control import RateController, make_control_handler
 from src.data_generator.generator import PageviewGenerator
 
 
 class PageviewProducer:
     """Kafka producer for publishing pageview events.
 
+    Delivery depends on `config.producer_mode`:
+        ordered: One blocking send at a time with bounded retries (original setup)
+        idempotent: Pipelined sends; the broker de-duplicates retries
+        transactional: Idempotent sends committed atomically in batches, for
+            read-committed consumers such as the Flink job
+
     Attributes:
         config: Pipeline configuration
         logger: Logger instance
         producer: Kafka producer instance
         topic: Kafka topic name
+        controller: Runtime rate controller
+        rate_limiter: AIMD limiter under the controller's target (None unless adaptive)
     """
 
-    def __init__(self, config: PipelineConfig):
+    def __init__(self, config: PipelineConfig, controller: RateController | None = None):
         """Initialize the Kafka producer.
 
         Args:
             config: Pipeline configuration
+            controller: Rate controller shared with the control endpoint
+                (default: a private one at `config.event_rate`)
         """
         self.config = config
-        self.logger = setup_logging("pageview-producer", config.log_level)
+        self.controller = controller or RateController(config.event_rate, config.load_profile)
+        self.logger = setup_logging(
+            "pageview-producer",
+            config.log_level,
+            enqueue=config.log_enqueue,
+            serialize=config.log_json,
+        )
+        # Per-event logging is decided once here, not per publish
+        self._debug_enabled = level_enabled(config.log_level, "DEBUG")
+        self._sampled_logger = RateLimitedLogger(self.logger, config.log_sample_per_second)
+        # Separate budget, so debug chatter never crowds out publish errors
+        self._error_logger = RateLimitedLogger(self.logger, config.log_sample_per_second)
         self.topic = config.kafka_topic
+        self.rate_limiter = (
+            AimdRateLimiter(
+                self.controller.current_rate,
+                queue_time_ms=self._queue_time_ms,
+                increase_fraction=config.aimd_increase_fraction,
+                decrease_factor=config.aimd_decrease_factor,
+                latency_threshold_ms=config.aimd_latency_threshold_ms,
+                queue_time_threshold_ms=config.aimd_queue_time_threshold_ms,
+                error_threshold=config.aimd_error_threshold,
+                interval_seconds=config.aimd_interval_seconds,
+            )
+            if config.adaptive_rate_enabled
+            else None
+        )
+        self._transactional = config.producer_mode == "transactional"
+        self._transaction_started: float | None = None
+        self._transaction_size = 0
+        # Set by errbacks on kafka-python's sender thread, raised on the run thread
+        self._send_error: KafkaError | None = None
+        self._send_error_lock = threading.Lock()
 
         self.logger.info(
             f"Initializing Kafka producer on {config.kafka_bootstrap_servers}",
             topic=self.topic,
+            mode=config.producer_mode,
         )
 
         max_retries = 10
@@ -47,10 +103,12 @@ class PageviewProducer:
                     bootstrap_servers=config.kafka_bootstrap_servers,
                     value_serializer=lambda v: json.dumps(v).encode("utf-8"),
                     acks="all",  # Wait for all replicas to acknowledge
-                    retries=3,
-                    max_in_flight_requests_per_connection=1,  # Preserve ordering
                     compression_type="gzip",  # Compress messages
+                    **self._delivery_settings(),
                 )
+                if self._transactional:
+                    # Fences older producers with the same id and aborts their open transaction
+                    self.producer.init_transactions()
                 self.logger.info("Kafka producer initialized successfully")
                 return
             except NoBrokersAvailable:
@@ -66,6 +124,37 @@ class PageviewProducer:
                 self.logger.error("Failed to initialize Kafka producer", error=str(e))
                 raise
 
+    def _delivery_settings(self) -> dict[str, Any]:
+        """KafkaProducer retry/ordering settings for the configured producer mode."""
+        if self.config.producer_mode == "ordered":
+            return {
+                "retries": 3,
+                "max_in_flight_requests_per_connection": 1,  # Preserve ordering
+            }
+
+        # Idempotence keeps ordering and drops duplicate retries broker-side, so
+        # retries are left unbounded (capped by delivery_timeout_ms) and sends
+        # are pipelined with a short linger instead of blocking per event
+        settings: dict[str, Any] = {
+            "enable_idempotence": True,
+            "linger_ms": self.config.producer_linger_ms,
+        }
+        if self._transactional:
+            settings["transactional_id"] = (
+                self.config.transactional_id or f"pageview-producer-{socket.gethostname()}"
+            )
+        return settings
+
+    def _queue_time_ms(self) -> float:
+        """Mean time records wait in the producer accumulator before sending.
+
+        kafka-python 2.3 dropped the bounded `buffer_memory` pool, so accumulator
+        queue time is the closest signal to producer buffer fill.
+        """
+        metrics = self.producer.metrics().get("producer-metrics", {})
+        queue_time = metrics.get("record-queue-time-avg", 0.0)
+        return queue_time if math.isfinite(queue_time) else 0.0
+
     def publish(self, event: dict[str, Any]) -> None:
         """Publish a single event to Kafka.
 
@@ -73,46 +162,242 @@ class PageviewProducer:
             event: Pageview event dictionary
 
         Raises:
-            KafkaError: If publish fails after retries
+            KafkaError: If publish fails after retries (in idempotent and
+                transactional modes, a failure of an earlier pipelined send
+                surfaces on the next call)
         """
+        if self.config.producer_mode == "ordered":
+            self._publish_blocking(event)
+        else:
+            self._publish_pipelined(event)
+
+    def _publish_blocking(self, event: dict[str, Any]) -> None:
+        start = time.perf_counter()
         try:
             future = self.producer.send(self.topic, value=event)
             # Block until sent (with timeout)
             record_metadata = future.get(timeout=10)
+        except KafkaError as e:
+            self._record_error(event, e)
+            raise
+        self._record_success(start, event, record_metadata)
+
+    def _publish_pipelined(self, event: dict[str, Any]) -> None:
+        self._raise_send_error()
+
+        if self._transactional and self._transaction_started is None:
+            self.producer.begin_transaction()
+            self._transaction_started = time.monotonic()
+
+        start = time.perf_counter()
+        try:
+            future = self.producer.send(self.topic, value=event)
+        except KafkaError as e:
+            self._record_error(event, e)
+            raise
+        future.add_callback(self._record_success, start, event)
+        future.add_errback(self._on_send_error, event)
+
+        if self._transactional:
+            self._transaction_size += 1
+            self.commit_if_due()
+
+    def _raise_send_error(self) -> None:
+        """Raise the failure of an earlier pipelined send, aborting its transaction.
+
+        A failed send leaves the transaction unable to commit, so it is aborted
+        here rather than filled with events that the commit would discard.
+        """
+        with self._send_error_lock:
+            error, self._send_error = self._send_error, None
+        if error is None:
+            return
+        if self._transaction_started is not None:
+            size = self._end_transaction()
+            self.logger.error("Send failed, aborting transaction", events=size, error=str(error))
+            self.producer.abort_transaction()
+        raise error
+
+    def _end_transaction(self) -> int:
+        """Forget the open transaction and return its size."""
+        size = self._transaction_size
+        self._transaction_started = None
+        self._transaction_size = 0
+        return size
+
+    def commit_if_due(self) -> None:
+        """Commit the open transaction once it is full or `transaction_max_ms` old.
+
+        Called after every send and on every idle tick of the event stream, so a
+        paused or slow stream never keeps a transaction open until the broker's
+        `transaction.timeout.ms` aborts it.
+
+        Raises:
+            KafkaError: If an earlier send or the commit failed
+        """
+        if self._transaction_started is None:
+            return
+        elapsed_ms = (time.monotonic() - self._transaction_started) * 1000
+        if (
+            self._transaction_size >= self.config.transaction_batch_size
+            or elapsed_ms >= self.config.transaction_max_ms
+        ):
+            self.commit_transaction()
 
+    def commit_transaction(self) -> None:
+        """Commit the open transaction, if any (transactional mode only).
+
+        Raises:
+            KafkaError: If an earlier send or the commit failed; the transaction
+                is aborted first
+        """
+        if self._transaction_started is None:
+            return
+        self._raise_send_error()
+        size = self._end_transaction()
+
+        try:
+            self.producer.commit_transaction()
+        except KafkaError as e:
+            transactions_aborted.inc()
+            if self.rate_limiter:
+                self.rate_limiter.record_error()
+            self.logger.error("Transaction commit failed, aborting", events=size, error=str(e))
+            self.producer.abort_transaction()
+            raise
+        transactions_committed.inc()
+        # Read-committed consumers only see transactional events from here on
+        events_published.inc(size)
+
+    # _record_success and _record_error also run as callbacks on kafka-python's sender
+    # thread; the rate limiter and the sampled loggers they update are locked
+
+    def _record_success(self, start: float, event: dict[str, Any], record_metadata: Any) -> None:
+        latency = time.perf_counter() - start
+        publish_latency.observe(latency)
+        if self.rate_limiter:
+            self.rate_limiter.record_success(latency)
+        if not self._transactional:
             events_published.inc()
-            self.logger.debug(
+        if self._debug_enabled:
+            self._sampled_logger.log(
+                "DEBUG",
                 "Event published",
                 user_id=event["user_id"],
                 partition=record_metadata.partition,
                 offset=record_metadata.offset,
             )
-        except KafkaError as e:
-            publish_errors.inc()
-            self.logger.error("Failed to publish event", user_id=event.get("user_id"), error=str(e))
-            raise
+
+    def _record_error(self, event: dict[str, Any], error: Exception) -> None:
+        publish_errors.inc()
+        if self.rate_limiter:
+            self.rate_limiter.record_error()
+        context = {"user_id": event.get("user_id"), "error": str(error)}
+        if self.rate_limiter:
+            # Adaptive mode keeps running through error storms, so sample them
+            self._error_logger.log("ERROR", "Failed to publish event", **context)
+        else:
+            self.logger.error("Failed to publish event", **context)
+
+    def _on_send_error(self, event: dict[str, Any], error: KafkaError) -> None:
+        """Errback for pipelined sends, run on the producer's sender thread.
+
+        Transactional mode always hands the error to the run thread, so the open
+        transaction is aborted on the next publish or tick (adaptive mode then
+        starts a new one). Adaptive idempotent sends only feed the rate limiter.
+        """
+        self._record_error(event, error)
+        if self._transactional or self.rate_limiter is None:
+            with self._send_error_lock:
+                self._send_error = error
+
+    def _on_idle(self) -> None:
+        """Stream tick without an event: commit a transaction that is due."""
+        try:
+            self.commit_if_due()
+        except KafkaError:
+            if self.rate_limiter is None:
+                raise
+
+    def _make_profiler(self) -> ContinuousProfiler | None:
+        """Continuous profiler for the run loop, if enabled in the config."""
+        if not self.config.profiling_enabled:
+            return None
+        self.logger.info(
+            "Continuous profiling enabled (send SIGUSR1 to dump)", dump_dir=self.config.profile_dir
+        )
+        return ContinuousProfiler(
+            "pageview-producer",
+            self.config.profile_dir,
+            sample_interval_seconds=self.config.profile_sample_interval_ms / 1000,
+            summary_interval_seconds=self.config.profile_summary_interval_seconds,
+            tracemalloc_frames=self.config.profile_tracemalloc_frames,
+            memory_capture_seconds=self.config.profile_memory_capture_seconds,
+            logger=self.logger,
+        )
+
+    def _make_generator(self) -> PageviewGenerator:
+        """Build the event generator, stateless or simulating sessions per the config."""
+        generator = PageviewGenerator(
+            session_users=self.config.session_users or None,
+            mean_think_seconds=self.config.session_mean_think_seconds,
+        )
+        if generator.sessions is not None:
+            # Sending faster than this moves event time ahead of wall clock, slower behind it
+            self.logger.info(
+                "Simulating user sessions",
+                users=self.config.session_users,
+                natural_rate=round(generator.sessions.natural_rate, 2),
+            )
+        return generator
 
     def run(self) -> None:
         """Run the producer continuously."""
-        self.logger.info("Starting event generation", rate=f"{self.config.event_rate} events/sec")
+        self.logger.info(
+            "Starting event generation",
+            rate=self.controller.target_rate,
+            profile=self.controller.profile,
+        )
 
-        generator = PageviewGenerator()
+        # Started first so tracemalloc also sees the generator's session state; it
+        # samples this thread, so generator and publish frames share one profile
+        profiler = self._make_profiler()
+        if profiler is not None:
+            profiler.start()
+
+        rate_source = (
+            self.rate_limiter.current_rate if self.rate_limiter else self.controller.current_rate
+        )
         count = 0
 
         try:
-            for event in generator.generate_stream(rate=self.config.event_rate):
-                self.publish(event)
+            generator = self._make_generator()
+            stream = generator.generate_stream(
+                rate_source=rate_source, on_idle=self._on_idle if self._transactional else None
+            )
+            for event in stream:
+                try:
+                    self.publish(event)
+                except KafkaError:
+                    if self.rate_limiter is None:
+                        raise
+                    # Adaptive mode drops the event and lets the limiter back off
+                    continue
                 count += 1
                 if count == 1:
                     self.logger.info("First event published successfully!")
                 if count % 100 == 0:
-                    self.logger.info(f"Progress check: Published {count} events...")
+                    self.logger.info("Progress check: Published {count} events...", count=count)
         except KeyboardInterrupt:
             self.logger.info("Shutting down producer...")
         except Exception as e:
             self.logger.error("Producer error", error=str(e))
             raise
         finally:
+            if profiler is not None:
+                profiler.stop()
+            with contextlib.suppress(KafkaError):  # Already logged and aborted
+                self.commit_transaction()
             self.producer.flush()
             self.producer.close()
             self.logger.info("Producer shutdown complete")
@@ -121,11 +406,13 @@ class PageviewProducer:
 def main() -> None:
     """Main entry point for the data generator."""
     config = PipelineConfig()
+    controller = RateController(config.event_rate, config.load_profile)
 
-    # Start metrics server
-    start_metrics_server(config.metrics_port)
+    # Start metrics server (with the unauthenticated /control endpoints only if enabled)
+    handler = make_control_handler(controller) if config.control_enabled else None
+    start_metrics_server(config.metrics_port, handler)
 
-    producer = PageviewProducer(config)
+    producer = PageviewProducer(config, controller)
     producer.run()
 
 
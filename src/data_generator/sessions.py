@@ -0,0 +1,157 @@
+"""Memory-compact simulation of many concurrent stateful user sessions."""
+
+import random
+from array import array
+from itertools import accumulate, repeat
+
+
+class SessionSimulator:
+    """Schedule pageviews for a large population of users browsing in sessions.
+
+    A user views several pages in a row separated by think time, then goes idle
+    for a longer gap before the next session. Per-user state lives in parallel
+    `array` columns indexed by `user_id - 1` (about 15 bytes per user) and
+    upcoming events are kept in a hashed timing wheel of `array('I')` buckets
+    instead of a heap of tuples.
+
+    Time is simulated: the wheel advances one tick whenever no user is due, so
+    the caller's send rate (not wall clock) decides how fast sessions unfold.
+    Event times should be taken from `now_ms` so gaps between a user's events
+    keep their simulated length; they track wall clock when the send rate is
+    close to `natural_rate`.
+
+    Attributes:
+        num_users: Number of simulated users
+        home_postcode: Postcode index per user
+        current_page: Index of the page each user views at their next event
+        next_event_ms: Simulated time of each user's next event
+        now_ms: Current simulated time
+    """
+
+    def __init__(
+        self,
+        num_users: int,
+        postcode_weights: list[float],
+        page_weights: list[float],
+        mean_think_seconds: float = 10.0,
+        continue_probability: float = 0.8,
+        mean_idle_seconds: float = 1800.0,
+        tick_ms: int = 100,
+        wheel_slots: int = 4096,
+        seed: int | None = None,
+    ):
+        """Create the user population and schedule everyone's first event.
+
+        Args:
+            num_users: Number of simulated users
+            postcode_weights: Relative weight of each home postcode
+            page_weights: Relative weight of each page (landing and next page)
+            mean_think_seconds: Mean gap between pageviews within a session
+            continue_probability: Chance a session continues after each pageview
+            mean_idle_seconds: Mean gap between sessions
+            tick_ms: Timing wheel resolution
+            wheel_slots: Number of wheel buckets (span = tick_ms * wheel_slots)
+            seed: Optional random seed for reproducible runs
+        """
+        if num_users < 1:
+            raise ValueError(f"num_users must be positive, got {num_users}")
+        if len(postcode_weights) > 1 << 16 or len(page_weights) > 1 << 8:
+            raise ValueError("At most 65536 postcodes and 256 pages fit the state columns")
+
+        self.num_users = num_users
+        self.mean_think_ms = mean_think_seconds * 1000
+        self.continue_probability = continue_probability
+        self.mean_idle_ms = mean_idle_seconds * 1000
+        self.tick_ms = tick_ms
+        self.wheel_slots = wheel_slots
+        self.now_ms = 0
+
+        self._random = random.Random(seed)
+        self._page_cum_weights = list(accumulate(page_weights))
+        self._pages = range(len(page_weights))
+
+        postcode_cum_weights = list(accumulate(postcode_weights))
+        self.home_postcode = array("H")
+        self.current_page = array("B")
+        self.next_event_ms = array("q")
+        self._wheel = [array("I") for _ in range(wheel_slots)]
+
+        chunk = 1 << 20  # Bound the temporary lists built by random.choices
+        for offset in range(0, num_users, chunk):
+            size = min(chunk, num_users - offset)
+            self.home_postcode.extend(
+                self._random.choices(
+                    range(len(postcode_weights)), cum_weights=postcode_cum_weights, k=size
+                )
+            )
+            self.current_page.extend(
+                self._random.choices(self._pages, cum_weights=self._page_cum_weights, k=size)
+            )
+
+        # Spread first events evenly over one idle period, a contiguous user range
+        # per tick, so the wheel is filled with bulk extends instead of per-user appends
+        span_ticks = max(1, int(self.mean_idle_ms // tick_ms))
+        for tick in range(span_ticks):
+            low, high = tick * num_users // span_ticks, (tick + 1) * num_users // span_ticks
+            self.next_event_ms.extend(repeat(tick * tick_ms, high - low))
+            self._wheel[tick % wheel_slots].extend(range(low, high))
+
+        self._slot = 0
+        self._due = self._collect_due()
+        self._due_index = 0
+
+    def _collect_due(self) -> array:
+        """Pop users due in the current slot; users due in a later rotation stay."""
+        bucket = self._wheel[self._slot % self.wheel_slots]
+        slot_end = (self._slot + 1) * self.tick_ms
+        due, later = array("I"), array("I")
+        for user in bucket:
+            (due if self.next_event_ms[user] < slot_end else later).append(user)
+        self._wheel[self._slot % self.wheel_slots] = later
+        return due
+
+    def _schedule(self, user: int) -> None:
+        """Pick the user's next page and event time after they view a page."""
+        rand = self._random
+        if rand.random() < self.continue_probability:
+            gap = rand.expovariate(1 / self.mean_think_ms)
+        else:
+            gap = rand.expovariate(1 / self.mean_idle_ms)
+        self.current_page[user] = rand.choices(self._pages, cum_weights=self._page_cum_weights)[0]
+
+        # Always land in a later slot so the current slot drains
+        due = max(self.now_ms + int(gap), (self._slot + 1) * self.tick_ms)
+        self.next_event_ms[user] = due
+        self._wheel[(due // self.tick_ms) % self.wheel_slots].append(user)
+
+    def next_event(self) -> tuple[int, int, int]:
+        """Advance simulated time to the next due user and emit their pageview.
+
+        Returns:
+            Tuple of (user_id starting at 1, postcode index, page index)
+        """
+        while self._due_index >= len(self._due):
+            self._slot += 1
+            self._due = self._collect_due()
+            self._due_index = 0
+
+        user = self._due[self._due_index]
+        self._due_index += 1
+        self.now_ms = max(self.now_ms, self.next_event_ms[user])
+
+        page = self.current_page[user]
+        self._schedule(user)
+        return user + 1, self.home_postcode[user], page
+
+    @property
+    def natural_rate(self) -> float:
+        """Events per simulated second the whole population produces at steady state."""
+        p = self.continue_probability
+        mean_gap_ms = p * self.mean_think_ms + (1 - p) * self.mean_idle_ms
+        return self.num_users * 1000 / mean_gap_ms
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the per-user columns and wheel buckets."""
+        columns = (self.home_postcode, self.current_page, self.next_event_ms)
+        buckets = sum(bucket.buffer_info()[1] * bucket.itemsize for bucket in self._wheel)
+        return sum(col.buffer_info()[1] * col.itemsize for col in columns) + buckets
@@ -0,0 +1,23 @@
+"""Incremental raw-versus-aggregate reconciliation package."""
+
+from typing import TYPE_CHECKING
+
+from src.common.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.reconciliation.manifest import Manifest, PartitionState
+    from src.reconciliation.reconciler import ParquetDataset, Reconciler, ReconciliationReport
+
+_EXPORTS = {
+    "Manifest": "src.reconciliation.manifest",
+    "PartitionState": "src.reconciliation.manifest",
+    "ParquetDataset": "src.reconciliation.reconciler",
+    "Reconciler": "src.reconciliation.reconciler",
+    "ReconciliationReport": "src.reconciliation.reconciler",
+}
+
+__all__ = ["Manifest", "ParquetDataset", "PartitionState", "Reconciler", "ReconciliationReport"]
+
+
+# Exported names are imported on first access (all of them pull in polars)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
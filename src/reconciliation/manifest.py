@@ -0,0 +1,128 @@
+"""Reconciliation progress: per-partition raw counts and the run manifest."""
+
+import json
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import polars as pl
+import pyarrow.parquet as pq
+
+HOURS_PER_DAY = 24
+
+COUNT_SCHEMA = {"window_start": pl.Datetime("ms"), "postcode": pl.Utf8, "raw_count": pl.Int64}
+
+
+def _write_atomic(path: Path, write: Callable[[Path], None]) -> None:
+    """Write to a sibling temporary file, then rename it over `path`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+@dataclass
+class PartitionState:
+    """Raw counts of one `dt=.../event_hour=...` partition and the files behind them.
+
+    Counts and file names are stored together in a single Parquet file (the file
+    list in its schema metadata) and replaced atomically, so a crash can never
+    record a file as processed without its rows, or the other way round.
+
+    Attributes:
+        counts: Raw rows per (window_start, postcode)
+        files: Names of the raw data files already counted
+    """
+
+    counts: pl.DataFrame = field(default_factory=lambda: pl.DataFrame(schema=COUNT_SCHEMA))
+    files: set[str] = field(default_factory=set)
+
+    @classmethod
+    def load(cls, path: Path) -> "PartitionState":
+        """Read a partition's state, or an empty state if it has none yet."""
+        if not path.exists():
+            return cls()
+        table = pq.read_table(path)
+        files = json.loads((table.schema.metadata or {}).get(b"files", b"[]"))
+        counts = pl.DataFrame(table.replace_schema_metadata(None))
+        return cls(counts.cast(COUNT_SCHEMA), set(files))
+
+    def merge(self, counts: pl.DataFrame, files: list[str]) -> None:
+        """Add counts read from newly processed files."""
+        self.counts = (
+            pl.concat([self.counts, counts.select(*COUNT_SCHEMA).cast(COUNT_SCHEMA)])
+            .group_by("window_start", "postcode")
+            .agg(pl.col("raw_count").sum())
+            .sort("window_start", "postcode")
+        )
+        self.files.update(files)
+
+    def save(self, path: Path) -> None:
+        """Atomically replace the partition's state file."""
+        table = self.counts.to_arrow().replace_schema_metadata(
+            {"files": json.dumps(sorted(self.files))}
+        )
+        _write_atomic(path, lambda tmp: pq.write_table(table, tmp))
+
+
+@dataclass
+class Manifest:
+    """Which raw partitions still need a comparison and which are finished.
+
+    Sealed partitions are committed and reconciled; their files are never
+    listed again. Once every hour of a day is sealed the day itself is sealed,
+    so the manifest stays small however much history the buckets hold.
+
+    Attributes:
+        pending: Partitions with counted raw data whose hour is not closed and compared yet
+        checked: Compared partitions not sealed yet; raw files still arriving are late
+        sealed: Finished `dt=.../event_hour=...` partitions of days still open
+        sealed_days: Finished `dt=...` values
+    """
+
+    pending: set[str] = field(default_factory=set)
+    checked: set[str] = field(default_factory=set)
+    sealed: set[str] = field(default_factory=set)
+    sealed_days: set[str] = field(default_factory=set)
+
+    @classmethod
+    def load(cls, path: Path) -> "Manifest":
+        """Read the manifest, or start an empty one on the first run."""
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text())
+        return cls(
+            set(data["pending"]),
+            set(data.get("checked", [])),  # Absent from manifests written before it existed
+            set(data["sealed"]),
+            set(data["sealed_days"]),
+        )
+
+    def save(self, path: Path) -> None:
+        """Atomically replace the manifest file."""
+        payload = json.dumps(
+            {
+                "pending": sorted(self.pending),
+                "checked": sorted(self.checked),
+                "sealed": sorted(self.sealed),
+                "sealed_days": sorted(self.sealed_days),
+            },
+            indent=2,
+        )
+        _write_atomic(path, lambda tmp: tmp.write_text(payload))
+
+    def is_sealed(self, partition: str) -> bool:
+        """Whether a partition (or its whole day) is finished."""
+        return partition in self.sealed or partition.split("/")[0] in self.sealed_days
+
+    def seal(self, partition: str) -> None:
+        """Mark a partition finished, collapsing complete days."""
+        self.pending.discard(partition)
+        self.checked.discard(partition)
+        self.sealed.add(partition)
+        day = partition.split("/")[0]
+        hours = {p for p in self.sealed if p.split("/")[0] == day}
+        if len(hours) == HOURS_PER_DAY:
+            self.sealed -= hours
+            self.sealed_days.add(day)
@@ -0,0 +1,450 @@
+"""Incremental reconciliation of raw_sink rows against agg_sink counts.
+
+Each run lists the raw partitions that are committed but not yet sealed, counts
+only the Parquet files it has not seen before, merges those counts into the
+stored per-partition state and compares each partition with the aggregates
+of the same `dt`/`event_hour` once its hour is closed. Work is proportional
+to new data: old files are never re-read and finished partitions are never
+re-listed.
+
+Flink commits partitions on processing time, so `_SUCCESS` appears while an
+hour is still filling. A partition is therefore compared only when the latest
+aggregated window end, less the watermark bound, has passed the end of its
+hour: every window in it has fired. Raw files arriving after that hold events
+the windows dropped as late; they are reported as `late_events`, not as
+mismatches, and do not re-open the partition.
+"""
+
+import shutil
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+import polars as pl
+import pyarrow.fs as pafs
+
+from src.common.config import PipelineConfig
+from src.common.logging import setup_logging
+from src.reconciliation.manifest import COUNT_SCHEMA, Manifest, PartitionState
+
+SUCCESS_FILE = "_SUCCESS"
+MISMATCH_SCHEMA = {"partition": pl.Utf8, **COUNT_SCHEMA, "agg_count": pl.Int64}
+
+
+@dataclass(frozen=True)
+class PartitionListing:
+    """Committed data files of one partition.
+
+    Attributes:
+        files: Data file names (hidden and in-progress files excluded)
+        committed_at: Epoch seconds the partition was committed, None if it is not
+    """
+
+    files: list[str]
+    committed_at: float | None
+
+
+class ParquetDataset:
+    """A Hive-partitioned (`dt=.../event_hour=...`) Parquet dataset, local or on S3."""
+
+    def __init__(
+        self,
+        uri: str,
+        endpoint: str | None = None,
+        region: str = "us-east-1",
+        require_success: bool = True,
+        commit_delay_seconds: int = 300,
+    ):
+        """Open a dataset root.
+
+        Args:
+            uri: `s3://bucket/prefix` or a local directory
+            endpoint: S3 endpoint override (LocalStack)
+            region: S3 region
+            require_success: Treat partitions as committed only once they have a
+                `_SUCCESS` file (Flink's success-file commit policy)
+            commit_delay_seconds: Without success files, treat a partition as
+                committed this long after its hour ends
+        """
+        self.require_success = require_success
+        self.commit_delay_seconds = commit_delay_seconds
+        self.storage_options: dict[str, str] | None = None
+
+        if uri.startswith("s3://"):
+            endpoint_url = urlparse(endpoint) if endpoint else None
+            self.filesystem: pafs.FileSystem = pafs.S3FileSystem(
+                region=region,
+                endpoint_override=endpoint_url.netloc if endpoint_url else None,
+                scheme=endpoint_url.scheme if endpoint_url else "https",
+            )
+            self.root = uri.removeprefix("s3://").rstrip("/")
+            self._scheme = "s3://"
+            self.storage_options = {"aws_region": region}
+            if endpoint:
+                self.storage_options |= {"aws_endpoint_url": endpoint, "aws_allow_http": "true"}
+        else:
+            self.filesystem = pafs.LocalFileSystem()
+            self.root = str(Path(uri.removeprefix("file://")).resolve())
+            self._scheme = ""
+
+    def uri(self, partition: str, name: str) -> str:
+        """Full path of a file, as polars reads it."""
+        return f"{self._scheme}{self.root}/{partition}/{name}"
+
+    def _children(self, path: str) -> list[pafs.FileInfo]:
+        selector = pafs.FileSelector(path, allow_not_found=True)
+        return self.filesystem.get_file_info(selector)
+
+    def list_days(self) -> list[str]:
+        """`dt=...` directories under the root."""
+        infos = self._children(self.root)
+        return sorted(i.base_name for i in infos if i.type == pafs.FileType.Directory)
+
+    def list_hours(self, day: str) -> list[str]:
+        """`dt=.../event_hour=...` partitions of one day."""
+        infos = self._children(f"{self.root}/{day}")
+        return sorted(f"{day}/{i.base_name}" for i in infos if i.type == pafs.FileType.Directory)
+
+    def list_partition(self, partition: str) -> PartitionListing:
+        """Data files of a partition and when it was committed."""
+        infos = self._children(f"{self.root}/{partition}")
+        files = sorted(
+            i.base_name
+            for i in infos
+            if i.type == pafs.FileType.File and not i.base_name.startswith((".", "_"))
+        )
+        success = next((i for i in infos if i.base_name == SUCCESS_FILE), None)
+        if success is not None and success.mtime is not None:
+            committed_at: float | None = success.mtime.timestamp()
+        elif self.require_success:
+            committed_at = None
+        else:
+            committed_at = partition_end(partition).timestamp() + self.commit_delay_seconds
+            if committed_at > time.time():
+                committed_at = None
+        return PartitionListing(files, committed_at)
+
+
+def partition_end(partition: str) -> datetime:
+    """End of the hour a `dt=YYYY-MM-DD/event_hour=HH` partition covers (UTC)."""
+    day, hour = (part.split("=", 1)[1] for part in partition.split("/"))
+    start = datetime.strptime(f"{day} {hour}", "%Y-%m-%d %H").replace(tzinfo=timezone.utc)
+    return start + timedelta(hours=1)
+
+
+def count_windows(
+    files: list[str], window_size_seconds: int, storage_options: dict[str, str] | None = None
+) -> pl.DataFrame:
+    """Count raw rows per (window_start, postcode) with the polars streaming engine.
+
+    Args:
+        files: Raw Parquet files to read
+        window_size_seconds: Tumbling window size used by the aggregation
+        storage_options: Object store options for S3 paths
+
+    Returns:
+        DataFrame with partition, window_start, postcode and raw_count
+    """
+    window_start = pl.from_epoch("timestamp", time_unit="ms").dt.truncate(f"{window_size_seconds}s")
+    return (
+        pl.scan_parquet(files, storage_options=storage_options, hive_partitioning=False)
+        .select(window_start.alias("window_start"), pl.col("postcode"))
+        .group_by("window_start", "postcode")
+        .agg(pl.len().cast(pl.Int64).alias("raw_count"))
+        .with_columns(
+            partition=pl.format(
+                "dt={}/event_hour={}",
+                pl.col("window_start").dt.strftime("%Y-%m-%d"),
+                pl.col("window_start").dt.strftime("%H"),
+            )
+        )
+        .collect(engine="streaming")
+    )
+
+
+def latest_window_end(
+    files: list[str], window_size_seconds: int, storage_options: dict[str, str] | None = None
+) -> datetime | None:
+    """End of the latest window in aggregate files (naive UTC), None if they have no rows."""
+    latest = (
+        pl.scan_parquet(files, storage_options=storage_options, hive_partitioning=False)
+        .select(pl.col("window_start").cast(pl.Datetime("ms")).max())
+        .collect()
+        .item()
+    )
+    return None if latest is None else latest + timedelta(seconds=window_size_seconds)
+
+
+def sum_aggregates(files: list[str], storage_options: dict[str, str] | None = None) -> pl.DataFrame:
+    """Total pageview_count per (window_start, postcode) across enrichment columns.
+
+    Args:
+        files: Aggregate Parquet files of one partition
+        storage_options: Object store options for S3 paths
+
+    Returns:
+        DataFrame with window_start, postcode and agg_count
+    """
+    if not files:
+        return pl.DataFrame(
+            schema={"window_start": pl.Datetime("ms"), "postcode": pl.Utf8, "agg_count": pl.Int64}
+        )
+    return (
+        pl.scan_parquet(files, storage_options=storage_options, hive_partitioning=False)
+        .select(pl.col("window_start").cast(pl.Datetime("ms")), "postcode", "pageview_count")
+        .group_by("window_start", "postcode")
+        .agg(pl.col("pageview_count").sum().cast(pl.Int64).alias("agg_count"))
+        .collect(engine="streaming")
+    )
+
+
+def compare_counts(raw: pl.DataFrame, aggregates: pl.DataFrame) -> pl.DataFrame:
+    """Windows whose raw row count differs from the aggregated count.
+
+    A window missing on either side counts as zero there.
+    """
+    return (
+        raw.join(aggregates, on=["window_start", "postcode"], how="full", coalesce=True)
+        .with_columns(pl.col("raw_count", "agg_count").fill_null(0))
+        .filter(pl.col("raw_count") != pl.col("agg_count"))
+        .sort("window_start", "postcode")
+    )
+
+
+@dataclass
+class ReconciliationReport:
+    """Outcome of one reconciliation run.
+
+    Attributes:
+        new_files: Raw files counted in this run
+        checked: Partitions compared with their aggregates
+        pending: Partitions waiting for their hour to close and their aggregates to commit
+        sealed: Partitions finished in this run
+        late_events: Raw rows that arrived in already compared partitions
+        mismatches: Mismatched windows (see MISMATCH_SCHEMA)
+    """
+
+    new_files: int
+    checked: list[str]
+    pending: list[str]
+    sealed: list[str]
+    late_events: int
+    mismatches: pl.DataFrame
+
+
+class Reconciler:
+    """Compare raw event counts with windowed aggregates, one increment at a time.
+
+    State lives under `state_dir`: `manifest.json` (pending and sealed
+    partitions) and one `raw_counts/<partition>/counts.parquet` per open
+    partition holding its counts and the names of the files behind them.
+    """
+
+    def __init__(
+        self,
+        raw: ParquetDataset,
+        aggregated: ParquetDataset,
+        state_dir: str | Path,
+        window_size_seconds: int = 60,
+        seal_after_seconds: int = 7200,
+        watermark_bound_seconds: int = 5,
+    ):
+        """Initialize the reconciler.
+
+        Args:
+            raw: Dataset written by raw_sink
+            aggregated: Dataset written by agg_sink
+            state_dir: Directory for the manifest and per-partition counts
+            window_size_seconds: Tumbling window size used by the aggregation
+            seal_after_seconds: Stop listing a raw partition this long after it
+                was committed (later files in it are no longer picked up)
+            watermark_bound_seconds: Watermark delay plus allowed lateness of the job
+        """
+        self.raw = raw
+        self.aggregated = aggregated
+        self.state_dir = Path(state_dir)
+        self.window_size_seconds = window_size_seconds
+        self.seal_after_seconds = seal_after_seconds
+        self.watermark_bound_seconds = watermark_bound_seconds
+
+    @classmethod
+    def from_config(cls, config: PipelineConfig) -> "Reconciler":
+        """Build a reconciler for the datasets and state named in the config."""
+
+        def dataset(uri: str) -> ParquetDataset:
+            return ParquetDataset(
+                uri,
+                endpoint=config.localstack_endpoint,
+                region=config.aws_region,
+                require_success=config.reconcile_require_success,
+                commit_delay_seconds=config.reconcile_commit_delay_seconds,
+            )
+
+        return cls(
+            dataset(config.reconcile_raw_path or f"s3://{config.raw_events_bucket}"),
+            dataset(config.reconcile_aggregated_path or f"s3://{config.aggregated_bucket}"),
+            config.reconcile_state_dir,
+            window_size_seconds=config.window_size_seconds,
+            seal_after_seconds=config.reconcile_seal_after_seconds,
+            watermark_bound_seconds=config.watermark_bound_seconds,
+        )
+
+    @property
+    def manifest_path(self) -> Path:
+        """Location of the run manifest."""
+        return self.state_dir / "manifest.json"
+
+    def state_path(self, partition: str) -> Path:
+        """Location of a partition's stored raw counts."""
+        return self.state_dir / "raw_counts" / partition / "counts.parquet"
+
+    def _open_partitions(self, manifest: Manifest) -> dict[str, PartitionListing]:
+        """List committed raw partitions that are not sealed yet."""
+        listings = {}
+        for day in self.raw.list_days():
+            if day in manifest.sealed_days:
+                continue
+            for partition in self.raw.list_hours(day):
+                if manifest.is_sealed(partition):
+                    continue
+                listing = self.raw.list_partition(partition)
+                if listing.committed_at is not None:
+                    listings[partition] = listing
+        return listings
+
+    def _closed_until(self) -> datetime | None:
+        """Event time (naive UTC) before which every window has fired, None before any output.
+
+        A window fires once the watermark passes its end, so the latest
+        aggregated window end bounds the watermark from below; the watermark
+        bound is kept as a margin for raw and aggregate files becoming visible
+        at different checkpoints.
+        """
+        for day in reversed(self.aggregated.list_days()):
+            for partition in reversed(self.aggregated.list_hours(day)):
+                files = self.aggregated.list_partition(partition).files
+                if not files:
+                    continue
+                end = latest_window_end(
+                    [self.aggregated.uri(partition, name) for name in files],
+                    self.window_size_seconds,
+                    self.aggregated.storage_options,
+                )
+                if end is not None:
+                    return end - timedelta(seconds=self.watermark_bound_seconds)
+        return None
+
+    def _count_new_files(self, listings: dict[str, PartitionListing]) -> tuple[dict[str, int], int]:
+        """Count unseen raw files and merge them into the partition states.
+
+        Returns:
+            New raw rows per partition whose counts changed, and the number of files counted
+        """
+        states = {p: PartitionState.load(self.state_path(p)) for p in listings}
+        new_files = {
+            p: [name for name in listing.files if name not in states[p].files]
+            for p, listing in listings.items()
+        }
+        new_files = {p: names for p, names in new_files.items() if names}
+        if not new_files:
+            return {}, 0
+
+        uris = [self.raw.uri(p, name) for p, names in new_files.items() for name in names]
+        counts = count_windows(uris, self.window_size_seconds, self.raw.storage_options)
+        by_partition = counts.partition_by("partition", as_dict=True, include_key=False)
+
+        touched = {}
+        for partition in set(new_files) | {key[0] for key in by_partition}:
+            state = states.get(partition) or PartitionState.load(self.state_path(partition))
+            partition_counts = by_partition.get((partition,), pl.DataFrame(schema=COUNT_SCHEMA))
+            state.merge(partition_counts, new_files.get(partition, []))
+            state.save(self.state_path(partition))
+            touched[partition] = int(partition_counts["raw_count"].sum())
+        return touched, len(uris)
+
+    def run(self) -> ReconciliationReport:
+        """Count new raw files and compare every affected partition once.
+
+        Returns:
+            Report of checked, pending and sealed partitions and any mismatches
+        """
+        manifest = Manifest.load(self.manifest_path)
+        listings = self._open_partitions(manifest)
+
+        touched, new_files = self._count_new_files(listings)
+        late_events = sum(rows for p, rows in touched.items() if p in manifest.checked)
+        # Record touched partitions before comparing, so an interrupted run re-checks them
+        manifest.pending |= set(touched) - manifest.checked
+        manifest.save(self.manifest_path)
+
+        closed_until = self._closed_until()
+        checked, mismatches = [], []
+        for partition in sorted(manifest.pending):
+            if closed_until is None or partition_end(partition).replace(tzinfo=None) > closed_until:
+                continue
+            aggregates = self.aggregated.list_partition(partition)
+            if aggregates.committed_at is None:
+                continue
+            raw = PartitionState.load(self.state_path(partition)).counts
+            agg = sum_aggregates(
+                [self.aggregated.uri(partition, name) for name in aggregates.files],
+                self.aggregated.storage_options,
+            )
+            found = compare_counts(raw, agg).with_columns(partition=pl.lit(partition))
+            mismatches.append(found.select(*MISMATCH_SCHEMA))
+            checked.append(partition)
+        manifest.pending -= set(checked)
+        manifest.checked |= set(checked)
+
+        sealed = []
+        now = time.time()
+        for partition, listing in listings.items():
+            committed_at = listing.committed_at
+            if partition in manifest.pending or committed_at is None:
+                continue
+            if now - committed_at >= self.seal_after_seconds:
+                manifest.seal(partition)
+                shutil.rmtree(self.state_path(partition).parent, ignore_errors=True)
+                sealed.append(partition)
+        manifest.save(self.manifest_path)
+
+        return ReconciliationReport(
+            new_files=new_files,
+            checked=checked,
+            pending=sorted(manifest.pending),
+            sealed=sorted(sealed),
+            late_events=late_events,
+            mismatches=pl.concat([pl.DataFrame(schema=MISMATCH_SCHEMA), *mismatches]),
+        )
+
+
+def main() -> None:
+    """Run one reconciliation increment; exit non-zero if any window mismatches."""
+    config = PipelineConfig()
+    logger = setup_logging("pageview-reconciliation", config.log_level)
+
+    report = Reconciler.from_config(config).run()
+    logger.info(
+        f"Reconciled {len(report.checked)} partitions from {report.new_files} new raw files",
+        pending=len(report.pending),
+        sealed=len(report.sealed),
+        late_events=report.late_events,
+        mismatched_windows=report.mismatches.height,
+    )
+    if report.mismatches.is_empty():
+        return
+
+    path = Path(config.reconcile_state_dir) / "mismatches" / f"{int(time.time())}.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report.mismatches.write_csv(path)
+    for row in report.mismatches.head(20).iter_rows(named=True):
+        logger.warning("Window count mismatch", **{k: str(v) for k, v in row.items()})
+    logger.warning(f"Wrote {report.mismatches.height} mismatched windows", report=str(path))
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
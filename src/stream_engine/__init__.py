@@ -0,0 +1,23 @@
+"""Pure-Python reference stream engine package."""
+
+from typing import TYPE_CHECKING
+
+from src.common.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.stream_engine.engine import BatchResult, ReferenceEngine
+    from src.stream_engine.validation import validate_events
+    from src.stream_engine.window import TumblingWindowCounter
+
+_EXPORTS = {
+    "BatchResult": "src.stream_engine.engine",
+    "ReferenceEngine": "src.stream_engine.engine",
+    "TumblingWindowCounter": "src.stream_engine.window",
+    "validate_events": "src.stream_engine.validation",
+}
+
+__all__ = ["BatchResult", "ReferenceEngine", "TumblingWindowCounter", "validate_events"]
+
+
+# Exported names are imported on first access (all of them pull in polars)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,65 @@
+"""Polars port of the Flink `postcode_regions` view and `enriched_events` temporal join."""
+
+from pathlib import Path
+
+import polars as pl
+
+# Headerless CSV columns of flink-app/data/postcode_dim (create_postcode_dim_source)
+DIMENSION_SCHEMA = {
+    "postcode": pl.Utf8,
+    "region": pl.Utf8,
+    "area_type": pl.Utf8,
+    "valid_from_ms": pl.Int64,
+}
+
+UNKNOWN = "UNKNOWN"
+
+
+def load_dimension(path: str | Path) -> pl.DataFrame:
+    """Read the postcode dimension from a CSV file or a directory of them.
+
+    Args:
+        path: File, directory or `file://` URL, as in POSTCODE_DIM_PATH
+
+    Returns:
+        Dimension rows sorted by `valid_from_ms`
+    """
+    path = Path(str(path).removeprefix("file://"))
+    files = sorted(path.glob("*.csv")) if path.is_dir() else [path]
+    frames = [
+        pl.read_csv(file, has_header=False, new_columns=list(DIMENSION_SCHEMA)) for file in files
+    ]
+    return (
+        pl.concat([frame.cast(DIMENSION_SCHEMA) for frame in frames])
+        if frames
+        else pl.DataFrame(schema=DIMENSION_SCHEMA)
+    ).sort("valid_from_ms")
+
+
+def enrich_events(events: pl.DataFrame, dimension: pl.DataFrame) -> pl.DataFrame:
+    """Add the region and area type each postcode had at the event's timestamp.
+
+    Matches the streaming event-time temporal join: an event takes the latest
+    dimension row valid at its timestamp, and postcodes without one (or events
+    older than every version) get 'UNKNOWN'. Rows come back sorted by timestamp.
+
+    Args:
+        events: Validated events with epoch-millisecond `timestamp` and `postcode`
+        dimension: Rows in DIMENSION_SCHEMA (see `load_dimension`)
+
+    Returns:
+        `events` with `region` and `area_type` appended
+    """
+    return (
+        events.sort("timestamp")
+        .join_asof(
+            dimension.sort("valid_from_ms"),
+            left_on="timestamp",
+            right_on="valid_from_ms",
+            by="postcode",
+            strategy="backward",
+            check_sortedness=False,  # Both sides are sorted just above
+        )
+        .drop("valid_from_ms")
+        .with_columns(pl.col("region", "area_type").fill_null(UNKNOWN))
+    )
@@ -0,0 +1,125 @@
+"""Small-deployment mode: run the reference engine against Kafka without Flink."""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import polars as pl
+import pyarrow.dataset as ds
+from kafka import KafkaConsumer
+
+from src.common.config import PipelineConfig
+from src.common.logging import setup_logging
+from src.common.metrics import start_metrics_server
+from src.stream_engine.engine import BatchResult, ReferenceEngine
+from src.stream_engine.enrichment import load_dimension
+
+
+def write_partitioned(frame: pl.DataFrame, path: Path, partition_by: list[str]) -> None:
+    """Append a batch to a (Hive-partitioned) Parquet dataset.
+
+    Args:
+        frame: Rows to write
+        path: Dataset root directory
+        partition_by: Partition columns (empty for an unpartitioned dataset)
+    """
+    if frame.is_empty():
+        return
+    ds.write_dataset(
+        frame.to_arrow(),
+        path,
+        format="parquet",
+        partitioning=partition_by or None,
+        partitioning_flavor="hive" if partition_by else None,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+def with_window_partition(aggregates: pl.DataFrame) -> pl.DataFrame:
+    """Add the dt/event_hour partition columns of each window, as agg_sink does."""
+    return aggregates.with_columns(
+        dt=pl.col("window_start").dt.strftime("%Y-%m-%d"),
+        event_hour=pl.col("window_start").dt.strftime("%H"),
+    )
+
+
+def with_ingest_partition(rejected: pl.DataFrame) -> pl.DataFrame:
+    """Add processing-time dt/event_hour columns, as dlq_sink does."""
+    now = datetime.now(timezone.utc)
+    return rejected.with_columns(
+        dt=pl.lit(now.strftime("%Y-%m-%d")), event_hour=pl.lit(now.strftime("%H"))
+    )
+
+
+def write_aggregates(aggregates: pl.DataFrame, output_dir: Path) -> None:
+    """Append window rows to the aggregated dataset, partitioned by window hour."""
+    write_partitioned(
+        with_window_partition(aggregates), output_dir / "aggregated", ["dt", "event_hour"]
+    )
+
+
+def write_result(result: BatchResult, output_dir: Path) -> None:
+    """Append one engine step's raw, aggregated and DLQ rows under `output_dir`."""
+    write_partitioned(result.raw, output_dir / "raw", ["dt", "event_hour"])
+    write_aggregates(result.aggregates, output_dir)
+    write_partitioned(
+        with_ingest_partition(result.rejected), output_dir / "dlq" / "events", ["dt", "event_hour"]
+    )
+
+
+def main() -> None:
+    """Consume pageview events from Kafka and write raw, aggregated and DLQ Parquet locally."""
+    config = PipelineConfig()
+    logger = setup_logging("pageview-reference-engine", config.log_level)
+
+    output_dir = Path(config.reference_output_dir)
+    engine = ReferenceEngine(
+        config.window_size_seconds,
+        config.watermark_bound_seconds,
+        load_dimension(config.reference_postcode_dim_path),
+    )
+    consumer = KafkaConsumer(
+        config.kafka_topic,
+        bootstrap_servers=config.kafka_bootstrap_servers,
+        group_id=f"{config.kafka_consumer_group}-reference",
+        auto_offset_reset="earliest",
+        isolation_level="read_committed",  # Skip aborted transactional writes
+        value_deserializer=lambda v: json.loads(v.decode("utf-8")),
+    )
+
+    start_metrics_server(config.reference_metrics_port)
+    logger.info(f"Reference engine consuming {config.kafka_topic}", output=str(output_dir))
+
+    try:
+        while True:
+            records = consumer.poll(timeout_ms=1000, max_records=10000)
+            events = [record.value for batch in records.values() for record in batch]
+            if not events:
+                continue
+
+            result = engine.process(events)
+            write_result(result, output_dir)
+            consumer.commit()
+
+            if not result.aggregates.is_empty():
+                logger.info(
+                    f"Closed {result.aggregates.height} window rows",
+                    watermark=engine.windows.watermark,
+                    late_events=engine.windows.late_events,
+                )
+    except KeyboardInterrupt:
+        logger.info("Shutting down reference engine...")
+        # Committed offsets cover events still in open windows, so write those
+        # windows now; a restart adds later rows for them, which sum correctly.
+        open_windows = engine.finish()
+        write_aggregates(open_windows, output_dir)
+        consumer.commit()
+        logger.info(f"Flushed {open_windows.height} open window rows")
+    finally:
+        consumer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Polars port of the Flink `checked_events`, `validated_events` and `rejected_events` views."""
+
+from collections.abc import Iterable
+from typing import Any
+
+import polars as pl
+
+# Mirrors the Kafka source DDL in flink-app/src/sql/tables.py
+EVENT_SCHEMA = {
+    "user_id": pl.Int32,
+    "postcode": pl.Utf8,
+    "webpage": pl.Utf8,
+    "timestamp": pl.Int64,
+}
+
+# Columns written to raw_sink, in DDL order
+RAW_COLUMNS = ["user_id", "postcode", "webpage", "timestamp", "dt", "event_hour"]
+
+# Reason codes, in the order rules are checked (as in create_checked_view_sql)
+REJECT_REASONS = (
+    "MISSING_USER_ID",
+    "INVALID_USER_ID",
+    "MISSING_POSTCODE",
+    "INVALID_POSTCODE",
+    "MISSING_WEBPAGE",
+    "INVALID_WEBPAGE",
+    "MISSING_TIMESTAMP",
+    "INVALID_TIMESTAMP",
+)
+
+# PageviewEvent timestamp bounds: 2000-01-01 and 2100-01-01 in epoch ms
+MIN_TIMESTAMP_MS = 946684800000
+MAX_TIMESTAMP_MS = 4102444800000
+
+
+def events_to_frame(events: Iterable[dict[str, Any]] | pl.DataFrame) -> pl.DataFrame:
+    """Coerce a batch of events to the source schema.
+
+    Missing fields become nulls, matching the Flink JSON format.
+
+    Args:
+        events: Event dictionaries or an existing DataFrame
+
+    Returns:
+        DataFrame with exactly the source columns
+    """
+    if isinstance(events, pl.DataFrame):
+        frame = events
+    else:
+        rows = [{name: event.get(name) for name in EVENT_SCHEMA} for event in events]
+        frame = pl.DataFrame(rows, schema=EVENT_SCHEMA, orient="row")
+
+    return frame.select(pl.col(name).cast(dtype) for name, dtype in EVENT_SCHEMA.items())
+
+
+def reject_reason() -> pl.Expr:
+    """Expression for the first `PageviewEvent` rule a row fails (null if valid)."""
+    user_id, postcode, webpage, timestamp = (pl.col(name) for name in EVENT_SCHEMA)
+    checks = [
+        user_id.is_null(),
+        user_id <= 0,
+        postcode.is_null(),
+        ~postcode.str.contains(r"^[A-Z0-9]{2,10}$"),
+        webpage.is_null(),
+        ~webpage.str.contains(r"^https?://.+"),
+        timestamp.is_null(),
+        ~timestamp.is_between(MIN_TIMESTAMP_MS, MAX_TIMESTAMP_MS),
+    ]
+
+    expr = pl.when(checks[0]).then(pl.lit(REJECT_REASONS[0]))
+    for check, reason in zip(checks[1:], REJECT_REASONS[1:], strict=True):
+        expr = expr.when(check).then(pl.lit(reason))
+    return expr.otherwise(pl.lit(None, dtype=pl.Utf8))
+
+
+def split_events(events: pl.DataFrame) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """Validate a batch in one pass, as the Flink job does for its shared source.
+
+    Valid rows get `ts`, `dt` and `event_hour` derived from the
+    epoch-millisecond timestamp (UTC); rejected rows keep the source columns
+    plus `reject_reason`.
+
+    Args:
+        events: Batch in the source schema (see `events_to_frame`)
+
+    Returns:
+        Tuple of (validated events, rejected events)
+    """
+    checked = events.with_columns(reject_reason().alias("reject_reason"))
+    is_valid = pl.col("reject_reason").is_null()
+    ts = pl.from_epoch(pl.col("timestamp"), time_unit="ms")
+
+    validated = (
+        checked.filter(is_valid)
+        .drop("reject_reason")
+        .with_columns(ts.alias("ts"))
+        .with_columns(
+            pl.col("ts").dt.strftime("%Y-%m-%d").alias("dt"),
+            pl.col("ts").dt.strftime("%H").alias("event_hour"),
+        )
+    )
+    return validated, checked.filter(~is_valid)
+
+
+def validate_events(events: pl.DataFrame) -> pl.DataFrame:
+    """Apply the same rules as `create_validated_view_sql`.
+
+    Args:
+        events: Batch in the source schema (see `events_to_frame`)
+
+    Returns:
+        Validated events with the derived columns appended
+    """
+    return split_events(events)[0]
@@ -0,0 +1,175 @@
+"""Unit tests for adaptive (AIMD) rate control."""
+
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+from kafka.errors import KafkaTimeoutError
+
+from src.common.config import PipelineConfig
+from src.common.metrics import effective_event_rate
+from src.data_generator.adaptive import AimdRateLimiter
+from src.data_generator.producer import PageviewProducer
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Iterator[FakeClock]:
+    """Patch the limiter's clock."""
+    fake = FakeClock()
+    with patch("src.data_generator.adaptive.time.monotonic", fake):
+        yield fake
+
+
+def make_limiter(ceiling: float = 100.0, **kwargs: float) -> AimdRateLimiter:
+    """Build a limiter with a fixed ceiling and a 1 second interval."""
+    return AimdRateLimiter(lambda: ceiling, interval_seconds=1.0, **kwargs)
+
+
+class TestAimdRateLimiter:
+    """Tests for AimdRateLimiter."""
+
+    def test_high_latency_halves_rate(self, clock: FakeClock) -> None:
+        """Test multiplicative decrease when mean latency crosses the threshold."""
+        limiter = make_limiter(latency_threshold_ms=100)
+        limiter.record_success(0.5)
+        clock.now = 1.0
+
+        assert limiter.current_rate() == 50.0
+        assert effective_event_rate._value.get() == 50.0
+
+    def test_errors_halve_rate(self, clock: FakeClock) -> None:
+        """Test multiplicative decrease when the error ratio crosses the threshold."""
+        limiter = make_limiter(error_threshold=0.1)
+        for _ in range(8):
+            limiter.record_success(0.01)
+        limiter.record_error()
+        limiter.record_error()
+        clock.now = 1.0
+
+        assert limiter.current_rate() == 50.0
+
+    def test_queue_time_counts_as_pressure(self, clock: FakeClock) -> None:
+        """Test that producer queue time above the threshold cuts the rate."""
+        limiter = AimdRateLimiter(
+            lambda: 100.0, queue_time_ms=lambda: 250.0, queue_time_threshold_ms=100.0
+        )
+        limiter.record_success(0.01)
+        clock.now = 1.0
+
+        assert limiter.current_rate() == 50.0
+
+    def test_additive_recovery_up_to_ceiling(self, clock: FakeClock) -> None:
+        """Test additive increase after pressure clears, capped at the ceiling."""
+        limiter = make_limiter(latency_threshold_ms=100, increase_fraction=0.1)
+        limiter.record_success(0.5)
+        clock.now = 1.0
+        assert limiter.current_rate() == 50.0
+
+        rates = []
+        for step in range(2, 9):
+            limiter.record_success(0.01)
+            clock.now = float(step)
+            rates.append(limiter.current_rate())
+
+        assert rates == [60.0, 70.0, 80.0, 90.0, 100.0, 100.0, 100.0]
+
+    def test_interval_waits_for_a_completed_publish(self, clock: FakeClock) -> None:
+        """Test that an interval without publishes does not adjust the rate."""
+        limiter = make_limiter(latency_threshold_ms=100)
+        clock.now = 5.0
+        assert limiter.current_rate() == 100.0
+
+        limiter.record_success(0.5)
+        assert limiter.current_rate() == 50.0
+
+    def test_lowered_ceiling_applies_immediately(self, clock: FakeClock) -> None:
+        """Test that the target from the controller caps the adaptive rate."""
+        ceiling = {"value": 100.0}
+        limiter = AimdRateLimiter(lambda: ceiling["value"])
+        ceiling["value"] = 20.0
+
+        assert limiter.current_rate() == 20.0
+
+        ceiling["value"] = 0.0
+        assert limiter.current_rate() == 0.0
+
+    def test_pause_keeps_rate_for_resume(self, clock: FakeClock) -> None:
+        """Test that publishes from before a pause do not adjust the rate to zero."""
+        ceiling = {"value": 100.0}
+        limiter = AimdRateLimiter(lambda: ceiling["value"], interval_seconds=1.0)
+        limiter.record_success(0.01)
+        ceiling["value"] = 0.0
+        clock.now = 1.0
+        assert limiter.current_rate() == 0.0
+
+        ceiling["value"] = 100.0
+        clock.now = 2.0
+        assert limiter.current_rate() == 100.0
+        assert limiter.current_rate() == 100.0
+
+
+class TestAdaptiveProducer:
+    """Tests for PageviewProducer in adaptive mode."""
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_publish_error_does_not_stop_run(self, mock_kafka: MagicMock) -> None:
+        """Test that adaptive mode records publish failures and keeps running."""
+        future = MagicMock()
+        future.get.side_effect = KafkaTimeoutError()
+        mock_kafka.return_value.send.return_value = future
+
+        producer = PageviewProducer(PipelineConfig(adaptive_rate_enabled=True, event_rate=1000))
+        events = iter([{"user_id": 1}, {"user_id": 2}])
+        with patch(
+            "src.data_generator.producer.PageviewGenerator.generate_stream", return_value=events
+        ):
+            producer.run()
+
+        assert mock_kafka.return_value.send.call_count == 2
+        assert producer.rate_limiter is not None
+        assert producer.rate_limiter._errors == 2
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_publish_error_stops_run_without_adaptive(self, mock_kafka: MagicMock) -> None:
+        """Test that the default mode still fails fast on publish errors."""
+        future = MagicMock()
+        future.get.side_effect = KafkaTimeoutError()
+        mock_kafka.return_value.send.return_value = future
+
+        producer = PageviewProducer(PipelineConfig(event_rate=1000))
+        with (
+            patch(
+                "src.data_generator.producer.PageviewGenerator.generate_stream",
+                return_value=iter([{"user_id": 1}]),
+            ),
+            pytest.raises(KafkaTimeoutError),
+        ):
+            producer.run()
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_debug_logs_do_not_crowd_out_errors(self, mock_kafka: MagicMock) -> None:
+        """Test that publish errors have their own sampling budget."""
+        config = PipelineConfig(adaptive_rate_enabled=True, log_level="DEBUG")
+        producer = PageviewProducer(config)
+        logger = MagicMock()
+        producer._sampled_logger.logger = logger
+        producer._error_logger.logger = logger
+
+        for _ in range(config.log_sample_per_second):
+            producer._record_success(0.0, {"user_id": 1}, MagicMock(partition=0, offset=1))
+        producer._record_error({"user_id": 1}, KafkaTimeoutError())
+
+        levels = [c.args[0] for c in logger.opt.return_value.log.call_args_list]
+        assert levels.count("ERROR") == 1
@@ -0,0 +1,142 @@
+"""Unit tests for runtime rate control."""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from src.common.metrics import target_event_rate
+from src.data_generator.control import RateController, make_control_handler
+from src.data_generator.generator import PageviewGenerator
+
+
+@pytest.fixture
+def control_server() -> Iterator[tuple[str, RateController]]:
+    """Serve a controller on an ephemeral port."""
+    controller = RateController(10.0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_control_handler(controller))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", controller
+    server.shutdown()
+    server.server_close()
+
+
+def request(url: str, method: str = "GET") -> tuple[int, bytes]:
+    """Send a request and return status and body, including error responses."""
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, method=method)) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+class TestRateController:
+    """Tests for RateController."""
+
+    def test_pause_and_resume(self) -> None:
+        """Test that pausing zeroes the current rate and the gauge."""
+        controller = RateController(5.0)
+        controller.pause()
+
+        assert controller.current_rate() == 0.0
+        assert target_event_rate._value.get() == 0.0
+
+        controller.resume()
+        assert controller.current_rate() == 5.0
+        assert target_event_rate._value.get() == 5.0
+
+    def test_profile_applies_multiplier(self) -> None:
+        """Test that a load profile scales the target rate."""
+        controller = RateController(10.0, profile="spike")
+
+        # The spike profile starts with its 5x burst
+        assert controller.current_rate() == 50.0
+
+    def test_invalid_values(self) -> None:
+        """Test that invalid rates and profiles are rejected."""
+        with pytest.raises(ValueError):
+            RateController(-1.0)
+        with pytest.raises(ValueError):
+            RateController(1.0, profile="nope")
+
+
+class TestControlHandler:
+    """Tests for the /control HTTP endpoints."""
+
+    def test_control_endpoints(self, control_server: tuple[str, RateController]) -> None:
+        """Test changing rate, pausing and switching profile over HTTP."""
+        url, controller = control_server
+
+        status, body = request(f"{url}/control/rate?value=25", "POST")
+        assert status == 200
+        assert json.loads(body)["target_rate"] == 25.0
+
+        request(f"{url}/control/pause", "POST")
+        assert controller.current_rate() == 0.0
+
+        request(f"{url}/control/resume", "POST")
+        status, body = request(f"{url}/control/profile?name=ramp", "POST")
+        assert status == 200
+        assert json.loads(body)["profile"] == "ramp"
+
+    def test_bad_requests(self, control_server: tuple[str, RateController]) -> None:
+        """Test error responses for missing, invalid and unknown requests."""
+        url, _ = control_server
+
+        assert request(f"{url}/control/rate", "POST")[0] == 400
+        assert request(f"{url}/control/rate?value=abc", "POST")[0] == 400
+        assert request(f"{url}/control/profile?name=nope", "POST")[0] == 400
+        assert request(f"{url}/control/unknown", "POST")[0] == 404
+
+    def test_metrics_still_served(self, control_server: tuple[str, RateController]) -> None:
+        """Test that non-control paths serve Prometheus metrics."""
+        url, _ = control_server
+
+        status, body = request(f"{url}/metrics")
+        assert status == 200
+        assert b"pageview_target_event_rate" in body
+
+
+class TestGenerateStreamRateSource:
+    """Tests for rate-controlled generate_stream."""
+
+    def test_rate_change_applies_within_a_tick(self) -> None:
+        """Test that raising the rate takes effect without waiting out the old interval."""
+        rate = {"value": 0.2}  # 5 second interval
+        stream = PageviewGenerator().generate_stream(
+            rate_source=lambda: rate["value"], tick_seconds=0.05
+        )
+
+        next(stream)
+        rate["value"] = 1000.0
+        start = time.monotonic()
+        next(stream)
+
+        assert time.monotonic() - start < 0.2
+
+    def test_paused_stream_yields_nothing(self) -> None:
+        """Test that a zero rate pauses generation until the duration ends."""
+        stream = PageviewGenerator().generate_stream(
+            duration_seconds=0.2, rate_source=lambda: 0.0, tick_seconds=0.05
+        )
+
+        assert list(stream) == []
+
+    def test_idle_ticks_call_on_idle(self) -> None:
+        """Test that ticks without an event run the idle callback."""
+        ticks = []
+        stream = PageviewGenerator().generate_stream(
+            duration_seconds=0.2,
+            rate_source=lambda: 0.0,
+            tick_seconds=0.05,
+            on_idle=lambda: ticks.append(1),
+        )
+
+        assert list(stream) == []
+        assert len(ticks) >= 2
@@ -66,3 +66,10 @@ class TestPageviewGenerator:
         assert len(weights) == len(generator.urls)
         # Homepage should have highest weight
         assert weights[0] == 10
+
+    def test_faker_created_on_first_use(self) -> None:
+        """Test that Faker is only instantiated when accessed."""
+        generator = PageviewGenerator()
+
+        assert "faker" not in generator.__dict__
+        assert generator.faker is generator.faker
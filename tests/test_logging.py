@@ -0,0 +1,110 @@
+"""Unit tests for logging helpers."""
+
+import io
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from loguru import logger
+
+from src.common.logging import BackgroundWriter, RateLimitedLogger, level_enabled, setup_logging
+
+
+class TestLevelEnabled:
+    """Tests for level_enabled."""
+
+    def test_levels(self) -> None:
+        """Test level comparison against the configured level."""
+        assert level_enabled("DEBUG", "DEBUG")
+        assert level_enabled("info", "warning")
+        assert not level_enabled("INFO", "DEBUG")
+
+
+class TestRateLimitedLogger:
+    """Tests for RateLimitedLogger."""
+
+    def test_suppresses_over_budget_and_reports_count(self) -> None:
+        """Test that messages beyond the budget are dropped and counted."""
+        mock_logger = MagicMock()
+        sampled = RateLimitedLogger(mock_logger, max_per_interval=2, interval_seconds=1.0)
+
+        with patch("src.common.logging.time.monotonic", return_value=100.0):
+            emitted = [sampled.log("DEBUG", "hot", n=i) for i in range(5)]
+        assert emitted == [True, True, False, False, False]
+
+        with patch("src.common.logging.time.monotonic", return_value=101.0):
+            assert sampled.log("DEBUG", "hot", n=5)
+
+        log_calls = mock_logger.opt.return_value.log.call_args_list
+        assert len(log_calls) == 3
+        assert log_calls[-1].kwargs == {"suppressed": 3, "n": 5}
+
+
+class BlockingStream(io.StringIO):
+    """StringIO whose writes wait until released, like a stalled stdout consumer."""
+
+    def __init__(self) -> None:
+        """Start blocked."""
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, text: str) -> int:
+        """Signal the write, then wait for release before writing."""
+        self.entered.set()
+        self.release.wait()
+        return super().write(text)
+
+
+class TestBackgroundWriter:
+    """Tests for BackgroundWriter and enqueued logging."""
+
+    def test_stop_drains_pending_records(self) -> None:
+        """Test that all queued records are written before stop returns."""
+        stream = io.StringIO()
+        writer = BackgroundWriter(stream)
+        for i in range(100):
+            writer.write(f"{i}\n")
+        writer.stop()
+
+        assert stream.getvalue().splitlines() == [str(i) for i in range(100)]
+
+    def test_enqueued_json_logging(self) -> None:
+        """Test that enqueued JSON records reach stdout once the sink is removed."""
+        stream = io.StringIO()
+        with patch("src.common.logging.sys.stdout", stream):
+            log = setup_logging("test-service", "INFO", enqueue=True, serialize=True)
+            log.info("hello", user_id=7)
+            logger.remove()
+
+        record = json.loads(stream.getvalue())["record"]
+        assert record["message"] == "hello"
+        assert record["extra"] == {"service": "test-service", "user_id": 7}
+
+    def test_full_queue_drops_and_reports_records(self) -> None:
+        """Test that a stalled stream bounds the queue and the next record reports drops."""
+        stream = BlockingStream()
+        writer = BackgroundWriter(stream, max_pending=2)
+        sink = logger.add(writer, filter=writer.report_dropped, serialize=True)
+        logger.info("first")
+        assert stream.entered.wait(1.0)
+        for i in range(9):
+            logger.info(f"queued {i}")
+
+        stream.release.set()
+        deadline = time.monotonic() + 1.0
+        while stream.getvalue().count("\n") < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        logger.info("after")
+        logger.remove(sink)
+
+        records = [json.loads(line)["record"] for line in stream.getvalue().splitlines()]
+        assert [record["message"] for record in records] == [
+            "first",
+            "queued 0",
+            "queued 1",
+            "after",
+        ]
+        assert writer.dropped == 7
+        assert records[-1]["extra"] == {"dropped": 7}
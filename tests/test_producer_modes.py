@@ -0,0 +1,167 @@
+"""Unit tests for idempotent and transactional producer modes."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from kafka.errors import KafkaTimeoutError
+
+from src.common.config import PipelineConfig
+from src.common.metrics import events_published, transactions_aborted
+from src.data_generator.producer import PageviewProducer
+
+
+def make_producer(**overrides: object) -> PageviewProducer:
+    """Build a producer; callers patch KafkaProducer."""
+    return PageviewProducer(PipelineConfig(**overrides))
+
+
+class TestDeliverySettings:
+    """Tests for per-mode KafkaProducer settings."""
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_ordered_mode_keeps_blocking_settings(self, mock_kafka: MagicMock) -> None:
+        """Test that the default mode is unchanged."""
+        make_producer()
+        kwargs = mock_kafka.call_args.kwargs
+
+        assert kwargs["retries"] == 3
+        assert kwargs["max_in_flight_requests_per_connection"] == 1
+        assert "enable_idempotence" not in kwargs
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_idempotent_mode(self, mock_kafka: MagicMock) -> None:
+        """Test that idempotent mode enables idempotence without a transactional id."""
+        make_producer(producer_mode="idempotent", producer_linger_ms=7)
+        kwargs = mock_kafka.call_args.kwargs
+
+        assert kwargs["enable_idempotence"] is True
+        assert kwargs["linger_ms"] == 7
+        assert "transactional_id" not in kwargs
+        mock_kafka.return_value.init_transactions.assert_not_called()
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_transactional_mode_initializes_transactions(self, mock_kafka: MagicMock) -> None:
+        """Test that transactional mode sets an id and fences older producers."""
+        make_producer(producer_mode="transactional", transactional_id="gen-1")
+
+        assert mock_kafka.call_args.kwargs["transactional_id"] == "gen-1"
+        mock_kafka.return_value.init_transactions.assert_called_once()
+
+
+class TestPipelinedPublish:
+    """Tests for asynchronous publishing."""
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_publish_does_not_block(self, mock_kafka: MagicMock) -> None:
+        """Test that idempotent sends attach callbacks instead of waiting."""
+        producer = make_producer(producer_mode="idempotent")
+        producer.publish({"user_id": 1})
+
+        future = mock_kafka.return_value.send.return_value
+        future.get.assert_not_called()
+        future.add_callback.assert_called_once()
+        future.add_errback.assert_called_once()
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_failed_send_raises_on_next_publish(self, mock_kafka: MagicMock) -> None:
+        """Test that an errback failure surfaces on the following call."""
+        producer = make_producer(producer_mode="idempotent")
+        producer.publish({"user_id": 1})
+
+        future = mock_kafka.return_value.send.return_value
+        errback, *args = future.add_errback.call_args.args
+        errback(*args, KafkaTimeoutError())
+
+        with pytest.raises(KafkaTimeoutError):
+            producer.publish({"user_id": 2})
+        # The stored error is raised once
+        producer.publish({"user_id": 3})
+
+
+class TestTransactions:
+    """Tests for transaction batching."""
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_commits_every_batch(self, mock_kafka: MagicMock) -> None:
+        """Test that transactions commit once the batch size is reached."""
+        producer = make_producer(producer_mode="transactional", transaction_batch_size=3)
+        before = events_published._value.get()
+        for user_id in range(7):
+            producer.publish({"user_id": user_id})
+
+        kafka = mock_kafka.return_value
+        assert kafka.begin_transaction.call_count == 3
+        assert kafka.commit_transaction.call_count == 2
+        assert events_published._value.get() - before == 6
+
+        producer.commit_transaction()
+        assert kafka.commit_transaction.call_count == 3
+        assert events_published._value.get() - before == 7
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_commits_after_max_time(self, mock_kafka: MagicMock) -> None:
+        """Test that a slow trickle of events still commits on time."""
+        producer = make_producer(producer_mode="transactional", transaction_max_ms=1000)
+        with patch("src.data_generator.producer.time.monotonic", side_effect=[0.0, 0.5, 1.5]):
+            producer.publish({"user_id": 1})
+            producer.publish({"user_id": 2})
+
+        mock_kafka.return_value.commit_transaction.assert_called_once()
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_failed_commit_aborts(self, mock_kafka: MagicMock) -> None:
+        """Test that a failed commit aborts the transaction and re-raises."""
+        kafka = mock_kafka.return_value
+        kafka.commit_transaction.side_effect = KafkaTimeoutError()
+        producer = make_producer(producer_mode="transactional")
+        aborted = transactions_aborted._value.get()
+
+        producer.publish({"user_id": 1})
+        with pytest.raises(KafkaTimeoutError):
+            producer.commit_transaction()
+
+        kafka.abort_transaction.assert_called_once()
+        assert transactions_aborted._value.get() - aborted == 1
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_idle_tick_commits_due_transaction(self, mock_kafka: MagicMock) -> None:
+        """Test that a paused stream still commits once the transaction is due."""
+        producer = make_producer(producer_mode="transactional", transaction_max_ms=1000)
+        with patch("src.data_generator.producer.time.monotonic", side_effect=[0.0, 0.1, 0.5, 1.2]):
+            producer.publish({"user_id": 1})
+            producer._on_idle()
+            mock_kafka.return_value.commit_transaction.assert_not_called()
+            producer._on_idle()
+
+        mock_kafka.return_value.commit_transaction.assert_called_once()
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_failed_send_aborts_transaction_in_adaptive_mode(self, mock_kafka: MagicMock) -> None:
+        """Test that a failed send aborts the open transaction instead of filling it."""
+        producer = make_producer(producer_mode="transactional", adaptive_rate_enabled=True)
+        kafka = mock_kafka.return_value
+        producer.publish({"user_id": 1})
+        errback, *args = kafka.send.return_value.add_errback.call_args.args
+        errback(*args, KafkaTimeoutError())
+
+        with pytest.raises(KafkaTimeoutError):
+            producer.publish({"user_id": 2})
+        kafka.abort_transaction.assert_called_once()
+
+        producer.publish({"user_id": 3})
+        assert kafka.begin_transaction.call_count == 2
+        assert producer._transaction_size == 1
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_run_commits_open_transaction_on_shutdown(self, mock_kafka: MagicMock) -> None:
+        """Test that events of a partial batch are committed when the stream ends."""
+        producer = make_producer(producer_mode="transactional", event_rate=1000)
+        with patch(
+            "src.data_generator.producer.PageviewGenerator.generate_stream",
+            return_value=iter([{"user_id": 1}, {"user_id": 2}]),
+        ):
+            producer.run()
+
+        kafka = mock_kafka.return_value
+        kafka.commit_transaction.assert_called_once()
+        kafka.flush.assert_called_once()
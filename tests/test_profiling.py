@@ -0,0 +1,173 @@
+"""Unit tests for the continuous profiler."""
+
+import gc
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.common.config import PipelineConfig
+from src.common.metrics import gc_pause, profile_hot_functions, traced_memory
+from src.common.profiling import OTHER_STACK, ContinuousProfiler, fold_stack
+from src.data_generator.producer import PageviewProducer
+
+
+def busy_loop(seconds: float) -> None:
+    """Keep the calling thread busy in a recognisable frame."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(range(1000))
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 2.0) -> bool:
+    """Poll until `condition()` is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestFoldStack:
+    """Tests for fold_stack."""
+
+    def test_root_first_with_modules(self) -> None:
+        """Test that frames are rendered root-first as module:function."""
+        stack = fold_stack(sys._getframe())
+
+        assert stack.endswith(f"{__name__}:test_root_first_with_modules")
+        assert stack.index("_pytest") < stack.index(__name__)
+
+
+class TestContinuousProfiler:
+    """Tests for ContinuousProfiler."""
+
+    def test_samples_the_starting_thread(self, tmp_path: Path) -> None:
+        """Test that the sampler records stacks of the thread that started it."""
+        with ContinuousProfiler("test", tmp_path, sample_interval_seconds=0.005) as profiler:
+            busy_loop(0.2)
+
+        assert any("busy_loop" in stack for stack in profiler.samples)
+
+    def test_distinct_stacks_are_capped(self, tmp_path: Path) -> None:
+        """Test that stacks beyond max_stacks are lumped together."""
+        profiler = ContinuousProfiler("test", tmp_path, max_stacks=1)
+        profiler._target = threading.get_ident()
+
+        profiler.sample()
+        with patch("src.common.profiling.fold_stack", return_value="other;stack"):
+            profiler.sample()
+
+        assert len(profiler.samples) == 2
+        assert profiler.samples[OTHER_STACK] == 1
+
+    def test_summary_exports_hot_functions(self, tmp_path: Path) -> None:
+        """Test that summaries set hot function shares without tracing allocations."""
+        profiler = ContinuousProfiler("test", tmp_path, sample_interval_seconds=60)
+        with (
+            profiler,
+            patch("src.common.profiling.fold_stack", side_effect=["main;a"] * 3 + ["main;b"]),
+        ):
+            for _ in range(4):
+                profiler.sample()
+            profiler.summarize()
+
+        assert profile_hot_functions.labels(function="a")._value.get() == 0.75
+        assert profile_hot_functions.labels(function="b")._value.get() == 0.25
+        assert not tracemalloc.is_tracing()
+
+    def test_gc_pauses_are_timed(self, tmp_path: Path) -> None:
+        """Test that collections are observed while running and the hook is removed on stop."""
+        buckets = gc_pause.labels(generation="2")._buckets
+        before = sum(bucket.get() for bucket in buckets)
+
+        with ContinuousProfiler("test", tmp_path) as profiler:
+            gc.collect()
+
+        assert sum(bucket.get() for bucket in buckets) == before + 1
+        assert profiler._gc_stats[2]["count"] == 1
+        assert profiler._on_gc not in gc.callbacks
+
+    def test_dump_writes_profile_files(self, tmp_path: Path) -> None:
+        """Test that a dump contains folded stacks and GC stats, and no memory capture by default."""
+        with ContinuousProfiler("test", tmp_path, sample_interval_seconds=0.005) as profiler:
+            busy_loop(0.05)
+            gc.collect()
+            path = profiler.dump()
+            assert not tracemalloc.is_tracing()
+
+        assert path.parent == tmp_path
+        assert "busy_loop" in (path / "cpu.folded").read_text()
+        assert "generation_2" in json.loads((path / "gc.json").read_text())
+        assert not (path / "memory.tracemalloc").exists()
+
+    def test_memory_capture_traces_only_after_a_dump(self, tmp_path: Path) -> None:
+        """Test that tracemalloc runs from a dump until its snapshot, then stops."""
+        profiler = ContinuousProfiler(
+            "test",
+            tmp_path,
+            sample_interval_seconds=0.005,
+            tracemalloc_frames=1,
+            memory_capture_seconds=0.05,
+        )
+        with profiler:
+            assert not tracemalloc.is_tracing()
+            path = profiler.dump()
+            assert tracemalloc.is_tracing()
+            retained = [str(i) * 10 for i in range(1000)]
+            assert wait_for(lambda: (path / "memory-top.txt").exists())
+
+        assert retained
+        assert not tracemalloc.is_tracing()
+        assert tracemalloc.Snapshot.load(str(path / "memory.tracemalloc")).traces
+        assert traced_memory.labels(kind="current")._value.get() > 0
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="SIGUSR1 is POSIX only")
+    def test_sigusr1_requests_a_dump(self, tmp_path: Path) -> None:
+        """Test that SIGUSR1 makes the sampler thread write a dump."""
+        previous = signal.getsignal(signal.SIGUSR1)
+        with ContinuousProfiler("test", tmp_path, sample_interval_seconds=0.005):
+            os.kill(os.getpid(), signal.SIGUSR1)
+            assert wait_for(lambda: any(tmp_path.glob("test-*/gc.json")))
+
+        assert signal.getsignal(signal.SIGUSR1) == previous
+
+
+class TestProducerProfiling:
+    """Tests for the profiling hook in PageviewProducer.run."""
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_run_starts_and_stops_profiler(self, mock_kafka: MagicMock, tmp_path: Path) -> None:
+        """Test that an enabled profiler wraps the run loop and is torn down after it."""
+        mock_kafka.return_value.send.return_value = MagicMock()
+        config = PipelineConfig(profiling_enabled=True, profile_dir=str(tmp_path), event_rate=1000)
+        producer = PageviewProducer(config)
+
+        with (
+            patch(
+                "src.data_generator.producer.PageviewGenerator.generate_stream",
+                return_value=iter([{"user_id": 1}]),
+            ),
+            patch.object(ContinuousProfiler, "start", autospec=True) as start,
+            patch.object(ContinuousProfiler, "stop", autospec=True) as stop,
+        ):
+            producer.run()
+
+        start.assert_called_once()
+        stop.assert_called_once()
+
+    @patch("src.data_generator.producer.KafkaProducer")
+    def test_disabled_by_default(self, mock_kafka: MagicMock) -> None:
+        """Test that no profiler is created unless enabled."""
+        producer = PageviewProducer(PipelineConfig())
+
+        assert producer._make_profiler() is None
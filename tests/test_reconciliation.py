@@ -0,0 +1,279 @@
+"""Unit tests for incremental raw-versus-aggregate reconciliation."""
+
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+
+from src.reconciliation import reconciler as reconciler_module
+from src.reconciliation.manifest import Manifest, PartitionState
+from src.reconciliation.reconciler import ParquetDataset, Reconciler
+
+# 2025-01-01 12:00:00 UTC
+BASE_MS = 1735732800000
+PARTITION = "dt=2025-01-01/event_hour=12"
+NEXT_PARTITION = "dt=2025-01-01/event_hour=13"
+WINDOW = datetime(2025, 1, 1, 12, 0)
+
+
+def write_raw(root: Path, offsets_ms: list[int], postcode: str = "SW19") -> str:
+    """Write one raw_sink file of events at BASE_MS + offset and return its name."""
+    name = f"part-{uuid.uuid4().hex}.parquet"
+    frame = pl.DataFrame(
+        {
+            "user_id": [1] * len(offsets_ms),
+            "postcode": [postcode] * len(offsets_ms),
+            "webpage": ["https://www.website.com/index.html"] * len(offsets_ms),
+            "timestamp": [BASE_MS + offset for offset in offsets_ms],
+        }
+    )
+    (root / PARTITION).mkdir(parents=True, exist_ok=True)
+    frame.write_parquet(root / PARTITION / name)
+    return name
+
+
+def write_agg(
+    root: Path, counts: dict[tuple[datetime, str], int], partition: str = PARTITION
+) -> None:
+    """Write one agg_sink file with a row per (window_start, postcode)."""
+    frame = pl.DataFrame(
+        {
+            "window_start": [window for window, _ in counts],
+            "postcode": [postcode for _, postcode in counts],
+            "region": ["London"] * len(counts),
+            "pageview_count": list(counts.values()),
+        }
+    )
+    (root / partition).mkdir(parents=True, exist_ok=True)
+    frame.write_parquet(root / partition / f"part-{uuid.uuid4().hex}.parquet")
+
+
+def close_hour(root: Path) -> None:
+    """Fire a window past PARTITION's hour plus the watermark bound, closing the hour."""
+    write_agg(root, {(datetime(2025, 1, 1, 13, 0), "SW19"): 1}, partition=NEXT_PARTITION)
+
+
+def commit(root: Path, age_seconds: float = 0.0) -> None:
+    """Write the partition's _SUCCESS file, optionally backdated."""
+    success = root / PARTITION / "_SUCCESS"
+    success.touch()
+    mtime = time.time() - age_seconds
+    os.utime(success, (mtime, mtime))
+
+
+@pytest.fixture
+def dirs(tmp_path: Path) -> tuple[Path, Path, Path]:
+    """Raw, aggregated and state directories."""
+    return tmp_path / "raw", tmp_path / "aggregated", tmp_path / "state"
+
+
+def make_reconciler(dirs: tuple[Path, Path, Path], **kwargs: int) -> Reconciler:
+    """Reconciler over local datasets with 60 second windows."""
+    raw, aggregated, state = dirs
+    return Reconciler(ParquetDataset(str(raw)), ParquetDataset(str(aggregated)), state, **kwargs)
+
+
+class TestReconciler:
+    """Tests for Reconciler.run."""
+
+    def test_matching_counts(self, dirs: tuple[Path, Path, Path]) -> None:
+        """Test that equal raw and aggregated counts report no mismatches."""
+        raw, aggregated, _ = dirs
+        write_raw(raw, [0, 1000, 61000])
+        write_agg(aggregated, {(WINDOW, "SW19"): 2, (datetime(2025, 1, 1, 12, 1), "SW19"): 1})
+        commit(raw)
+        commit(aggregated)
+        close_hour(aggregated)
+
+        report = make_reconciler(dirs).run()
+
+        assert report.new_files == 1
+        assert report.checked == [PARTITION]
+        assert report.mismatches.is_empty()
+
+    def test_reports_mismatched_windows(self, dirs: tuple[Path, Path, Path]) -> None:
+        """Test that windows differing or missing on either side are reported."""
+        raw, aggregated, _ = dirs
+        write_raw(raw, [0, 1000])
+        write_raw(raw, [5000], postcode="E1")
+        write_agg(aggregated, {(WINDOW, "SW19"): 1, (WINDOW, "N1"): 4})
+        commit(raw)
+        commit(aggregated)
+        close_hour(aggregated)
+
+        mismatches = make_reconciler(dirs).run().mismatches
+
+        assert mismatches.select("postcode", "raw_count", "agg_count").rows() == [
+            ("E1", 1, 0),
+            ("N1", 0, 4),
+            ("SW19", 2, 1),
+        ]
+        assert mismatches["partition"].unique().to_list() == [PARTITION]
+
+    def test_second_run_reads_only_new_files(self, dirs: tuple[Path, Path, Path]) -> None:
+        """Test that earlier files are not re-read and new counts merge into stored ones."""
+        raw, aggregated, _ = dirs
+        first = write_raw(raw, [0])
+        write_agg(aggregated, {(WINDOW, "SW19"): 1})
+        commit(raw)
+        commit(aggregated)
+        reconciler = make_reconciler(dirs)
+        reconciler.run()
+
+        second = write_raw(raw, [2000])
+        write_agg(aggregated, {(WINDOW, "SW19"): 1})
+        close_hour(aggregated)
+        with patch.object(
+            reconciler_module, "count_windows", wraps=reconciler_module.count_windows
+        ) as count:
+            report = reconciler.run()
+
+        files = count.call_args.args[0]
+        assert [Path(f).name for f in files] == [second]
+        assert report.checked == [PARTITION]
+        assert report.mismatches.is_empty()
+        state = PartitionState.load(reconciler.state_path(PARTITION))
+        assert state.files == {first, second}
+        assert state.counts["raw_count"].to_list() == [2]
+
+    def test_no_new_files_skips_counting(self, dirs: tuple[Path, Path, Path]) -> None:
+        """Test that a run without new files reads no raw data and checks nothing."""
+        raw, aggregated, _ = dirs
+        write_raw(raw, [0])
+        write_agg(aggregated, {(WINDOW, "SW19"): 1})
+        commit(raw)
+        commit(aggregated)
+        close_hour(aggregated)
+        reconciler = make_reconciler(dirs)
+        reconciler.run()
+
+        with patch.object(reconciler_module, "count_windows") as count:
+            report = reconciler.run()
+
+        count.assert_not_called()
+        assert report.checked == []
+
+    def test_uncommitted_partitions_wait(self, dirs: tuple[Path, Path, Path]) -> None:
+        """Test that raw data waits for _SUCCESS and aggregates stay pending until committed."""
+        raw, aggregated, _ = dirs
+        write_raw(raw, [0])
+        reconciler = make_reconciler(dirs)
+
+        assert reconciler.run().new_files == 0
+
+        commit(raw)
+        report = reconciler.run()
+        assert report.new_files == 1
+        assert report.pending == [PARTITION]
+
+        write_agg(aggregated, {(WINDOW, "SW19"): 1})
+        commit(aggregated)
+        close_hour(aggregated)
+        report = reconciler.run()
+        assert report.checked == [PARTITION]
+        assert report.pending == []
+        assert report.mismatches.is_empty()
+
+    def test_open_hour_waits_for_its_windows_to_fire(self, dirs: tuple[Path, Path, Path]) -> None:
+        """Test that a committed partition is not compared while its hour is still filling."""
+        raw, aggregated, _ = dirs
+        write_raw(raw, [0, 1000, 30 * 60000])
+        # Process-time commit: _SUCCESS exists after the first window fires
+        write_agg(aggregated, {(WINDOW, "SW19"): 2})
+        commit(raw)
+        commit(aggregated)
+        reconciler = make_reconciler(dirs)
+
+        report = reconciler.run()
+        assert report.checked == []
+        assert report.pending == [PARTITION]
+        assert report.mismatches.is_empty()
+
+        write_agg(aggregated, {(datetime(2025, 1, 1, 12, 30), "SW19"): 1})
+        close_hour(aggregated)
+        report = reconciler.run()
+        assert report.checked == [PARTITION]
+        assert report.mismatches.is_empty()
+
+    def test_files_after_check_are_late(self, dirs: tuple[Path, Path, Path]) -> None:
+        """Test that raw files landing in a compared partition are late, not mismatches."""
+        raw, aggregated, _ = dirs
+        write_raw(raw, [0])
+        write_agg(aggregated, {(WINDOW, "SW19"): 1})
+        commit(raw)
+        commit(aggregated)
+        close_hour(aggregated)
+        reconciler = make_reconciler(dirs)
+        reconciler.run()
+
+        write_raw(raw, [2000, 3000])
+        report = reconciler.run()
+
+        assert report.late_events == 2
+        assert report.checked == []
+        assert report.pending == []
+        assert report.mismatches.is_empty()
+
+    def test_old_partitions_are_sealed(self, dirs: tuple[Path, Path, Path]) -> None:
+        """Test that reconciled partitions committed long ago are dropped from listing."""
+        raw, aggregated, _ = dirs
+        write_raw(raw, [0])
+        write_agg(aggregated, {(WINDOW, "SW19"): 1})
+        commit(raw, age_seconds=3600)
+        commit(aggregated)
+        close_hour(aggregated)
+        reconciler = make_reconciler(dirs, seal_after_seconds=60)
+
+        assert reconciler.run().sealed == [PARTITION]
+        assert not reconciler.state_path(PARTITION).exists()
+
+        with patch.object(reconciler.raw, "list_partition") as listing:
+            reconciler.run()
+        listing.assert_not_called()
+
+    def test_without_success_files(self, dirs: tuple[Path, Path, Path]) -> None:
+        """Test the reference engine layout, committed once the hour plus a delay has passed."""
+        raw, aggregated, state = dirs
+        write_raw(raw, [0])
+        write_agg(aggregated, {(WINDOW, "SW19"): 1})
+        close_hour(aggregated)
+        reconciler = Reconciler(
+            ParquetDataset(str(raw), require_success=False),
+            ParquetDataset(str(aggregated), require_success=False),
+            state,
+        )
+
+        report = reconciler.run()
+
+        assert report.checked == [PARTITION]
+        assert report.mismatches.is_empty()
+
+
+class TestManifest:
+    """Tests for the reconciliation manifest."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test that the manifest survives save and load."""
+        manifest = Manifest(
+            pending={PARTITION},
+            checked={NEXT_PARTITION},
+            sealed={"dt=2025-01-02/event_hour=00"},
+        )
+        manifest.save(tmp_path / "manifest.json")
+
+        assert Manifest.load(tmp_path / "manifest.json") == manifest
+
+    def test_full_day_collapses(self) -> None:
+        """Test that sealing all 24 hours of a day replaces them with the day."""
+        manifest = Manifest()
+        for hour in range(24):
+            manifest.seal(f"dt=2025-01-01/event_hour={hour:02d}")
+
+        assert manifest.sealed == set()
+        assert manifest.sealed_days == {"dt=2025-01-01"}
+        assert manifest.is_sealed(PARTITION)
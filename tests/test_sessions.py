@@ -0,0 +1,104 @@
+"""Unit tests for session simulation."""
+
+from collections import Counter
+from statistics import mean
+
+import pytest
+
+from src.data_generator.generator import PageviewGenerator
+from src.data_generator.sessions import SessionSimulator
+
+
+def make_simulator(num_users: int = 1000, **kwargs: float) -> SessionSimulator:
+    """Build a seeded simulator with three postcodes and two pages."""
+    return SessionSimulator(num_users, [3.0, 2.0, 1.0], [1.0, 1.0], seed=7, **kwargs)
+
+
+class TestSessionSimulator:
+    """Tests for SessionSimulator."""
+
+    def test_events_are_in_time_order(self) -> None:
+        """Test that simulated time never moves backwards."""
+        simulator = make_simulator()
+        times = []
+        for _ in range(5000):
+            simulator.next_event()
+            times.append(simulator.now_ms)
+
+        assert times == sorted(times)
+
+    def test_user_keeps_home_postcode(self) -> None:
+        """Test that every event of a user carries the same postcode."""
+        simulator = make_simulator(num_users=50)
+        postcodes: dict[int, set[int]] = {}
+        for _ in range(2000):
+            user_id, postcode, page = simulator.next_event()
+            assert 1 <= user_id <= 50
+            assert page in (0, 1)
+            postcodes.setdefault(user_id, set()).add(postcode)
+
+        assert all(len(seen) == 1 for seen in postcodes.values())
+
+    def test_sessions_repeat_users(self) -> None:
+        """Test that users view several pages in a row rather than once each."""
+        simulator = make_simulator(
+            num_users=100, mean_think_seconds=1.0, continue_probability=0.9, mean_idle_seconds=600
+        )
+        counts = Counter(simulator.next_event()[0] for _ in range(1000))
+
+        assert max(counts.values()) > 3
+
+    def test_natural_rate(self) -> None:
+        """Test the steady-state rate from the mean gap between a user's events."""
+        simulator = make_simulator(
+            num_users=1000, mean_think_seconds=10, continue_probability=0.5, mean_idle_seconds=90
+        )
+
+        assert simulator.natural_rate == 20.0
+
+    def test_memory_per_user(self) -> None:
+        """Test that per-user state stays within the compact column budget."""
+        simulator = make_simulator(num_users=100_000)
+
+        assert simulator.memory_bytes() / simulator.num_users < 16
+
+    def test_invalid_population(self) -> None:
+        """Test that empty populations and oversized dimensions are rejected."""
+        with pytest.raises(ValueError):
+            make_simulator(num_users=0)
+        with pytest.raises(ValueError):
+            SessionSimulator(10, [1.0], [1.0] * 300)
+
+
+class TestGeneratorSessionMode:
+    """Tests for PageviewGenerator session mode."""
+
+    def test_session_events_have_required_fields(self) -> None:
+        """Test that session-mode events match the stateless event shape."""
+        generator = PageviewGenerator(session_users=100)
+        event = generator.generate_event()
+
+        assert set(event) == {"user_id", "postcode", "webpage", "timestamp"}
+        assert 1 <= event["user_id"] <= 100
+        assert event["postcode"] in generator.postcodes
+        assert event["webpage"] in generator.urls
+        assert generator.generate_validated_event().user_id > 0
+
+    def test_session_gaps_appear_in_event_time(self) -> None:
+        """Test that think-time gaps separate a user's timestamps, not wall-clock send times."""
+        generator = PageviewGenerator(session_users=100, mean_think_seconds=10.0)
+        events = [generator.generate_event() for _ in range(3000)]
+
+        timestamps = [event["timestamp"] for event in events]
+        last_seen: dict[int, int] = {}
+        gaps = []
+        for event in events:
+            previous = last_seen.get(event["user_id"])
+            if previous is not None:
+                gaps.append(event["timestamp"] - previous)
+            last_seen[event["user_id"]] = event["timestamp"]
+        think_gaps = [gap for gap in gaps if gap < 60_000]
+
+        assert timestamps == sorted(timestamps)
+        assert timestamps[0] >= generator.session_start_ms
+        assert 8_000 < mean(think_gaps) < 12_000
@@ -0,0 +1,60 @@
+"""Import-time budget tests for the generator container entrypoint."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Generous ceiling for CI runners; a local import takes roughly a third of this
+STARTUP_BUDGET_SECONDS = 1.0
+
+
+def import_profile(module: str) -> tuple[float, set[str]]:
+    """Import `module` in a fresh interpreter.
+
+    Returns:
+        Cumulative import time in seconds and the set of imported module names
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys, {module}; print(','.join(sys.modules))",
+        ],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Last importtime line is the requested top-level module: "self | cumulative | name"
+    cumulative_us = int(result.stderr.strip().splitlines()[-1].split("|")[1])
+    return cumulative_us / 1e6, set(result.stdout.strip().split(","))
+
+
+@pytest.mark.parametrize("module", ["src.common", "src.data_generator", "src.stream_engine"])
+def test_package_import_is_lazy(module: str) -> None:
+    """Test that importing a package does not eagerly import heavy dependencies."""
+    _, modules = import_profile(module)
+
+    assert not {"faker", "pydantic", "loguru", "kafka", "polars"} & modules
+
+
+def test_generator_import_skips_faker_and_pydantic() -> None:
+    """Test that the generator module only loads Faker/pydantic on demand."""
+    _, modules = import_profile("src.data_generator.generator")
+
+    assert "faker" not in modules
+    assert "pydantic" not in modules
+
+
+def test_producer_startup_budget() -> None:
+    """Test that the container entrypoint imports within the startup budget."""
+    elapsed, modules = import_profile("src.data_generator.producer")
+
+    assert "faker" not in modules
+    assert elapsed < STARTUP_BUDGET_SECONDS
@@ -0,0 +1,306 @@
+"""Unit tests for the reference stream engine."""
+
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import polars as pl
+import pytest
+
+from src.common.metrics import rejected_events
+from src.stream_engine import runner
+from src.stream_engine.engine import ReferenceEngine
+from src.stream_engine.enrichment import enrich_events, load_dimension
+from src.stream_engine.runner import with_window_partition
+from src.stream_engine.validation import events_to_frame, split_events, validate_events
+from src.stream_engine.window import TumblingWindowCounter
+
+# 2025-01-01 12:00:00 UTC
+BASE_MS = 1735732800000
+POSTCODE_DIM = Path(__file__).parents[1] / "flink-app" / "data" / "postcode_dim"
+
+
+def make_event(offset_ms: int, postcode: str | None = "SW19", user_id: int = 1) -> dict:
+    """Build a source event `offset_ms` after BASE_MS."""
+    return {
+        "user_id": user_id,
+        "postcode": postcode,
+        "webpage": "https://www.website.com/index.html",
+        "timestamp": BASE_MS + offset_ms,
+    }
+
+
+class TestValidateEvents:
+    """Tests for the validated_events port."""
+
+    def test_filters_invalid_postcodes(self) -> None:
+        """Test that null, too-short and too-long postcodes are dropped."""
+        events = [
+            make_event(0, "SW19"),
+            make_event(0, None),
+            make_event(0, "E"),
+            make_event(0, "ABCDEFGHIJK"),
+            make_event(0, "ABCDEFGHIJ"),
+        ]
+        validated = validate_events(events_to_frame(events))
+
+        assert validated["postcode"].to_list() == ["SW19", "ABCDEFGHIJ"]
+
+    def test_reject_reasons(self) -> None:
+        """Test that each PageviewEvent rule yields its own reason code."""
+        events = [
+            make_event(0, "SW19"),
+            {**make_event(0), "user_id": None},
+            make_event(0, user_id=0),
+            make_event(0, "sw19"),
+            {**make_event(0), "webpage": "www.website.com/index.html"},
+            {**make_event(0), "timestamp": 1611662684},
+            {**make_event(0), "timestamp": None},
+        ]
+        validated, rejected = split_events(events_to_frame(events))
+
+        assert validated.height == 1
+        assert rejected["reject_reason"].to_list() == [
+            "MISSING_USER_ID",
+            "INVALID_USER_ID",
+            "INVALID_POSTCODE",
+            "INVALID_WEBPAGE",
+            "INVALID_TIMESTAMP",
+            "MISSING_TIMESTAMP",
+        ]
+        assert "dt" not in rejected.columns
+
+    def test_derives_partition_columns(self) -> None:
+        """Test that dt and event_hour are derived from the timestamp in UTC."""
+        validated = validate_events(events_to_frame([make_event(0)]))
+
+        assert validated["dt"][0] == "2025-01-01"
+        assert validated["event_hour"][0] == "12"
+        assert validated["ts"][0] == datetime(2025, 1, 1, 12, 0, 0)
+
+    def test_missing_fields_become_nulls(self) -> None:
+        """Test that missing JSON fields are read as nulls."""
+        frame = events_to_frame([{"user_id": 1, "timestamp": BASE_MS}])
+
+        assert frame.columns == ["user_id", "postcode", "webpage", "timestamp"]
+        assert frame["postcode"][0] is None
+
+
+class TestEnrichment:
+    """Tests for the postcode dimension enrichment."""
+
+    def test_loads_flink_dimension(self) -> None:
+        """Test that the CSVs the Flink job reads load as dimension rows."""
+        dimension = load_dimension(f"file://{POSTCODE_DIM}/")
+
+        assert dimension.filter(pl.col("postcode") == "SW19").select("region", "area_type").row(
+            0
+        ) == ("London", "Suburban")
+
+    def test_region_as_of_event_time(self) -> None:
+        """Test that events take the dimension version valid at their timestamp."""
+        dimension = pl.DataFrame(
+            {
+                "postcode": ["SW19", "SW19"],
+                "region": ["London", "Greater London"],
+                "area_type": ["Suburban", "Suburban"],
+                "valid_from_ms": [BASE_MS, BASE_MS + 30000],
+            }
+        )
+        events = validate_events(
+            events_to_frame(
+                [make_event(-1000), make_event(1000), make_event(31000), make_event(0, "N1")]
+            )
+        )
+
+        enriched = enrich_events(events, dimension)
+
+        assert enriched.select("postcode", "region").rows() == [
+            ("SW19", "UNKNOWN"),
+            ("N1", "UNKNOWN"),
+            ("SW19", "London"),
+            ("SW19", "Greater London"),
+        ]
+
+
+class TestTumblingWindowCounter:
+    """Tests for TumblingWindowCounter."""
+
+    def test_window_fires_after_watermark(self) -> None:
+        """Test that a window only fires once the watermark passes its end."""
+        counter = TumblingWindowCounter(window_size_ms=60000, watermark_delay_ms=5000)
+        counter.add(events_to_frame([make_event(1000), make_event(2000), make_event(3000, "E1")]))
+
+        assert counter.fire().is_empty()
+
+        # Watermark = 59998 ms: one millisecond short of the first window's end
+        counter.add(events_to_frame([make_event(64998)]))
+        assert counter.fire().is_empty()
+
+        counter.add(events_to_frame([make_event(64999)]))
+        fired = counter.fire()
+
+        assert fired.select("postcode", "pageview_count").rows() == [("E1", 1), ("SW19", 2)]
+        assert fired["window_start"][0] == datetime(2025, 1, 1, 12, 0, 0)
+        assert fired["window_end"][0] == datetime(2025, 1, 1, 12, 1, 0)
+        assert counter.open_windows == 1
+
+    def test_late_events_are_dropped(self) -> None:
+        """Test that events for an already-fired window are counted as late."""
+        counter = TumblingWindowCounter(window_size_ms=60000, watermark_delay_ms=5000)
+        counter.add(events_to_frame([make_event(1000), make_event(70000)]))
+        counter.fire()
+
+        counter.add(events_to_frame([make_event(2000)]))
+
+        assert counter.late_events == 1
+        assert counter.flush()["window_start"].to_list() == [datetime(2025, 1, 1, 12, 1, 0)]
+
+    def test_out_of_order_within_delay(self) -> None:
+        """Test that out-of-order events within the watermark delay are kept."""
+        counter = TumblingWindowCounter(window_size_ms=60000, watermark_delay_ms=5000)
+        counter.add(events_to_frame([make_event(62000)]))
+        counter.add(events_to_frame([make_event(59000)]))
+
+        assert counter.late_events == 0
+        assert counter.flush()["pageview_count"].to_list() == [1, 1]
+
+    def test_window_state_holds_one_count_per_key(self) -> None:
+        """Test that a window's count array grows by one slot per new key."""
+        counter = TumblingWindowCounter(window_size_ms=60000, watermark_delay_ms=5000)
+        counter.add(events_to_frame([make_event(0, "SW19"), make_event(0, "N1")]))
+        counter.add(events_to_frame([make_event(0, "E1")]))
+
+        assert [len(window) for window in counter._windows.values()] == [3]
+        assert counter.flush()["pageview_count"].to_list() == [1, 1, 1]
+
+
+class TestReferenceEngine:
+    """Tests for ReferenceEngine."""
+
+    def test_process_and_finish(self) -> None:
+        """Test that the engine matches a batch recomputation of the same events."""
+        engine = ReferenceEngine(window_size_seconds=60, watermark_delay_seconds=5)
+        events = [make_event(i * 7000, "SW19" if i % 3 else "N1") for i in range(40)]
+        events.append(make_event(0, "X"))
+
+        emitted = [engine.process(events[i : i + 10]).aggregates for i in range(0, 41, 10)]
+        emitted.append(engine.finish())
+        streamed = pl.concat(emitted)
+
+        expected = (
+            validate_events(events_to_frame(events))
+            .group_by(pl.col("ts").dt.truncate("1m").alias("window_start"), "postcode")
+            .len()
+            .sort("window_start", "postcode")
+        )
+
+        assert streamed["pageview_count"].sum() == 40
+        assert streamed.select("postcode", "pageview_count").rows() == [
+            (postcode, count) for _, postcode, count in expected.rows()
+        ]
+
+    def test_rejections_counted_per_reason(self) -> None:
+        """Test that rejected events are returned and counted by reason."""
+        counter = rejected_events.labels("INVALID_POSTCODE")
+        before = counter._value.get()
+
+        result = ReferenceEngine().process([make_event(0), make_event(0, "E"), make_event(0, "")])
+
+        assert result.rejected.height == 2
+        assert counter._value.get() - before == 2
+
+    def test_raw_output_matches_raw_sink_columns(self) -> None:
+        """Test that raw output uses the raw_sink column order."""
+        result = ReferenceEngine().process([make_event(0)])
+
+        assert result.raw.columns == [
+            "user_id",
+            "postcode",
+            "webpage",
+            "timestamp",
+            "dt",
+            "event_hour",
+        ]
+
+    def test_aggregates_partitioned_like_agg_sink(self) -> None:
+        """Test that aggregate rows get the dt/event_hour of their window start."""
+        engine = ReferenceEngine()
+        engine.process([make_event(0)])
+        aggregates = with_window_partition(engine.finish())
+
+        assert aggregates.select("dt", "event_hour").row(0) == ("2025-01-01", "12")
+
+    def test_aggregates_match_agg_sink_columns(self) -> None:
+        """Test that aggregates carry region and area type in agg_sink column order."""
+        engine = ReferenceEngine(dimension=load_dimension(POSTCODE_DIM))
+        engine.process([make_event(0), make_event(1000, "E1"), make_event(2000, "ZZ9")])
+        aggregates = with_window_partition(engine.finish())
+
+        assert aggregates.columns == [
+            "window_start",
+            "window_end",
+            "postcode",
+            "region",
+            "area_type",
+            "pageview_count",
+            "dt",
+            "event_hour",
+        ]
+        assert aggregates.select("postcode", "region", "area_type").rows() == [
+            ("E1", "London", "Urban"),
+            ("SW19", "London", "Suburban"),
+            ("ZZ9", "UNKNOWN", "UNKNOWN"),
+        ]
+
+
+class TestRunner:
+    """Tests for the small-deployment runner."""
+
+    @patch("src.stream_engine.runner.start_metrics_server")
+    @patch("src.stream_engine.runner.KafkaConsumer")
+    def test_shutdown_writes_open_windows_before_committing(
+        self,
+        mock_consumer: MagicMock,
+        mock_metrics: MagicMock,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that windows still open at shutdown are written, not lost with their offsets."""
+        monkeypatch.setenv("REFERENCE_OUTPUT_DIR", str(tmp_path))
+        consumer = mock_consumer.return_value
+        records = [SimpleNamespace(value=make_event(i * 1000)) for i in range(3)]
+        consumer.poll.side_effect = [{"partition": records}, KeyboardInterrupt]
+        written_before_commit = []
+        consumer.commit.side_effect = lambda: written_before_commit.append(
+            any((tmp_path / "aggregated").rglob("*.parquet"))
+        )
+
+        runner.main()
+
+        aggregates = pl.read_parquet(tmp_path / "aggregated" / "**" / "*.parquet")
+        assert aggregates["pageview_count"].sum() == 3
+        assert written_before_commit == [False, True]
+        consumer.close.assert_called_once()
+
+    @patch("src.stream_engine.runner.ReferenceEngine", wraps=ReferenceEngine)
+    @patch("src.stream_engine.runner.start_metrics_server")
+    @patch("src.stream_engine.runner.KafkaConsumer")
+    def test_watermark_includes_allowed_lateness(
+        self,
+        mock_consumer: MagicMock,
+        mock_metrics: MagicMock,
+        mock_engine: MagicMock,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that the engine drops late events at the same bound as the Flink job."""
+        monkeypatch.setenv("REFERENCE_OUTPUT_DIR", str(tmp_path))
+        monkeypatch.setenv("WATERMARK_DELAY_SECONDS", "5")
+        monkeypatch.setenv("ALLOWED_LATENESS_SECONDS", "30")
+        mock_consumer.return_value.poll.side_effect = KeyboardInterrupt
+
+        runner.main()
+
+        assert mock_engine.call_args.args[1] == 35